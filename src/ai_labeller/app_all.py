@@ -1,3 +1,4 @@
+import multiprocessing
 import os
 import sys
 import tkinter as tk
@@ -15,4 +16,6 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    # Frozen builds re-run this entry point in near-duplicate hashing workers.
+    multiprocessing.freeze_support()
     main()
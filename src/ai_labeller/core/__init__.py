@@ -1,20 +1,78 @@
 from .config import AppConfig
 from .models import AppState, SessionState
-from .geometry import calculate_iou, fuse_boxes
+from .geometry import (
+    calculate_iou,
+    convex_iou_matrix,
+    fuse_boxes,
+    iou_matrix,
+    obb_corners,
+    obb_iou_matrix,
+    rect_iou_matrix,
+    rect_obbs,
+    suppress_duplicates,
+)
 from .commands import HistoryManager
-from .io_utils import atomic_write_json, atomic_write_text
+from .history_store import HistoryStore
+from .dataset_stats import DatasetStats, DatasetStatsEngine
+from .debounced_writer import DebouncedFileWriter
+from .fs_watcher import FsEvent, PollingWatcher
+from .image_cache import DecodedImageCache, ImagePrefetcher
+from .label_writer import LabelWrite, LabelWriteQueue
+from .io_utils import atomic_write_json, atomic_write_text, project_state_path
 from .logging_utils import setup_logging
+from .near_duplicates import BKTree, find_near_duplicates
+from .project_index import ProjectIndex
+from .pyramid import ImagePyramid
+from .rect_store import RectStore
+from .render_scheduler import RenderScheduler
+from .scene import CanvasScene
+from .spatial_index import SpatialIndex
+from .split_bitmaps import SplitBitmaps
+from .text_metrics import TextMetricsCache
+from .thumbnails import ThumbnailCache
 from .types import Rect
+from .viewport import ViewportRenderer, ViewportTile
 
 __all__ = [
     "AppConfig",
     "AppState",
     "SessionState",
     "Rect",
+    "RectStore",
+    "CanvasScene",
     "calculate_iou",
+    "convex_iou_matrix",
     "fuse_boxes",
+    "iou_matrix",
+    "obb_corners",
+    "obb_iou_matrix",
+    "rect_iou_matrix",
+    "rect_obbs",
+    "suppress_duplicates",
     "HistoryManager",
+    "HistoryStore",
+    "BKTree",
+    "find_near_duplicates",
+    "DatasetStats",
+    "DatasetStatsEngine",
+    "DebouncedFileWriter",
+    "DecodedImageCache",
+    "FsEvent",
+    "PollingWatcher",
+    "ImagePrefetcher",
+    "ImagePyramid",
+    "ProjectIndex",
+    "LabelWrite",
+    "LabelWriteQueue",
+    "RenderScheduler",
+    "SpatialIndex",
+    "SplitBitmaps",
+    "TextMetricsCache",
+    "ThumbnailCache",
     "atomic_write_json",
     "atomic_write_text",
+    "project_state_path",
     "setup_logging",
+    "ViewportRenderer",
+    "ViewportTile",
 ]
@@ -1,10 +1,34 @@
 from __future__ import annotations
 
 import copy
+import time
+from collections import deque
 from dataclasses import dataclass
+from typing import Callable, Iterable, Protocol
 
 from .types import Rect
 
+# Rough CPython footprint of one stored Rect (a list of six numbers); used for the memory cap.
+RECT_NBYTES = 232
+_INDEX_NBYTES = 8
+_COMMAND_NBYTES = 128
+
+
+def _copy_rects(rects: Iterable[Rect]) -> list[Rect]:
+    # Rects are flat lists of numbers, so a shallow copy is a full copy.
+    return [list(rect) for rect in rects]
+
+
+class Command(Protocol):
+    def undo(self) -> None: ...
+
+    def redo(self) -> None: ...
+
+    @property
+    def nbytes(self) -> int: ...
+
+    def to_record(self) -> tuple: ...
+
 
 @dataclass
 class RevertToSnapshotCommand:
@@ -26,27 +50,259 @@ class RevertToSnapshotCommand:
             return
         self.target[:] = copy.deepcopy(self.after)
 
+    @property
+    def nbytes(self) -> int:
+        return _COMMAND_NBYTES + RECT_NBYTES * (len(self.before) + len(self.after or ()))
+
+    def to_record(self) -> tuple:
+        return ("snapshot", self.before, self.after)
+
+
+@dataclass
+class AddRectsCommand:
+    """Rects inserted at ``indices`` (ascending positions after the insert)."""
+
+    target: list[Rect]
+    indices: list[int]
+    rects: list[Rect] | None = None
+
+    def undo(self) -> None:
+        if self.rects is None:
+            self.rects = _copy_rects(self.target[i] for i in self.indices)
+        for i in reversed(self.indices):
+            del self.target[i]
+
+    def redo(self) -> None:
+        for i, rect in zip(self.indices, self.rects or ()):
+            self.target.insert(i, list(rect))
+
+    @property
+    def nbytes(self) -> int:
+        return _COMMAND_NBYTES + _INDEX_NBYTES * len(self.indices) + RECT_NBYTES * len(self.rects or ())
+
+    def to_record(self) -> tuple:
+        return ("add", self.indices, self.rects)
+
+
+@dataclass
+class RemoveRectsCommand:
+    """Rects removed from ``indices`` (ascending positions before the removal)."""
+
+    target: list[Rect]
+    indices: list[int]
+    rects: list[Rect]
+
+    def undo(self) -> None:
+        for i, rect in zip(self.indices, self.rects):
+            self.target.insert(i, list(rect))
+
+    def redo(self) -> None:
+        for i in reversed(self.indices):
+            del self.target[i]
+
+    @property
+    def nbytes(self) -> int:
+        return _COMMAND_NBYTES + (_INDEX_NBYTES + RECT_NBYTES) * len(self.indices)
+
+    def to_record(self) -> tuple:
+        return ("remove", self.indices, self.rects)
+
+
+@dataclass
+class ModifyRectsCommand:
+    """Rects at ``indices`` changed in place; ``after`` is captured on the first undo."""
+
+    target: list[Rect]
+    indices: list[int]
+    before: list[Rect]
+    after: list[Rect] | None = None
+    merge_key: str | None = None
+    timestamp: float = 0.0
+
+    def is_noop(self) -> bool:
+        """True while the rects still equal ``before``, e.g. a box clicked but not dragged."""
+        if self.after is not None:
+            return self.after == self.before
+        if any(i >= len(self.target) for i in self.indices):
+            return False
+        return all(self.target[i] == rect for i, rect in zip(self.indices, self.before))
+
+    def undo(self) -> None:
+        if self.after is None:
+            self.after = _copy_rects(self.target[i] for i in self.indices)
+        for i, rect in zip(self.indices, self.before):
+            self.target[i] = list(rect)
+
+    def redo(self) -> None:
+        for i, rect in zip(self.indices, self.after or ()):
+            self.target[i] = list(rect)
+
+    @property
+    def nbytes(self) -> int:
+        return _COMMAND_NBYTES + (_INDEX_NBYTES + RECT_NBYTES) * len(self.indices) + RECT_NBYTES * len(
+            self.after or ()
+        )
+
+    def to_record(self) -> tuple:
+        # The merge timestamp is not kept: a restored entry never merges.
+        return ("modify", self.indices, self.before, self.after, self.merge_key)
+
+
+@dataclass
+class ReorderRectsCommand:
+    """The list was permuted so that ``new[i] is old[order[i]]``."""
+
+    target: list[Rect]
+    order: list[int]
+
+    def undo(self) -> None:
+        old: list[Rect] = [[] for _ in self.order]
+        for i, j in enumerate(self.order):
+            old[j] = self.target[i]
+        self.target[:] = old
+
+    def redo(self) -> None:
+        self.target[:] = [self.target[j] for j in self.order]
+
+    @property
+    def nbytes(self) -> int:
+        return _COMMAND_NBYTES + _INDEX_NBYTES * len(self.order)
+
+    def to_record(self) -> tuple:
+        return ("reorder", self.order)
+
+
+def command_from_record(record: tuple | list, target: list[Rect]) -> Command:
+    """Rebuild a command from ``to_record`` output (JSON round-trips tuples as lists)."""
+    kind, *fields = record
+    if kind == "add":
+        return AddRectsCommand(target, list(fields[0]), fields[1])
+    if kind == "remove":
+        return RemoveRectsCommand(target, list(fields[0]), fields[1])
+    if kind == "modify":
+        return ModifyRectsCommand(target, list(fields[0]), fields[1], fields[2], merge_key=fields[3])
+    if kind == "reorder":
+        return ReorderRectsCommand(target, list(fields[0]))
+    if kind == "snapshot":
+        return RevertToSnapshotCommand(target, fields[0], fields[1])
+    raise ValueError(f"Unknown history record: {kind}")
+
 
 class HistoryManager:
-    def __init__(self) -> None:
-        self._undo_stack: list[RevertToSnapshotCommand] = []
-        self._redo_stack: list[RevertToSnapshotCommand] = []
+    """Undo/redo stacks of rect-list deltas with a memory cap.
 
-    def push_snapshot(self, target: list[Rect]) -> None:
-        self._undo_stack.append(RevertToSnapshotCommand.from_target(target))
+    Callers record what an edit touches rather than snapshotting the whole list:
+    ``record_remove`` and ``record_modify`` before the change, ``record_add`` and
+    ``record_reorder`` after it. Modifications with the same ``merge_key`` and indices
+    that follow each other within ``merge_window_s`` (held rotate keys, say) collapse
+    into one entry. When the estimated size of both stacks exceeds ``max_bytes`` the
+    oldest undo entries are dropped. ``push_snapshot`` remains for bulk edits.
+    """
+
+    def __init__(
+        self, max_bytes: int | None = None, merge_window_s: float = 1.0, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.merge_window_s = merge_window_s
+        self.clock = clock
+        self._undo_stack: deque[Command] = deque()
+        self._redo_stack: list[Command] = []
+        self._nbytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Estimated memory held by both stacks."""
+        return self._nbytes
+
+    @property
+    def undo_depth(self) -> int:
+        return len(self._undo_stack)
+
+    @property
+    def redo_depth(self) -> int:
+        return len(self._redo_stack)
+
+    def push(self, command: Command) -> None:
+        for cmd in self._redo_stack:
+            self._nbytes -= cmd.nbytes
         self._redo_stack.clear()
+        self._undo_stack.append(command)
+        self._nbytes += command.nbytes
+        self._trim()
+
+    def push_snapshot(self, target: list[Rect]) -> None:
+        self.push(RevertToSnapshotCommand.from_target(target))
+
+    def record_add(self, target: list[Rect], indices: Iterable[int]) -> None:
+        indices = sorted(indices)
+        if indices:
+            self.push(AddRectsCommand(target, indices))
+
+    def record_remove(self, target: list[Rect], indices: Iterable[int]) -> None:
+        indices = sorted(set(indices))
+        if indices:
+            self.push(RemoveRectsCommand(target, indices, _copy_rects(target[i] for i in indices)))
+
+    def record_modify(self, target: list[Rect], indices: Iterable[int], merge_key: str | None = None) -> None:
+        indices = sorted(set(indices))
+        if not indices:
+            return
+        now = self.clock()
+        top = self._undo_stack[-1] if self._undo_stack else None
+        if (
+            merge_key is not None
+            and isinstance(top, ModifyRectsCommand)
+            and top.merge_key == merge_key
+            and top.target is target
+            and top.indices == indices
+            and top.after is None
+            and now - top.timestamp <= self.merge_window_s
+        ):
+            # The earlier entry's "before" already covers this step.
+            top.timestamp = now
+            return
+        self.push(
+            ModifyRectsCommand(
+                target, indices, _copy_rects(target[i] for i in indices), merge_key=merge_key, timestamp=now
+            )
+        )
+
+    def record_reorder(self, target: list[Rect], order: Iterable[int]) -> None:
+        order = list(order)
+        if order != list(range(len(order))):
+            self.push(ReorderRectsCommand(target, order))
+
+    def export_stacks(self) -> tuple[list[tuple], list[tuple]]:
+        """Undo and redo stacks as plain records, oldest first, for ``import_stacks``."""
+        return [cmd.to_record() for cmd in self._undo_stack], [cmd.to_record() for cmd in self._redo_stack]
+
+    def import_stacks(self, target: list[Rect], undo: list, redo: list) -> None:
+        """Replace both stacks with recorded ones, now applying to ``target``."""
+        self.clear()
+        self._undo_stack.extend(command_from_record(record, target) for record in undo)
+        self._redo_stack.extend(command_from_record(record, target) for record in redo)
+        self._nbytes = sum(cmd.nbytes for cmd in self._undo_stack) + sum(cmd.nbytes for cmd in self._redo_stack)
+        self._trim()
 
     def clear(self) -> None:
         self._undo_stack.clear()
         self._redo_stack.clear()
+        self._nbytes = 0
 
     def undo(self) -> bool:
-        if not self._undo_stack:
-            return False
-        cmd = self._undo_stack.pop()
-        cmd.undo()
-        self._redo_stack.append(cmd)
-        return True
+        while self._undo_stack:
+            cmd = self._undo_stack.pop()
+            if isinstance(cmd, ModifyRectsCommand) and cmd.is_noop():
+                # Selecting a box records a move that never happened; skip it.
+                self._nbytes -= cmd.nbytes
+                continue
+            size = cmd.nbytes
+            cmd.undo()
+            self._nbytes += cmd.nbytes - size
+            self._redo_stack.append(cmd)
+            self._trim()
+            return True
+        return False
 
     def redo(self) -> bool:
         if not self._redo_stack:
@@ -55,3 +311,9 @@ class HistoryManager:
         cmd.redo()
         self._undo_stack.append(cmd)
         return True
+
+    def _trim(self) -> None:
+        if self.max_bytes is None:
+            return
+        while self._nbytes > self.max_bytes and len(self._undo_stack) > 1:
+            self._nbytes -= self._undo_stack.popleft().nbytes
@@ -25,3 +25,23 @@ class AppConfig:
     low_cpu_yolo_imgsz: int = 416
     low_cpu_yolo_max_det: int = 50
     active_learning_scan_limit: int = 80
+    viewport_margin_px: int = 128
+    gesture_settle_ms: int = 150
+    perf_trace_file_name: str = ".ai_labeller_trace.jsonl"
+    image_cache_max_mb: int = 768
+    prefetch_radius: int = 3
+    prefetch_workers: int = 2
+    display_proxy_max_side: int = 2560
+    label_journal_file_name: str = ".ai_labeller_label_journal.jsonl"
+    session_save_delay_ms: int = 1000
+    thumbnail_size: int = 48
+    thumbnail_workers: int = 2
+    fs_watch_interval_ms: int = 2000
+    near_duplicate_max_distance: int = 4
+    hash_workers: int = 0
+    undo_memory_mb: int = 32
+    undo_history_cache_mb: int = 64
+    undo_history_spill: bool = False
+    detect_duplicate_iou: float = 0.7
+    project_state_dir_name: str = ".ai_labeller_projects"
+    detect_skip_duplicates: bool = False
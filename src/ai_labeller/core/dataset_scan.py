@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg")
+
+
+@dataclass(frozen=True)
+class ScanEntry:
+    image_path: str
+    image_mtime_ns: int
+    image_size: int
+    label_path: str
+    label_mtime_ns: int | None
+    label_size: int
+
+    @property
+    def labeled(self) -> bool:
+        return self.label_size > 0
+
+
+def scan_dir(path: str, extensions: tuple[str, ...]) -> dict[str, tuple[int, int]]:
+    """Map file name -> ``(mtime_ns, size)`` for regular files in ``path`` with ``extensions``.
+
+    Uses the stat data ``os.scandir`` already fetched while listing, which on Windows and
+    SMB shares saves one round trip per file. A missing directory yields an empty dict.
+    """
+    found: dict[str, tuple[int, int]] = {}
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                # Hidden files (e.g. macOS "._name.jpg" on shares) were never matched by glob.
+                if entry.name.startswith(".") or not entry.name.lower().endswith(extensions):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found[entry.name] = (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        pass
+    return found
+
+
+def scan_split(image_dir: str, label_dir: str) -> list[ScanEntry]:
+    """List ``image_dir`` and ``label_dir`` once each and join them by file stem.
+
+    Entries are sorted by image file name, matching ``sorted(glob(...))`` on one folder.
+    """
+    images = scan_dir(image_dir, IMAGE_EXTENSIONS)
+    labels = scan_dir(label_dir, (".txt",))
+    entries: list[ScanEntry] = []
+    for name in sorted(images):
+        image_mtime, image_size = images[name]
+        label_name = f"{os.path.splitext(name)[0]}.txt"
+        label_mtime, label_size = labels.get(label_name, (None, 0))
+        entries.append(
+            ScanEntry(
+                image_path=f"{image_dir}/{name}",
+                image_mtime_ns=image_mtime,
+                image_size=image_size,
+                label_path=f"{label_dir}/{label_name}",
+                label_mtime_ns=label_mtime,
+                label_size=label_size,
+            )
+        )
+    return entries
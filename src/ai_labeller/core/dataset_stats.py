@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import os
+import warnings
+from dataclasses import dataclass, field
+from typing import Iterable
+
+import numpy as np
+
+from .dataset_scan import ScanEntry
+
+STATS_CACHE_FILE_NAME = ".ai_labeller_stats.npz"
+# Bumped whenever parse_label_boxes changes what it stores for the same file.
+STATS_CACHE_VERSION = 2
+
+# Edges for sqrt(w * h) of normalized boxes, i.e. box "size" as a fraction of the image.
+SIZE_BINS = np.array([0.0, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1.0, np.inf])
+# Edges for log2(w / h); the middle bin holds roughly square boxes.
+ASPECT_BINS = np.array([-np.inf, -2.0, -1.0, -0.5, 0.5, 1.0, 2.0, np.inf])
+PERCENTILES = (5, 50, 95)
+_EMPTY_BOXES = np.zeros((0, 5), dtype=np.float32)
+_BOUNDS_EPS = 1e-6
+
+
+def _obb_extents(rows: np.ndarray) -> np.ndarray:
+    """``class, cx, cy, w, h`` of the axis-aligned extent of ``class x1 y1 ... x4 y4`` rows."""
+    xs, ys = rows[:, 1:9:2], rows[:, 2:9:2]
+    x1, x2 = xs.min(axis=1), xs.max(axis=1)
+    y1, y2 = ys.min(axis=1), ys.max(axis=1)
+    return np.column_stack([rows[:, 0], (x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1]).astype(np.float32)
+
+
+def parse_label_boxes(content: str) -> tuple[np.ndarray, int]:
+    """Parse YOLO label text into an ``(N, 5)`` array and a count of malformed lines.
+
+    Columns are ``class, cx, cy, w, h``. Nine-column OBB lines (``class`` and four
+    corners, as ``load_img`` reads them) become the extent of their corners. Files whose
+    lines all have five or all have nine columns are parsed in one NumPy call; anything
+    else falls back to a per-line parse that skips lines with fewer than five columns or
+    that don't parse, and otherwise uses the first five columns.
+    """
+    lines = [line for line in content.splitlines() if line.strip()]
+    if not lines:
+        return _EMPTY_BOXES, 0
+    widths = {len(line.split()) for line in lines}
+    if len(widths) == 1 and widths <= {5, 9}:
+        width = widths.pop()
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                values = np.fromstring(content, dtype=np.float32, sep=" ")
+        except (ValueError, DeprecationWarning):
+            values = None
+        if values is not None and values.size == len(lines) * width:
+            boxes = values.reshape(len(lines), width)
+            return (boxes if width == 5 else _obb_extents(boxes)), 0
+    parsed: list[list[float]] = []
+    malformed = 0
+    for line in lines:
+        parts = line.split()
+        try:
+            if len(parts) < 5:
+                raise ValueError(line)
+            if len(parts) == 9:
+                parsed.extend(_obb_extents(np.array([[float(value) for value in parts]], dtype=np.float64)).tolist())
+            else:
+                parsed.append([float(value) for value in parts[:5]])
+        except ValueError:
+            malformed += 1
+    return (np.asarray(parsed, dtype=np.float32) if parsed else _EMPTY_BOXES), malformed
+
+
+@dataclass(frozen=True)
+class LabelFileStats:
+    mtime_ns: int
+    size: int
+    boxes: np.ndarray
+    malformed: int = 0
+
+
+@dataclass
+class DatasetStats:
+    image_count: int = 0
+    labeled_count: int = 0
+    box_count: int = 0
+    class_counts: dict[int, int] = field(default_factory=dict)
+    # boxes_per_image[k] is the number of images with exactly k boxes.
+    boxes_per_image: np.ndarray = field(default_factory=lambda: np.zeros(1, dtype=np.int64))
+    width_percentiles: tuple[float, ...] = ()
+    height_percentiles: tuple[float, ...] = ()
+    aspect_percentiles: tuple[float, ...] = ()
+    size_histogram: np.ndarray = field(default_factory=lambda: np.zeros(len(SIZE_BINS) - 1, dtype=np.int64))
+    aspect_histogram: np.ndarray = field(default_factory=lambda: np.zeros(len(ASPECT_BINS) - 1, dtype=np.int64))
+    out_of_bounds: int = 0
+    out_of_bounds_files: list[str] = field(default_factory=list)
+    malformed_lines: int = 0
+    parsed_files: int = 0
+    reused_files: int = 0
+
+
+def out_of_bounds_mask(boxes: np.ndarray) -> np.ndarray:
+    """Boxes that leave the unit square, have a non-positive size or hold NaNs."""
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=bool)
+    cx, cy, w, h = boxes[:, 1], boxes[:, 2], boxes[:, 3], boxes[:, 4]
+    with np.errstate(invalid="ignore"):
+        inside = (
+            (w > 0)
+            & (h > 0)
+            & (cx - w / 2 >= -_BOUNDS_EPS)
+            & (cy - h / 2 >= -_BOUNDS_EPS)
+            & (cx + w / 2 <= 1 + _BOUNDS_EPS)
+            & (cy + h / 2 <= 1 + _BOUNDS_EPS)
+        )
+    return ~inside
+
+
+class DatasetStatsEngine:
+    """Dataset-wide label statistics with a per-file cache keyed by mtime and size.
+
+    ``compute`` only reads label files whose ``(mtime_ns, size)`` differ from the cached
+    entry, then aggregates every file's boxes with vectorized NumPy operations. When
+    ``cache_path`` is given the per-file results are persisted there with ``save`` and read
+    back on the first ``compute``, so the next session starts warm. Not thread-safe: run
+    one ``compute`` at a time.
+    """
+
+    def __init__(self, cache_path: str | None = None, max_listed_files: int = 20) -> None:
+        self.cache_path = cache_path
+        self.max_listed_files = max_listed_files
+        self._files: dict[str, LabelFileStats] = {}
+        self._dirty = False
+        self._loaded = not cache_path
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def clear(self) -> None:
+        self._files.clear()
+        self._dirty = True
+
+    def file_stats(self, entry: ScanEntry) -> tuple[LabelFileStats | None, bool]:
+        """Cached or freshly parsed stats for one entry, and whether it had to be parsed."""
+        if entry.label_mtime_ns is None:
+            return None, False
+        cached = self._files.get(entry.label_path)
+        if cached is not None and (cached.mtime_ns, cached.size) == (entry.label_mtime_ns, entry.label_size):
+            return cached, False
+        try:
+            with open(entry.label_path, "r", encoding="utf-8") as handle:
+                boxes, malformed = parse_label_boxes(handle.read())
+        except (OSError, UnicodeDecodeError):
+            boxes, malformed = _EMPTY_BOXES, 0
+        stats = LabelFileStats(entry.label_mtime_ns, entry.label_size, boxes, malformed)
+        self._files[entry.label_path] = stats
+        self._dirty = True
+        return stats, True
+
+    def compute(self, entries: Iterable[ScanEntry]) -> DatasetStats:
+        """Aggregate statistics over ``entries``; cache entries for other files are dropped."""
+        if not self._loaded:
+            self._load()
+            self._loaded = True
+        result = DatasetStats()
+        per_file: list[np.ndarray] = []
+        box_counts: list[int] = []
+        label_paths: list[str] = []
+        seen: set[str] = set()
+        for entry in entries:
+            result.image_count += 1
+            stats, parsed = self.file_stats(entry)
+            if stats is None:
+                box_counts.append(0)
+                continue
+            seen.add(entry.label_path)
+            result.parsed_files += parsed
+            result.reused_files += not parsed
+            result.labeled_count += entry.labeled
+            result.malformed_lines += stats.malformed
+            per_file.append(stats.boxes)
+            label_paths.append(entry.label_path)
+            box_counts.append(len(stats.boxes))
+        for path in [path for path in self._files if path not in seen]:
+            del self._files[path]
+            self._dirty = True
+
+        if box_counts:
+            result.boxes_per_image = np.bincount(np.asarray(box_counts, dtype=np.int64))
+        boxes = np.concatenate(per_file) if per_file else _EMPTY_BOXES
+        result.box_count = len(boxes)
+        if not len(boxes):
+            return result
+
+        class_ids, counts = np.unique(boxes[:, 0].astype(np.int64), return_counts=True)
+        result.class_counts = {int(c): int(n) for c, n in zip(class_ids, counts)}
+
+        oob = out_of_bounds_mask(boxes)
+        result.out_of_bounds = int(oob.sum())
+        if result.out_of_bounds:
+            file_counts = np.asarray([len(b) for b in per_file], dtype=np.int64)
+            file_of_box = np.repeat(np.arange(len(per_file)), file_counts)
+            bad_files = np.unique(file_of_box[oob])
+            result.out_of_bounds_files = [label_paths[i] for i in bad_files[: self.max_listed_files]]
+
+        valid = boxes[~oob]
+        if len(valid):
+            w, h = valid[:, 3].astype(np.float64), valid[:, 4].astype(np.float64)
+            log_aspect = np.log2(w / h)
+            result.width_percentiles = tuple(float(v) for v in np.percentile(w, PERCENTILES))
+            result.height_percentiles = tuple(float(v) for v in np.percentile(h, PERCENTILES))
+            result.aspect_percentiles = tuple(float(v) for v in np.exp2(np.percentile(log_aspect, PERCENTILES)))
+            result.size_histogram = np.histogram(np.sqrt(w * h), bins=SIZE_BINS)[0]
+            result.aspect_histogram = np.histogram(log_aspect, bins=ASPECT_BINS)[0]
+        return result
+
+    # ---- persistence -----------------------------------------------------
+
+    def save(self) -> None:
+        if not self.cache_path or not self._dirty:
+            return
+        paths = list(self._files)
+        stats = [self._files[path] for path in paths]
+        lengths = np.asarray([len(s.boxes) for s in stats], dtype=np.int64)
+        temp_path = f"{self.cache_path}.tmp"
+        os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+        with open(temp_path, "wb") as handle:
+            np.savez(
+                handle,
+                version=np.asarray(STATS_CACHE_VERSION, dtype=np.int64),
+                paths=np.asarray(paths, dtype=str),
+                mtimes=np.asarray([s.mtime_ns for s in stats], dtype=np.int64),
+                sizes=np.asarray([s.size for s in stats], dtype=np.int64),
+                malformed=np.asarray([s.malformed for s in stats], dtype=np.int64),
+                lengths=lengths,
+                boxes=np.concatenate([s.boxes for s in stats]) if stats else _EMPTY_BOXES,
+            )
+        os.replace(temp_path, self.cache_path)
+        self._dirty = False
+
+    def _load(self) -> None:
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as data:
+                if "version" not in data or int(data["version"]) != STATS_CACHE_VERSION:
+                    # Written by an older parser; reparse everything once.
+                    return
+                paths, mtimes, sizes = data["paths"], data["mtimes"], data["sizes"]
+                malformed, lengths, boxes = data["malformed"], data["lengths"], data["boxes"]
+        except (OSError, KeyError, ValueError):
+            # A missing or unreadable cache only costs one full parse.
+            return
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        for i, path in enumerate(paths):
+            self._files[str(path)] = LabelFileStats(
+                int(mtimes[i]), int(sizes[i]), boxes[offsets[i]:offsets[i + 1]], int(malformed[i])
+            )
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from .io_utils import atomic_write_text
+
+
+class DebouncedFileWriter:
+    """Batch small state-file writes on a Tk timer and skip ones that change nothing.
+
+    ``write`` only records the latest content per path; the files are written
+    ``delay_ms`` after the first unflushed call, or by ``flush``. ``fingerprint`` is what
+    is compared against the last written version, so volatile parts such as timestamps
+    can be left out of it. ``tk_root`` only needs Tk's ``after`` and ``after_cancel``.
+    """
+
+    def __init__(self, tk_root: Any, delay_ms: int = 1000, logger: logging.Logger | None = None) -> None:
+        self.tk_root = tk_root
+        self.delay_ms = delay_ms
+        self.logger = logger or logging.getLogger(__name__)
+        self._after_id: Any = None
+        self._pending: dict[str, tuple[str, str]] = {}
+        self._written: dict[str, str] = {}
+        self.requested = 0
+        self.written = 0
+        self.skipped = 0
+
+    @property
+    def pending(self) -> bool:
+        return bool(self._pending)
+
+    def write(self, path: str, content: str, fingerprint: str | None = None) -> None:
+        self.requested += 1
+        self._pending[path] = (content, content if fingerprint is None else fingerprint)
+        if self._after_id is None:
+            self._after_id = self.tk_root.after(self.delay_ms, self._run)
+
+    def flush(self) -> None:
+        """Write everything pending now."""
+        self.cancel()
+        pending, self._pending = self._pending, {}
+        for path, (content, fingerprint) in pending.items():
+            if self._written.get(path) == fingerprint:
+                self.skipped += 1
+                continue
+            try:
+                atomic_write_text(path, content)
+            except Exception:
+                self.logger.exception("Failed to write state file: %s", path)
+                continue
+            self._written[path] = fingerprint
+            self.written += 1
+
+    def cancel(self) -> None:
+        if self._after_id is None:
+            return
+        try:
+            self.tk_root.after_cancel(self._after_id)
+        except Exception:
+            pass
+        self._after_id = None
+
+    def _run(self) -> None:
+        self._after_id = None
+        self.flush()
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+
+from .dataset_scan import IMAGE_EXTENSIONS, scan_dir
+
+
+DirMtimes = tuple[int | None, int | None]
+
+
+@dataclass(frozen=True)
+class FsEvent:
+    kind: str  # "added", "removed" or "modified"
+    path: str
+    is_label: bool = False
+    # (mtime_ns, size) from the scan that found the change; None for removals.
+    stat: tuple[int, int] | None = field(default=None, compare=False)
+
+
+def diff_snapshots(
+    before: dict[str, tuple[int, int]], after: dict[str, tuple[int, int]], directory: str, is_label: bool
+) -> list[FsEvent]:
+    events = [FsEvent("removed", f"{directory}/{name}", is_label) for name in before if name not in after]
+    for name, stat in after.items():
+        previous = before.get(name)
+        if previous is None:
+            events.append(FsEvent("added", f"{directory}/{name}", is_label, stat))
+        elif previous != stat:
+            events.append(FsEvent("modified", f"{directory}/{name}", is_label, stat))
+    return events
+
+
+def _dir_mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class PollingWatcher:
+    """Poll an image folder and its label folder for changes on a background thread.
+
+    Polling works on network mounts where native change notifications don't. A poll
+    only rescans when a folder's mtime changed, plus a full rescan every
+    ``full_scan_every`` polls to catch files rewritten in place. Events are queued for
+    the Tk thread to ``drain``, which also records in ``drained_dir_mtimes`` the folder
+    mtimes before and after the drained scans, so an index that was current before
+    them can be patched with the events instead of rescanned.
+    """
+
+    def __init__(self, image_dir: str, label_dir: str, interval_s: float = 2.0, full_scan_every: int = 10) -> None:
+        self.image_dir = image_dir
+        self.label_dir = label_dir
+        self.interval_s = interval_s
+        self.full_scan_every = max(1, full_scan_every)
+        self._images: dict[str, tuple[int, int]] | None = None
+        self._labels: dict[str, tuple[int, int]] = {}
+        self._dir_mtimes: tuple[int | None, int | None] = (None, None)
+        self._polls = 0
+        self._batches: queue.SimpleQueue[tuple[list[FsEvent], DirMtimes, DirMtimes]] = queue.SimpleQueue()
+        self.drained_dir_mtimes: tuple[DirMtimes, DirMtimes] | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="fs-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def drain(self) -> list[FsEvent]:
+        events: list[FsEvent] = []
+        span: tuple[DirMtimes, DirMtimes] | None = None
+        while True:
+            try:
+                batch, before, after = self._batches.get_nowait()
+            except queue.Empty:
+                self.drained_dir_mtimes = span
+                return events
+            events += batch
+            span = (before if span is None else span[0], after)
+
+    def poll_once(self) -> list[FsEvent]:
+        """Scan if needed and return the changes since the previous poll.
+
+        The first poll only records a baseline.
+        """
+        batch = self._poll()
+        return batch[0] if batch is not None else []
+
+    def _poll(self) -> tuple[list[FsEvent], DirMtimes, DirMtimes] | None:
+        # (events, folder mtimes before, folder mtimes after), or None if nothing was scanned.
+        dir_mtimes = (_dir_mtime_ns(self.image_dir), _dir_mtime_ns(self.label_dir))
+        self._polls += 1
+        if (
+            self._images is not None
+            and dir_mtimes == self._dir_mtimes
+            and self._polls % self.full_scan_every
+        ):
+            return None
+        previous_mtimes, self._dir_mtimes = self._dir_mtimes, dir_mtimes
+        images = scan_dir(self.image_dir, IMAGE_EXTENSIONS)
+        labels = scan_dir(self.label_dir, (".txt",))
+        if self._images is None:
+            self._images, self._labels = images, labels
+            return None
+        events = diff_snapshots(self._images, images, self.image_dir, is_label=False)
+        events += diff_snapshots(self._labels, labels, self.label_dir, is_label=True)
+        self._images, self._labels = images, labels
+        return events, previous_mtimes, dir_mtimes
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                batch = self._poll()
+                # Queue folder mtime changes even without events, so the drained span stays contiguous.
+                if batch is not None and (batch[0] or batch[1] != batch[2]):
+                    self._batches.put(batch)
+            except OSError:
+                # A share dropping out is retried on the next poll.
+                pass
+            self._stop.wait(self.interval_s)
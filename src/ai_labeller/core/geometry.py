@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import math
+from typing import Sequence
+
+import numpy as np
+
 from .types import Rect
 
 
 def calculate_iou(box1: Rect, box2: Rect) -> float:
-    """Compute IoU (intersection over union) for two axis-aligned boxes."""
+    """Compute IoU (intersection over union) for two axis-aligned boxes.
+
+    For one pair; use ``iou_matrix`` to compare many boxes at once.
+    """
     x1_1, y1_1, x2_1, y2_1 = box1[:4]
     x1_2, y1_2, x2_2, y2_2 = box2[:4]
     x1_i = max(x1_1, x1_2)
@@ -18,41 +26,321 @@ def calculate_iou(box1: Rect, box2: Rect) -> float:
     return inter / union if union > 0 else 0.0
 
 
-def fuse_boxes(boxes: list[Rect], iou_thresh: float, dist_thresh: int) -> list[Rect]:
-    """Iteratively merge boxes by IoU or short horizontal gap with vertical overlap."""
+def _as_array(boxes: Sequence[Sequence[float]] | np.ndarray, columns: int) -> np.ndarray:
+    """First ``columns`` columns of ``boxes`` as a float64 array; rects may be 5 or 6 long."""
+    if isinstance(boxes, np.ndarray):
+        arr = boxes.astype(np.float64, copy=False)
+        return arr.reshape(-1, arr.shape[-1] if arr.size else columns)[:, :columns]
+    return np.array([box[:columns] for box in boxes], dtype=np.float64).reshape(-1, columns)
+
+
+def iou_matrix(a: Sequence[Sequence[float]] | np.ndarray, b: Sequence[Sequence[float]] | np.ndarray) -> np.ndarray:
+    """IoU of every axis-aligned box in ``a`` against every box in ``b``.
+
+    ``a`` and ``b`` are N x 4 and M x 4 ``(x1, y1, x2, y2)`` rows (extra columns, such
+    as a rect's class id, are ignored); the result is N x M. Boxes with a negative
+    width or height count as empty.
+    """
+    a = _as_array(a, 4)
+    b = _as_array(b, 4)
+    ax1, ay1, ax2, ay2 = (a[:, k, None] for k in range(4))
+    bx1, by1, bx2, by2 = (b[None, :, k] for k in range(4))
+    iw = np.clip(np.minimum(ax2, bx2) - np.maximum(ax1, bx1), 0.0, None)
+    ih = np.clip(np.minimum(ay2, by2) - np.maximum(ay1, by1), 0.0, None)
+    inter = iw * ih
+    area_a = np.clip(ax2 - ax1, 0.0, None) * np.clip(ay2 - ay1, 0.0, None)
+    area_b = np.clip(bx2 - bx1, 0.0, None) * np.clip(by2 - by1, 0.0, None)
+    union = area_a + area_b - inter
+    return np.divide(inter, union, out=np.zeros_like(inter), where=(inter > 0) & (union > 0))
+
+
+def obb_corners(boxes: Sequence[Sequence[float]] | np.ndarray) -> np.ndarray:
+    """Corners of ``(x1, y1, x2, y2, angle_deg)`` rows as an N x 4 x 2 array.
+
+    As for rects, the extent is the box before rotation and the angle turns it about
+    its centre; corners follow ``(x1, y1), (x2, y1), (x2, y2), (x1, y2)``.
+    """
+    boxes = _as_array(boxes, 5)
+    x1 = np.minimum(boxes[:, 0], boxes[:, 2])
+    y1 = np.minimum(boxes[:, 1], boxes[:, 3])
+    x2 = np.maximum(boxes[:, 0], boxes[:, 2])
+    y2 = np.maximum(boxes[:, 1], boxes[:, 3])
+    cx, cy = (x1 + x2) / 2, (y1 + y2) / 2
+    dx = np.stack([x1, x2, x2, x1], axis=1) - cx[:, None]
+    dy = np.stack([y1, y1, y2, y2], axis=1) - cy[:, None]
+    theta = np.radians(boxes[:, 4])[:, None]
+    cos_t, sin_t = np.cos(theta), np.sin(theta)
+    return np.stack([cx[:, None] + dx * cos_t - dy * sin_t, cy[:, None] + dx * sin_t + dy * cos_t], axis=2)
+
+
+def _polygon_areas(points: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Shoelace areas of padded polygons: ``points`` is P x K x 2, the first ``counts`` rows valid."""
+    k = points.shape[1]
+    idx = np.arange(k)[None, :]
+    valid = idx < counts[:, None]
+    nxt = np.where(idx + 1 < counts[:, None], idx + 1, 0)
+    px, py = points[..., 0], points[..., 1]
+    qx = np.take_along_axis(px, nxt, axis=1)
+    qy = np.take_along_axis(py, nxt, axis=1)
+    return np.abs(np.where(valid, px * qy - qx * py, 0.0).sum(axis=1)) / 2
+
+
+def _clip_convex(subject: np.ndarray, counts: np.ndarray, clip: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """One Sutherland-Hodgman round per clip edge, for P polygon pairs at once.
+
+    ``subject`` is P x K x 2 padded with ``counts`` valid vertices and ``clip`` is
+    P x C x 2 convex polygons. Returns the intersections in the same padded form.
+    """
+    pairs = len(subject)
+    # Orient every clip polygon the same way so "inside" is one sign of the cross product.
+    orientation = np.sign(
+        (clip[:, :, 0] * np.roll(clip[:, :, 1], -1, axis=1) - np.roll(clip[:, :, 0], -1, axis=1) * clip[:, :, 1]).sum(
+            axis=1
+        )
+    )
+    orientation[orientation == 0] = 1.0
+    max_vertices = subject.shape[1] + clip.shape[1]
+    rows = np.arange(pairs)[:, None]
+    for e in range(clip.shape[1]):
+        start = clip[:, e]
+        edge = clip[:, (e + 1) % clip.shape[1]] - start
+        k = subject.shape[1]
+        idx = np.arange(k)[None, :]
+        valid = idx < counts[:, None]
+        nxt_idx = np.where(idx + 1 < counts[:, None], idx + 1, 0)
+        nxt = subject[rows, nxt_idx]
+        rel = subject - start[:, None, :]
+        side = orientation[:, None] * (edge[:, None, 0] * rel[..., 1] - edge[:, None, 1] * rel[..., 0])
+        side_next = np.take_along_axis(side, nxt_idx, axis=1)
+        inside = side >= 0
+        crosses = valid & (inside != (side_next >= 0))
+        denom = side - side_next
+        t = np.divide(side, denom, out=np.zeros_like(side), where=crosses & (denom != 0))
+        crossing = subject + t[..., None] * (nxt - subject)
+        # Each vertex emits itself when inside, then the edge crossing to its successor.
+        candidates = np.stack([subject, crossing], axis=2).reshape(pairs, 2 * k, 2)
+        keep = np.stack([valid & inside, crosses], axis=2).reshape(pairs, 2 * k)
+        order = np.argsort(~keep, axis=1, kind="stable")[:, :max_vertices]
+        subject = np.take_along_axis(candidates, order[..., None], axis=1)
+        counts = keep.sum(axis=1)
+    return subject, counts
+
+
+def convex_iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """IoU of every convex polygon in ``a`` (N x K x 2) against every one in ``b`` (M x L x 2)."""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    out = np.zeros((len(a), len(b)))
+    if not len(a) or not len(b):
+        return out
+    area_a = _polygon_areas(a, np.full(len(a), a.shape[1]))
+    area_b = _polygon_areas(b, np.full(len(b), b.shape[1]))
+    # Only clip pairs whose bounding boxes overlap.
+    hull_a = np.concatenate([a.min(axis=1), a.max(axis=1)], axis=1)
+    hull_b = np.concatenate([b.min(axis=1), b.max(axis=1)], axis=1)
+    ia, ib = np.nonzero(iou_matrix(hull_a, hull_b) > 0)
+    if not ia.size:
+        return out
+    clipped, counts = _clip_convex(a[ia], np.full(ia.size, a.shape[1]), b[ib])
+    inter = _polygon_areas(clipped, counts)
+    union = area_a[ia] + area_b[ib] - inter
+    out[ia, ib] = np.divide(inter, union, out=np.zeros_like(inter), where=(inter > 0) & (union > 0))
+    return out
+
+
+def obb_iou_matrix(a: Sequence[Sequence[float]] | np.ndarray, b: Sequence[Sequence[float]] | np.ndarray) -> np.ndarray:
+    """IoU matrix of rotated boxes given as ``(x1, y1, x2, y2, angle_deg)`` rows."""
+    return convex_iou_matrix(obb_corners(a), obb_corners(b))
+
+
+def rect_obbs(rects: Sequence[Sequence[float]] | np.ndarray) -> np.ndarray:
+    """``(x1, y1, x2, y2, angle_deg)`` rows for rects, taking the angle from index 5 when present."""
+    if isinstance(rects, np.ndarray):
+        arr = _as_array(rects, rects.shape[-1] if rects.size else 4)
+        angles = arr[:, 5] if arr.shape[1] > 5 else np.zeros(len(arr))
+        return np.column_stack([arr[:, :4], angles])
+    return np.array(
+        [[*rect[:4], rect[5] if len(rect) > 5 else 0.0] for rect in rects], dtype=np.float64
+    ).reshape(-1, 5)
+
+
+def rect_iou_matrix(a: Sequence[Sequence[float]] | np.ndarray, b: Sequence[Sequence[float]] | np.ndarray) -> np.ndarray:
+    """IoU matrix of rects that may carry a rotation; axis-aligned sets skip polygon clipping."""
+    obbs_a = rect_obbs(a)
+    obbs_b = rect_obbs(b)
+    if not (obbs_a[:, 4] % 180.0).any() and not (obbs_b[:, 4] % 180.0).any():
+        return iou_matrix(obbs_a, obbs_b)
+    return obb_iou_matrix(obbs_a, obbs_b)
+
+
+def suppress_duplicates(
+    rects: Sequence[Sequence[float]], iou_thresh: float, existing: Sequence[Sequence[float]] = ()
+) -> list[int]:
+    """Indices of ``rects`` to keep, dropping near-copies by rotation-aware IoU.
+
+    A rect is dropped when its IoU with any ``existing`` rect of the same class, or with
+    an earlier kept rect of the same class, exceeds ``iou_thresh``. Both IoU matrices
+    are computed in one call each.
+    """
+    if not len(rects):
+        return []
+    classes = np.asarray([r[4] for r in rects])
+    keep = np.ones(len(rects), dtype=bool)
+    if len(existing):
+        same_class = classes[:, None] == np.asarray([r[4] for r in existing])[None, :]
+        keep &= ~((rect_iou_matrix(rects, existing) > iou_thresh) & same_class).any(axis=1)
+    overlaps = (rect_iou_matrix(rects, rects) > iou_thresh) & (classes[:, None] == classes[None, :])
+    for i in range(len(rects)):
+        if keep[i]:
+            keep[i + 1 :] &= ~overlaps[i, i + 1 :]
+    return np.flatnonzero(keep).tolist()
+
+
+_MAX_CELLS_PER_BOX = 256
+
+
+class _BoxGrid:
+    """Uniform grid over (x1, y1, x2, y2) rows for neighbour lookups.
+
+    Boxes that are malformed, non-finite or span too many cells are kept in
+    ``always`` and returned by every query, so a query is always a superset of the
+    boxes touching its rectangle.
+    """
+
+    def __init__(self, coords: np.ndarray, cell: float) -> None:
+        self.cell = cell
+        self.size = len(coords)
+        self.cells: dict[tuple[int, int], list[int]] = {}
+        with np.errstate(invalid="ignore"):
+            ok = np.isfinite(coords).all(axis=1) & (coords[:, 2] >= coords[:, 0]) & (coords[:, 3] >= coords[:, 1])
+        spans = np.zeros((len(coords), 4), dtype=np.int64)
+        spans[ok] = np.floor(coords[ok] / cell).astype(np.int64)
+        area = (spans[:, 2] - spans[:, 0] + 1) * (spans[:, 3] - spans[:, 1] + 1)
+        ok &= area <= _MAX_CELLS_PER_BOX
+        self.always = np.flatnonzero(~ok)
+        for idx, (gx1, gy1, gx2, gy2) in zip(np.flatnonzero(ok).tolist(), spans[ok].tolist()):
+            for gx in range(gx1, gx2 + 1):
+                for gy in range(gy1, gy2 + 1):
+                    self.cells.setdefault((gx, gy), []).append(idx)
+
+    def query(self, x1: float, y1: float, x2: float, y2: float) -> np.ndarray:
+        """Sorted indices of boxes whose cells touch the rectangle."""
+        if not all(math.isfinite(v) for v in (x1, y1, x2, y2)) or x2 < x1 or y2 < y1:
+            return np.arange(self.size)
+        gx1, gy1 = math.floor(x1 / self.cell), math.floor(y1 / self.cell)
+        gx2, gy2 = math.floor(x2 / self.cell), math.floor(y2 / self.cell)
+        if (gx2 - gx1 + 1) * (gy2 - gy1 + 1) > max(len(self.cells), 1):
+            return np.arange(self.size)
+        found: list[int] = []
+        for gx in range(gx1, gx2 + 1):
+            for gy in range(gy1, gy2 + 1):
+                found.extend(self.cells.get((gx, gy), ()))
+        if self.always.size:
+            found.extend(self.always.tolist())
+        return np.unique(np.asarray(found, dtype=np.int64))
+
+
+def _merge_mask(
+    curr: tuple[float, float, float, float], others: np.ndarray, iou: np.ndarray, iou_thresh: float, dist_thresh: float
+) -> np.ndarray:
+    """``fuse_boxes``' merge test of one footprint against many, given their IoU."""
+    cx1, cy1, cx2, cy2 = curr
+    ox1, oy1, ox2, oy2 = others[:, 0], others[:, 1], others[:, 2], others[:, 3]
+    h_dist = np.maximum(0.0, np.maximum(cx1, ox1) - np.minimum(cx2, ox2))
+    v_overlap = np.minimum(cy2, oy2) - np.maximum(cy1, oy1)
+    return (iou > iou_thresh) | ((v_overlap > 0) & (h_dist <= dist_thresh))
+
+
+def _fuse_pass(
+    current: list[Rect], iou_thresh: float, dist_thresh: float, use_angles: bool
+) -> tuple[list[Rect], bool]:
+    obbs = rect_obbs(current)
+    if use_angles:
+        rotated = (obbs[:, 4] % 180.0) != 0
+    else:
+        obbs[:, 4] = 0.0
+        rotated = np.zeros(len(current), dtype=bool)
+    # Footprint of each box: its extent, or for a rotated box the extent of its corners.
+    coords = obbs[:, :4].copy()
+    if rotated.any():
+        corners = obb_corners(obbs[rotated])
+        coords[rotated] = np.concatenate([corners.min(axis=1), corners.max(axis=1)], axis=1)
+    n = len(current)
+    # With a non-negative IoU threshold only boxes that overlap vertically and lie
+    # within dist_thresh horizontally can merge, so the grid can narrow the search.
+    grid = None
+    reach = max(float(dist_thresh), 0.0)
+    if iou_thresh >= 0 and n > 32:
+        with np.errstate(invalid="ignore"):
+            sides = np.maximum(coords[:, 2] - coords[:, 0], coords[:, 3] - coords[:, 1])
+        sides = sides[np.isfinite(sides) & (sides > 0)]
+        cell = (float(np.median(sides)) if sides.size else 1.0) + reach
+        grid = _BoxGrid(coords, max(cell, 1.0))
+    used = np.zeros(n, dtype=bool)
+    merged: list[Rect] = []
+    changed = False
+    for i in range(n):
+        if used[i]:
+            continue
+        used[i] = True
+        curr = current[i][:]
+        footprint = coords[i].tolist() if rotated[i] else curr[:4]
+        last = i
+        while True:
+            if grid is None:
+                candidates = np.arange(last + 1, n)
+            else:
+                candidates = grid.query(footprint[0] - reach, footprint[1], footprint[2] + reach, footprint[3])
+                candidates = candidates[candidates > last]
+            candidates = candidates[~used[candidates]]
+            if not candidates.size:
+                break
+            # Once merged, the grown box is axis-aligned.
+            curr_rotated = last == i and rotated[i]
+            if curr_rotated or rotated[candidates].any():
+                curr_obb = obbs[i] if curr_rotated else np.array([*footprint, 0.0], dtype=np.float64)
+                iou = obb_iou_matrix(curr_obb[None], obbs[candidates])[0]
+            else:
+                iou = iou_matrix(np.array([footprint], dtype=np.float64), coords[candidates])[0]
+            hits = _merge_mask(tuple(float(v) for v in footprint), coords[candidates], iou, iou_thresh, dist_thresh)
+            if not hits.any():
+                break
+            # The sequential loop merges the first match, then keeps scanning after it.
+            j = int(candidates[int(hits.argmax())])
+            other = coords[j].tolist() if rotated[j] else current[j]
+            curr = [
+                min(footprint[0], other[0]),
+                min(footprint[1], other[1]),
+                max(footprint[2], other[2]),
+                max(footprint[3], other[3]),
+                curr[4],
+            ]
+            footprint = curr[:4]
+            used[j] = True
+            changed = True
+            last = j
+        merged.append(curr)
+    return merged, changed
+
+
+def fuse_boxes(boxes: list[Rect], iou_thresh: float, dist_thresh: int, use_angles: bool = False) -> list[Rect]:
+    """Iteratively merge boxes by IoU or short horizontal gap with vertical overlap.
+
+    Each pass walks the boxes in order and grows each unmerged box by absorbing, in
+    index order, every later box that matches it as grown so far; passes repeat until
+    nothing merges. Instead of testing every pair, a pass looks up neighbours in a
+    uniform grid and tests them with NumPy, so thousands of candidates fuse in well
+    under quadratic time with the same result as a pairwise scan.
+
+    Boxes are compared by their ``x1 y1 x2 y2`` extent and any angle is ignored. With
+    ``use_angles``, rects with an angle at index 5 are compared by rotated IoU and by
+    the extent of their corners instead. The merged box is then the axis-aligned union
+    of its members' footprints, so it has no angle.
+    """
     if len(boxes) <= 1:
         return boxes
-    keep_fusing = True
     current = [box[:] for box in boxes]
-    while keep_fusing:
-        keep_fusing = False
-        merged: list[Rect] = []
-        used = [False] * len(current)
-        for i, box in enumerate(current):
-            if used[i]:
-                continue
-            curr = box[:]
-            used[i] = True
-            for j in range(i + 1, len(current)):
-                if used[j]:
-                    continue
-                other = current[j]
-                should_merge = calculate_iou(curr, other) > iou_thresh
-                if not should_merge:
-                    h_dist = max(0, max(curr[0], other[0]) - min(curr[2], other[2]))
-                    v_overlap = min(curr[3], other[3]) - max(curr[1], other[1])
-                    if v_overlap > 0 and h_dist <= dist_thresh:
-                        should_merge = True
-                if should_merge:
-                    curr = [
-                        min(curr[0], other[0]),
-                        min(curr[1], other[1]),
-                        max(curr[2], other[2]),
-                        max(curr[3], other[3]),
-                        curr[4],
-                    ]
-                    used[j] = True
-                    keep_fusing = True
-            merged.append(curr)
-        current = merged
+    changed = True
+    while changed:
+        current, changed = _fuse_pass(current, iou_thresh, dist_thresh, use_angles)
     return current
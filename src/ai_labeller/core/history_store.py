@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .commands import HistoryManager
+from .types import Rect
+
+HISTORY_FILE_NAME = ".ai_labeller_history.sqlite"
+
+
+def content_fingerprint(content: str) -> str:
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class _StoredHistory:
+    fingerprint: str
+    undo: list
+    redo: list
+    nbytes: int
+
+
+class HistoryStore:
+    """Per-image undo histories kept across navigation, keyed by label path.
+
+    ``stash`` takes the delta records of the image being left together with a
+    fingerprint of the label content they end at; ``restore`` only hands them back
+    when the label loaded on return still has that fingerprint. Entries live in an LRU
+    bounded by ``max_bytes``. With ``spill_path`` set, entries evicted from memory (and
+    all of them on ``close``) go to a SQLite file instead of being dropped. The file is
+    created by the first spill, and its keys are read once, so ``restore`` only queries
+    it for keys it holds.
+    """
+
+    def __init__(self, max_bytes: int, spill_path: str | None = None, logger: logging.Logger | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.spill_path = spill_path
+        self.logger = logger or logging.getLogger(__name__)
+        self._entries: OrderedDict[str, _StoredHistory] = OrderedDict()
+        self._nbytes = 0
+        self._conn: sqlite3.Connection | None = None
+        self._keys: set[str] | None = None
+        self.spilled = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._nbytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stash(self, key: str, fingerprint: str, history: HistoryManager) -> None:
+        self.discard(key)
+        if not history.undo_depth and not history.redo_depth:
+            return
+        undo, redo = history.export_stacks()
+        entry = _StoredHistory(fingerprint, undo, redo, history.nbytes)
+        self._entries[key] = entry
+        self._nbytes += entry.nbytes
+        while self._nbytes > self.max_bytes and self._entries:
+            old_key, old = self._entries.popitem(last=False)
+            self._nbytes -= old.nbytes
+            self._spill(old_key, old)
+
+    def restore(self, key: str, fingerprint: str, history: HistoryManager, target: list[Rect]) -> bool:
+        """Load the history stashed for ``key`` into ``history``; False if none or stale."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+        else:
+            entry = self._unspill(key)
+        if entry is None or entry.fingerprint != fingerprint:
+            return False
+        try:
+            history.import_stacks(target, entry.undo, entry.redo)
+        except (ValueError, TypeError, IndexError):
+            self.logger.warning("Discarding unreadable undo history for %s", key)
+            history.clear()
+            return False
+        return True
+
+    def discard(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._nbytes -= entry.nbytes
+
+    def close(self) -> None:
+        """Spill everything still in memory and close the spill file."""
+        while self._entries:
+            key, entry = self._entries.popitem(last=False)
+            self._spill(key, entry)
+        self._nbytes = 0
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _connection(self) -> sqlite3.Connection | None:
+        if self._conn is None and self.spill_path:
+            try:
+                os.makedirs(os.path.dirname(self.spill_path) or ".", exist_ok=True)
+                self._conn = sqlite3.connect(self.spill_path)
+                self._conn.execute("PRAGMA synchronous = OFF")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS history (key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                    "payload TEXT NOT NULL)"
+                )
+            except (sqlite3.Error, OSError):
+                self.logger.exception("Undo history file unavailable: %s", self.spill_path)
+                self.spill_path = None
+                self._conn = None
+        return self._conn
+
+    def _spilled_keys(self) -> set[str]:
+        if self._keys is None:
+            self._keys = set()
+            if self.spill_path and os.path.exists(self.spill_path):
+                conn = self._connection()
+                try:
+                    if conn is not None:
+                        self._keys = {key for (key,) in conn.execute("SELECT key FROM history")}
+                except sqlite3.Error:
+                    self.logger.exception("Failed to list spilled undo histories: %s", self.spill_path)
+        return self._keys
+
+    def _spill(self, key: str, entry: _StoredHistory) -> None:
+        keys = self._spilled_keys()
+        conn = self._connection()
+        if conn is None:
+            return
+        payload = json.dumps({"undo": entry.undo, "redo": entry.redo, "nbytes": entry.nbytes})
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO history (key, fingerprint, payload) VALUES (?, ?, ?)",
+                    (key, entry.fingerprint, payload),
+                )
+            keys.add(key)
+            self.spilled += 1
+        except sqlite3.Error:
+            self.logger.exception("Failed to spill undo history for %s", key)
+
+    def _unspill(self, key: str) -> _StoredHistory | None:
+        keys = self._spilled_keys()
+        if key not in keys:
+            return None
+        conn = self._connection()
+        if conn is None:
+            return None
+        keys.discard(key)
+        try:
+            row = conn.execute("SELECT fingerprint, payload FROM history WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute("DELETE FROM history WHERE key = ?", (key,))
+            payload = json.loads(row[1])
+        except (sqlite3.Error, ValueError):
+            self.logger.exception("Failed to read spilled undo history for %s", key)
+            return None
+        return _StoredHistory(row[0], payload["undo"], payload["redo"], payload["nbytes"])
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+
+from PIL import Image
+
+
+def decode_image(path: str) -> Image.Image:
+    """Open and fully decode an image so it holds no file handle afterwards."""
+    image = Image.open(path)
+    image.load()
+    return image
+
+
+def decode_display_image(path: str, max_side: int = 0) -> Image.Image:
+    """Decode ``path`` for display, using JPEG draft mode to shrink oversized images.
+
+    Draft decoding scales by 1/2, 1/4 or 1/8 inside the JPEG decoder, so the result is
+    never smaller than ``max_side`` on its long side. Other formats decode at full size.
+    ``max_side <= 0`` always decodes at full size.
+    """
+    image = Image.open(path)
+    if max_side > 0 and image.format == "JPEG" and max(image.size) > max_side:
+        ratio = max_side / max(image.size)
+        image.draft(None, (math.ceil(image.width * ratio), math.ceil(image.height * ratio)))
+    image.load()
+    return image
+
+
+def image_nbytes(image: Image.Image) -> int:
+    return image.width * image.height * max(1, len(image.getbands()))
+
+
+class DecodedImageCache:
+    """Thread-safe LRU of decoded images bounded by an approximate byte budget.
+
+    Evicted images are not closed: the app may still be displaying them.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self._items: OrderedDict[str, tuple[Image.Image, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, path: str) -> bool:
+        with self._lock:
+            return path in self._items
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._items)
+
+    def get(self, path: str) -> Image.Image | None:
+        with self._lock:
+            entry = self._items.get(path)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(path)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, path: str, image: Image.Image) -> None:
+        size = image_nbytes(image)
+        with self._lock:
+            old = self._items.pop(path, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._items[path] = (image, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes and self._items:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.current_bytes -= evicted_size
+
+    def discard(self, path: str) -> None:
+        with self._lock:
+            old = self._items.pop(path, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.current_bytes = 0
+
+
+class ImagePrefetcher:
+    """Decode upcoming images on a small thread pool into a ``DecodedImageCache``."""
+
+    def __init__(
+        self,
+        cache: DecodedImageCache,
+        decode: Callable[[str], Image.Image] = decode_image,
+        max_workers: int = 2,
+    ) -> None:
+        self.cache = cache
+        self._decode = decode
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="prefetch")
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._inflight: dict[str, Future] = {}
+
+    def prefetch(self, paths: list[str]) -> None:
+        """Queue ``paths`` (most wanted first) that are neither cached nor in flight."""
+        with self._lock:
+            generation = self._generation
+            for path in paths:
+                if path in self._inflight or path in self.cache:
+                    continue
+                future = self._executor.submit(self._load, path, generation)
+                self._inflight[path] = future
+
+    def get(self, path: str) -> Image.Image | None:
+        """Return the cached image, waiting for an in-flight decode of ``path`` if any."""
+        with self._lock:
+            future = self._inflight.get(path)
+        if future is not None and not future.cancelled():
+            try:
+                future.result()
+            except Exception:
+                pass
+        return self.cache.get(path)
+
+    def cancel(self) -> None:
+        """Drop queued work; results of decodes already running are discarded."""
+        with self._lock:
+            self._generation += 1
+            for future in self._inflight.values():
+                future.cancel()
+            self._inflight.clear()
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, path: str, generation: int) -> None:
+        try:
+            if generation != self._generation:
+                return
+            image = self._decode(path)
+            if generation == self._generation:
+                self.cache.put(path, image)
+        except Exception:
+            # load_img reports the failure if the image is actually opened.
+            pass
+        finally:
+            with self._lock:
+                if generation == self._generation:
+                    self._inflight.pop(path, None)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import uuid
@@ -24,3 +25,13 @@ def atomic_write_text(path: str, content: str, encoding: str = "utf-8") -> None:
 
 def atomic_write_json(path: str, payload: Any, encoding: str = "utf-8") -> None:
     atomic_write_text(path, json.dumps(payload, ensure_ascii=False), encoding=encoding)
+
+
+def project_state_path(state_dir: str, project_root: str, file_name: str) -> str:
+    """Path of a per-project file under ``state_dir``, keyed by a hash of the project path.
+
+    Lets a project's caches and journals live on local disk rather than on the share
+    or in the image folder, where every write would bump the folder's mtime.
+    """
+    key = os.path.normcase(os.path.abspath(project_root)).encode("utf-8")
+    return os.path.join(state_dir, hashlib.sha1(key).hexdigest()[:16], file_name)
@@ -0,0 +1,278 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import IO
+
+from .io_utils import atomic_write_json, atomic_write_text
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@dataclass(frozen=True)
+class LabelWrite:
+    """Desired on-disk state of one label file and its rotation sidecar.
+
+    Empty ``content`` deletes the label file. ``angles_deg`` of ``None`` deletes the
+    sidecar; otherwise it is written as ``{"version": 1, "angles_deg": ...}``.
+    """
+
+    label_path: str
+    content: str
+    rot_meta_path: str
+    angles_deg: list[float] | None = None
+
+
+def _try_lock(handle: IO[str]) -> bool:
+    """Take an exclusive, non-blocking lock on an open file; released when it is closed."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        return False
+    return True
+
+
+def apply_label_write(write: LabelWrite) -> None:
+    if not write.content:
+        for path in (write.label_path, write.rot_meta_path):
+            if os.path.exists(path):
+                os.remove(path)
+        return
+    atomic_write_text(write.label_path, write.content)
+    if write.angles_deg is not None:
+        atomic_write_json(write.rot_meta_path, {"version": 1, "angles_deg": write.angles_deg})
+    elif os.path.exists(write.rot_meta_path):
+        os.remove(write.rot_meta_path)
+
+
+class LabelWriteQueue:
+    """Write label files on a background thread, coalescing saves of the same file.
+
+    With a journal open (``open_journal``, one per project), each submitted write is
+    first appended and fsynced to a JSON-lines file, so writes that were queued but not
+    yet applied when the process died are replayed the next time the project is opened.
+    The journal is locked while open: a second instance on the same project works
+    without one rather than replaying or truncating entries the first still needs. It
+    is truncated whenever the queue drains; writes that failed stay in it. Journal I/O
+    happens under its own lock, never under the one ``lookup`` and ``pending_count``
+    take, so keep the journal on a local disk: ``submit`` waits for its fsync.
+    """
+
+    def __init__(self, logger: logging.Logger | None = None) -> None:
+        self.journal_path: str | None = None
+        self._journal: IO[str] | None = None
+        # Guards the journal handle. Taken before _cond, never while holding it.
+        self._journal_lock = threading.Lock()
+        self.logger = logger or logging.getLogger(__name__)
+        self._pending: dict[str, LabelWrite] = {}
+        self._inflight: LabelWrite | None = None
+        self._failed: dict[str, LabelWrite] = {}
+        self._errors: list[tuple[str, Exception]] = []
+        # (mtime_ns, size) of each label file as the last applied write left it; None if deleted.
+        self._written_stats: dict[str, tuple[int, int] | None] = {}
+        self._cond = threading.Condition()
+        self._closed = False
+        self.submitted = 0
+        self.written = 0
+        self._thread = threading.Thread(target=self._run, name="label-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending) + (self._inflight is not None)
+
+    def submit(self, write: LabelWrite) -> None:
+        if self._closed:
+            raise RuntimeError("LabelWriteQueue is closed")
+        # Holding the journal lock until the write is queued keeps the worker from
+        # truncating the journal between the append and the enqueue.
+        with self._journal_lock:
+            self._append_journal(write)
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("LabelWriteQueue is closed")
+                self._pending[write.label_path] = write
+                self._failed.pop(write.label_path, None)
+                self.submitted += 1
+                self._cond.notify_all()
+
+    def lookup(self, label_path: str) -> LabelWrite | None:
+        """Return the not-yet-applied write for ``label_path``, if any."""
+        with self._cond:
+            write = self._pending.get(label_path)
+            if write is None and self._inflight is not None and self._inflight.label_path == label_path:
+                write = self._inflight
+            return write
+
+    def wrote(self, label_path: str, stat: tuple[int, int] | None) -> bool:
+        """Whether ``label_path`` with ``stat`` (None if absent) is as this queue's last write left it.
+
+        Lets a folder watcher tell the app's own saves from edits by other tools.
+        """
+        with self._cond:
+            return label_path in self._written_stats and self._written_stats[label_path] == stat
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Block until every submitted write has been applied; False on timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and self._inflight is None, timeout)
+
+    def take_errors(self) -> list[tuple[str, Exception]]:
+        with self._cond:
+            errors, self._errors = self._errors, []
+            return errors
+
+    def open_journal(self, journal_path: str, timeout: float | None = None) -> int:
+        """Switch to the journal at ``journal_path`` and replay what a previous run left in it.
+
+        Writes already queued are flushed under the old journal first. Returns the number
+        of replayed writes; 0 as well when the journal is locked by another instance or
+        cannot be opened, in which case writes go unjournaled.
+        """
+        self.flush(timeout)
+        with self._journal_lock:
+            self._close_journal()
+            try:
+                os.makedirs(os.path.dirname(journal_path) or ".", exist_ok=True)
+                handle = open(journal_path, "a+", encoding="utf-8")
+            except OSError:
+                self.logger.exception("Label journal unavailable: %s", journal_path)
+                return 0
+            if not _try_lock(handle):
+                handle.close()
+                self.logger.warning("Label journal %s is in use by another instance; saving without it", journal_path)
+                return 0
+            self._journal = handle
+            self.journal_path = journal_path
+            try:
+                handle.seek(0)
+                lines = handle.readlines()
+            except OSError:
+                self.logger.exception("Failed to read label journal: %s", journal_path)
+                return 0
+            latest: dict[str, LabelWrite] = {}
+            for line in lines:
+                try:
+                    write = LabelWrite(**json.loads(line))
+                except (ValueError, TypeError):
+                    continue
+                latest[write.label_path] = write
+            # Already journaled, so queue them without appending again.
+            with self._cond:
+                self._pending.update(latest)
+                self.submitted += len(latest)
+                self._cond.notify_all()
+            return len(latest)
+
+    def close(self, timeout: float | None = None) -> bool:
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        with self._journal_lock:
+            self._close_journal()
+        return flushed
+
+    def _append_journal(self, write: LabelWrite) -> None:
+        if self._journal is None:
+            return
+        try:
+            self._journal.write(json.dumps(asdict(write), ensure_ascii=False) + "\n")
+            self._journal.flush()
+            os.fsync(self._journal.fileno())
+        except OSError:
+            self.logger.exception("Failed to append label journal: %s", self.journal_path)
+
+    def _rewrite_journal(self) -> None:
+        # Truncates the journal to the failed writes if the queue is still drained.
+        with self._journal_lock:
+            if self._journal is None:
+                return
+            with self._cond:
+                if self._pending:
+                    return
+                failed = list(self._failed.values())
+            try:
+                self._journal.seek(0)
+                self._journal.truncate()
+                for write in failed:
+                    self._journal.write(json.dumps(asdict(write), ensure_ascii=False) + "\n")
+                self._journal.flush()
+                os.fsync(self._journal.fileno())
+            except OSError:
+                self.logger.exception("Failed to truncate label journal: %s", self.journal_path)
+
+    def _close_journal(self) -> None:
+        # Called with the journal lock held; an empty journal is removed.
+        if self._journal is None:
+            return
+        handle, path = self._journal, self.journal_path
+        self._journal = None
+        self.journal_path = None
+        # Failed writes stay in this journal for the next time it is opened.
+        with self._cond:
+            self._failed.clear()
+        try:
+            empty = os.fstat(handle.fileno()).st_size == 0
+            if empty and fcntl is not None:
+                # Unlink while still locked so another instance can't open the doomed file.
+                os.remove(path)
+            handle.close()
+            if empty and fcntl is None:
+                os.remove(path)
+        except OSError:
+            self.logger.exception("Failed to close label journal: %s", path)
+
+    def _record_written_stat(self, write: LabelWrite) -> None:
+        written_stat = None
+        if write.content:
+            try:
+                stat = os.stat(write.label_path)
+            except OSError:
+                with self._cond:
+                    self._written_stats.pop(write.label_path, None)
+                return
+            written_stat = (stat.st_mtime_ns, stat.st_size)
+        with self._cond:
+            self._written_stats[write.label_path] = written_stat
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._closed)
+                if not self._pending:
+                    return
+                label_path = next(iter(self._pending))
+                write = self._pending.pop(label_path)
+                self._inflight = write
+            try:
+                apply_label_write(write)
+            except Exception as exc:
+                self.logger.exception("Failed to save label file: %s", write.label_path)
+                with self._cond:
+                    self._failed[write.label_path] = write
+                    self._errors.append((write.label_path, exc))
+            else:
+                self._record_written_stat(write)
+                self.written += 1
+            with self._cond:
+                drained = not self._pending
+            # Still in flight until the journal is rewritten, so flush() covers the rewrite.
+            if drained:
+                self._rewrite_journal()
+            with self._cond:
+                self._inflight = None
+                self._cond.notify_all()
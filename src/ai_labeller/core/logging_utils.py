@@ -24,3 +24,29 @@ def setup_logging(log_path: str | None = None) -> logging.Logger:
             logger.addHandler(file_handler)
 
     return logger
+
+
+def setup_trace_logging(
+    trace_path: str,
+    max_bytes: int = 2_000_000,
+    backup_count: int = 3,
+) -> logging.Logger:
+    """Return the opt-in performance trace logger, writing raw JSON lines to a rolling file."""
+    logger = logging.getLogger("ai_labeller.trace")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    if not any(isinstance(h, RotatingFileHandler) for h in logger.handlers):
+        Path(trace_path).parent.mkdir(parents=True, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            trace_path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+        )
+        file_handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(file_handler)
+    return logger
+
+
+def close_trace_logging() -> None:
+    logger = logging.getLogger("ai_labeller.trace")
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
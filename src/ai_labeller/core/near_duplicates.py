@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Generic, Hashable, Iterable, TypeVar
+
+import numpy as np
+from PIL import Image
+
+T = TypeVar("T", bound=Hashable)
+
+HASH_SIZE = 8
+
+
+def difference_hash(path: str, hash_size: int = HASH_SIZE) -> int:
+    """64-bit dHash: whether each pixel of a tiny grayscale copy is brighter than its left neighbour."""
+    with Image.open(path) as image:
+        # Let the JPEG decoder drop to 1/8 scale; the hash only needs a 9x8 image.
+        image.draft("L", (hash_size * 4, hash_size * 4))
+        small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).ravel()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def _hash_or_none(path: str) -> int | None:
+    try:
+        return difference_hash(path)
+    except Exception:
+        return None
+
+
+def hash_images(
+    paths: list[str],
+    max_workers: int | None = None,
+    chunksize: int = 32,
+    on_progress: Callable[[int, int], None] | None = None,
+) -> dict[str, int]:
+    """Hash ``paths`` in a process pool; unreadable images are left out of the result."""
+    hashes: dict[str, int] = {}
+    total = len(paths)
+    done = 0
+
+    def collect(results: Iterable[int | None]) -> None:
+        nonlocal done
+        for value in results:
+            if value is not None:
+                hashes[paths[done]] = value
+            done += 1
+            if on_progress is not None and done % chunksize == 0:
+                on_progress(done, total)
+
+    if total < 2 * chunksize or max_workers == 1:
+        # Not worth starting worker processes for.
+        collect(map(_hash_or_none, paths))
+        return hashes
+    try:
+        # Spawn rather than fork: the caller is a GUI process with live threads.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=context) as pool:
+            collect(pool.map(_hash_or_none, paths, chunksize=chunksize))
+    except (BrokenProcessPool, OSError):
+        # The pool could not be created or its workers died (e.g. a sandbox without
+        # semaphores or process spawning); finish the remaining paths in-process.
+        collect(map(_hash_or_none, paths[done:]))
+    return hashes
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class BKTree(Generic[T]):
+    """Burkhard-Keller tree over integer hashes under Hamming distance.
+
+    ``search`` uses the triangle inequality to skip every subtree whose edge distance
+    is further than ``radius`` from the query's distance to the node, so a small radius
+    visits a small fraction of the tree instead of every hash.
+    """
+
+    def __init__(self) -> None:
+        # Node: [hash, items with that hash, {distance: child node}]
+        self._root: list | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, value: int, item: T) -> None:
+        self._size += 1
+        if self._root is None:
+            self._root = [value, [item], {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value: int, radius: int) -> list[tuple[int, T]]:
+        """``(distance, item)`` for every stored item within ``radius`` of ``value``."""
+        found: list[tuple[int, T]] = []
+        stack = [self._root] if self._root is not None else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= radius:
+                found.extend((distance, item) for item in node[1])
+            for edge, child in node[2].items():
+                if distance - radius <= edge <= distance + radius:
+                    stack.append(child)
+        return found
+
+
+def find_near_duplicates(hashes: dict[T, int], max_distance: int = 4) -> list[list[T]]:
+    """Group items whose hashes are within ``max_distance`` bits of each other.
+
+    Groups are transitive (a slow pan can chain many frames into one group). Each
+    group is sorted and the groups are ordered by their first item.
+    """
+    parent: dict[T, T] = {}
+
+    def find(item: T) -> T:
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    tree: BKTree[T] = BKTree()
+    for item, value in hashes.items():
+        parent[item] = item
+        # Querying before inserting compares each pair once.
+        for _, other in tree.search(value, max_distance):
+            a, b = find(item), find(other)
+            if a != b:
+                parent[a] = b
+        tree.add(value, item)
+
+    groups: dict[T, list[T]] = {}
+    for item in hashes:
+        groups.setdefault(find(item), []).append(item)
+    return sorted((sorted(group) for group in groups.values() if len(group) > 1), key=lambda group: group[0])
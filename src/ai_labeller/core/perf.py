@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import logging
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+
+class PerfMonitor:
+    """Rolling timings and counters for the label UI, with an optional JSON-lines trace."""
+
+    def __init__(self, window: int = 120) -> None:
+        self.window = window
+        self._timings: dict[str, deque[float]] = {}
+        self.counters: dict[str, int] = {}
+        self.trace_logger: logging.Logger | None = None
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - started) * 1000.0)
+
+    def record(self, name: str, elapsed_ms: float) -> None:
+        samples = self._timings.get(name)
+        if samples is None:
+            samples = deque(maxlen=self.window)
+            self._timings[name] = samples
+        samples.append(elapsed_ms)
+        self.trace("timing", name=name, ms=round(elapsed_ms, 3))
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def last_ms(self, name: str) -> float:
+        samples = self._timings.get(name)
+        return samples[-1] if samples else 0.0
+
+    def avg_ms(self, name: str) -> float:
+        samples = self._timings.get(name)
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def max_ms(self, name: str) -> float:
+        samples = self._timings.get(name)
+        return max(samples) if samples else 0.0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "timings": {
+                name: {"last": self.last_ms(name), "avg": self.avg_ms(name), "max": self.max_ms(name)}
+                for name in self._timings
+            },
+            "counters": dict(self.counters),
+        }
+
+    def trace(self, event: str, **fields: Any) -> None:
+        if self.trace_logger is None:
+            return
+        payload = {"t": round(time.time(), 3), "event": event, **fields}
+        self.trace_logger.info(json.dumps(payload, ensure_ascii=False, default=str))
+
+
+def hit_rate(hits: int, misses: int) -> float:
+    total = hits + misses
+    return hits / total if total else 0.0
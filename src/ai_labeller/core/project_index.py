@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections import Counter
+
+from .dataset_scan import IMAGE_EXTENSIONS, scan_dir
+
+INDEX_FILE_NAME = ".ai_labeller_index.sqlite"
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS splits (
+    split TEXT PRIMARY KEY,
+    image_dir TEXT NOT NULL,
+    label_dir TEXT NOT NULL,
+    image_dir_mtime_ns INTEGER,
+    label_dir_mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS images (
+    split TEXT NOT NULL,
+    name TEXT NOT NULL,
+    stem TEXT NOT NULL,
+    image_mtime_ns INTEGER NOT NULL,
+    image_size INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    label_mtime_ns INTEGER,
+    label_size INTEGER NOT NULL DEFAULT 0,
+    box_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (split, name)
+);
+CREATE INDEX IF NOT EXISTS images_by_stem ON images (split, stem);
+CREATE TABLE IF NOT EXISTS label_classes (
+    split TEXT NOT NULL,
+    name TEXT NOT NULL,
+    class_id INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (split, name, class_id)
+);
+CREATE INDEX IF NOT EXISTS label_classes_by_class ON label_classes (split, class_id);
+CREATE TABLE IF NOT EXISTS image_hashes (
+    split TEXT NOT NULL,
+    name TEXT NOT NULL,
+    image_mtime_ns INTEGER NOT NULL,
+    image_size INTEGER NOT NULL,
+    hash INTEGER NOT NULL,
+    PRIMARY KEY (split, name)
+);
+"""
+
+
+def parse_label_classes(content: str) -> Counter[int]:
+    """Class histogram of a YOLO label file; malformed lines are ignored like the loader does."""
+    histogram: Counter[int] = Counter()
+    for line in content.splitlines():
+        parts = line.split()
+        if len(parts) < 5:
+            continue
+        try:
+            histogram[int(float(parts[0]))] += 1
+        except ValueError:
+            continue
+    return histogram
+
+
+def _to_sqlite_int(value: int) -> int:
+    # SQLite integers are signed 64-bit; store 64-bit hashes in two's complement.
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def _from_sqlite_int(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+def _dir_mtime_ns(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ProjectIndex:
+    """SQLite index of a project's images and labels, kept in sync incrementally.
+
+    A split is a pair of directories (images, labels). ``refresh`` skips a split whose
+    directory mtimes are unchanged; otherwise it rescans the directories with
+    ``os.scandir`` and only re-reads label files whose mtime or size changed. Image
+    dimensions are not read during scans; callers fill them in with
+    ``record_dimensions`` when an image is decoded anyway.
+    """
+
+    def __init__(self, project_root: str, db_path: str | None = None) -> None:
+        self.project_root = project_root
+        self.db_path = db_path or os.path.join(project_root, INDEX_FILE_NAME)
+        self._conn = sqlite3.connect(self.db_path)
+        # The index is a rebuildable cache; don't pay for fsyncs on network shares.
+        self._conn.execute("PRAGMA synchronous = OFF")
+        self._conn.executescript(_SCHEMA)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        if row is None or int(row[0]) != SCHEMA_VERSION:
+            with self._conn:
+                for table in ("splits", "images", "label_classes", "image_hashes"):
+                    self._conn.execute(f"DELETE FROM {table}")
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)", (str(SCHEMA_VERSION),)
+                )
+
+    @staticmethod
+    def exists(project_root: str) -> bool:
+        return os.path.isfile(os.path.join(project_root, INDEX_FILE_NAME))
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # ---- synchronisation -------------------------------------------------
+
+    def refresh(self, split: str, image_dir: str, label_dir: str, force: bool = False) -> bool:
+        """Bring ``split`` up to date with the disk; return True when anything was rescanned."""
+        image_dir_mtime = _dir_mtime_ns(image_dir)
+        label_dir_mtime = _dir_mtime_ns(label_dir)
+        row = self._conn.execute(
+            "SELECT image_dir, label_dir, image_dir_mtime_ns, label_dir_mtime_ns FROM splits WHERE split = ?",
+            (split,),
+        ).fetchone()
+        if (
+            not force
+            and row is not None
+            and row[0] == image_dir
+            and row[1] == label_dir
+            and image_dir_mtime is not None
+            and row[2] == image_dir_mtime
+            and row[3] == label_dir_mtime
+        ):
+            return False
+        same_dirs = row is not None and row[0] == image_dir and row[1] == label_dir
+        if row is not None and not same_dirs:
+            self._drop_split(split)
+
+        known = {
+            name: (image_mtime, image_size, label_mtime, label_size)
+            for name, image_mtime, image_size, label_mtime, label_size in self._conn.execute(
+                "SELECT name, image_mtime_ns, image_size, label_mtime_ns, label_size FROM images WHERE split = ?",
+                (split,),
+            )
+        }
+        if not force and same_dirs and image_dir_mtime is not None and row[2] == image_dir_mtime:
+            # Only labels changed: the image listing in the index is still current.
+            images = {name: values[:2] for name, values in known.items()}
+        else:
+            images = scan_dir(image_dir, IMAGE_EXTENSIONS)
+        labels = scan_dir(label_dir, (".txt",))
+        with self._conn:
+            removed = [(split, name) for name in known if name not in images]
+            self._conn.executemany("DELETE FROM images WHERE split = ? AND name = ?", removed)
+            self._conn.executemany("DELETE FROM label_classes WHERE split = ? AND name = ?", removed)
+            self._conn.executemany("DELETE FROM image_hashes WHERE split = ? AND name = ?", removed)
+            for name, (image_mtime, image_size) in images.items():
+                stem = os.path.splitext(name)[0]
+                label_mtime, label_size = labels.get(f"{stem}.txt", (None, 0))
+                previous = known.get(name)
+                if previous is None or previous[:2] != (image_mtime, image_size):
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO images (split, name, stem, image_mtime_ns, image_size) "
+                        "VALUES (?, ?, ?, ?, ?)",
+                        (split, name, stem, image_mtime, image_size),
+                    )
+                    previous = None
+                if previous is None or previous[2:] != (label_mtime, label_size):
+                    self._store_label(split, name, os.path.join(label_dir, f"{stem}.txt"), label_mtime, label_size)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO splits (split, image_dir, label_dir, image_dir_mtime_ns, label_dir_mtime_ns) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (split, image_dir, label_dir, image_dir_mtime, label_dir_mtime),
+            )
+        return True
+
+    def _store_label(
+        self, split: str, name: str, label_path: str, label_mtime: int | None, label_size: int
+    ) -> None:
+        histogram: Counter[int] = Counter()
+        if label_size > 0:
+            try:
+                with open(label_path, "r", encoding="utf-8") as handle:
+                    histogram = parse_label_classes(handle.read())
+            except (OSError, UnicodeDecodeError):
+                histogram = Counter()
+        self._write_label_row(split, name, label_mtime, label_size, histogram)
+
+    def _write_label_row(
+        self, split: str, name: str, label_mtime: int | None, label_size: int, histogram: Counter[int]
+    ) -> None:
+        self._conn.execute(
+            "UPDATE images SET label_mtime_ns = ?, label_size = ?, box_count = ? WHERE split = ? AND name = ?",
+            (label_mtime, label_size, sum(histogram.values()), split, name),
+        )
+        self._conn.execute("DELETE FROM label_classes WHERE split = ? AND name = ?", (split, name))
+        self._conn.executemany(
+            "INSERT INTO label_classes (split, name, class_id, count) VALUES (?, ?, ?, ?)",
+            [(split, name, class_id, count) for class_id, count in histogram.items()],
+        )
+
+    def record_label(self, split: str, image_name: str, content: str) -> None:
+        """Update one image's label summary after the app saved ``content`` for it.
+
+        The label mtime is left unknown so the next rescan re-reads the file once.
+        """
+        with self._conn:
+            self._write_label_row(
+                split, image_name, None, len(content.encode("utf-8")), parse_label_classes(content)
+            )
+
+    def apply_changes(
+        self,
+        split: str,
+        images: dict[str, tuple[int, int] | None],
+        labels: dict[str, tuple[int, int] | None],
+        dir_mtimes: tuple[tuple[int | None, int | None], tuple[int | None, int | None]] | None = None,
+        recorded_labels: frozenset[str] = frozenset(),
+    ) -> bool:
+        """Patch ``split`` with changes a watcher already scanned, instead of rescanning it.
+
+        ``images`` and ``labels`` map file names to their new ``(mtime_ns, size)``, or to
+        None when the file was removed. Labels named in ``recorded_labels`` were saved by
+        the app and passed to ``record_label`` already; only their mtime is stored. When
+        ``dir_mtimes`` is given as ``(before, after)`` folder mtimes and the index was
+        current at ``before``, it is marked current at ``after`` so ``refresh`` does not
+        rescan. Returns False when ``split`` is not indexed.
+        """
+        dirs = self._split_dirs(split)
+        if dirs is None:
+            return False
+        label_dir = dirs[1]
+        with self._conn:
+            for name, stat in images.items():
+                if stat is None:
+                    self._delete_image(split, name)
+                    continue
+                stem = os.path.splitext(name)[0]
+                is_new = self._conn.execute(
+                    "SELECT 1 FROM images WHERE split = ? AND name = ?", (split, name)
+                ).fetchone() is None
+                # A changed image keeps its label summary but loses its decoded size.
+                self._conn.execute(
+                    "INSERT INTO images (split, name, stem, image_mtime_ns, image_size) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (split, name) DO UPDATE SET image_mtime_ns = excluded.image_mtime_ns, "
+                    "image_size = excluded.image_size, width = NULL, height = NULL",
+                    (split, name, stem, *stat),
+                )
+                label_name = f"{stem}.txt"
+                if is_new and label_name not in labels:
+                    label_path = os.path.join(label_dir, label_name)
+                    try:
+                        label_stat = os.stat(label_path)
+                    except OSError:
+                        continue
+                    self._store_label(split, name, label_path, label_stat.st_mtime_ns, label_stat.st_size)
+            for label_name, stat in labels.items():
+                label_mtime, label_size = stat if stat is not None else (None, 0)
+                stem = os.path.splitext(label_name)[0]
+                names = [
+                    row[0]
+                    for row in self._conn.execute("SELECT name FROM images WHERE split = ? AND stem = ?", (split, stem))
+                ]
+                for name in names:
+                    if label_name in recorded_labels:
+                        self._conn.execute(
+                            "UPDATE images SET label_mtime_ns = ? WHERE split = ? AND name = ?",
+                            (label_mtime, split, name),
+                        )
+                    else:
+                        self._store_label(split, name, os.path.join(label_dir, label_name), label_mtime, label_size)
+            if dir_mtimes is not None:
+                (image_before, label_before), (image_after, label_after) = dir_mtimes
+                self._conn.execute(
+                    "UPDATE splits SET image_dir_mtime_ns = ?, label_dir_mtime_ns = ? "
+                    "WHERE split = ? AND image_dir_mtime_ns IS ? AND label_dir_mtime_ns IS ?",
+                    (image_after, label_after, split, image_before, label_before),
+                )
+        return True
+
+    def record_dimensions(self, split: str, image_name: str, width: int, height: int) -> None:
+        with self._conn:
+            self._conn.execute(
+                "UPDATE images SET width = ?, height = ? WHERE split = ? AND name = ?",
+                (width, height, split, image_name),
+            )
+
+    def remove_image(self, split: str, image_name: str) -> None:
+        with self._conn:
+            self._delete_image(split, image_name)
+
+    def _delete_image(self, split: str, image_name: str) -> None:
+        for table in ("images", "label_classes", "image_hashes"):
+            self._conn.execute(f"DELETE FROM {table} WHERE split = ? AND name = ?", (split, image_name))
+
+    def record_hashes(self, split: str, hashes: dict[str, int]) -> None:
+        """Store perceptual hashes by image name, stamped with the image's indexed mtime and size."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO image_hashes (split, name, image_mtime_ns, image_size, hash) "
+                "SELECT split, name, image_mtime_ns, image_size, ? FROM images WHERE split = ? AND name = ?",
+                [(_to_sqlite_int(value), split, name) for name, value in hashes.items()],
+            )
+
+    def _drop_split(self, split: str) -> None:
+        with self._conn:
+            for table in ("splits", "images", "label_classes", "image_hashes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE split = ?", (split,))
+
+    # ---- queries ---------------------------------------------------------
+
+    def _split_dirs(self, split: str) -> tuple[str, str] | None:
+        row = self._conn.execute("SELECT image_dir, label_dir FROM splits WHERE split = ?", (split,)).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def image_paths(self, split: str, labeled_only: bool = False) -> list[str]:
+        dirs = self._split_dirs(split)
+        if dirs is None:
+            return []
+        query = "SELECT name FROM images WHERE split = ?"
+        if labeled_only:
+            query += " AND label_size > 0"
+        return [
+            f"{dirs[0]}/{name}"
+            for (name,) in self._conn.execute(query + " ORDER BY name", (split,))
+        ]
+
+    def entries(self, split: str) -> list[tuple[str, str]]:
+        """``(image_path, label_path)`` for every image in ``split``, sorted by name."""
+        dirs = self._split_dirs(split)
+        if dirs is None:
+            return []
+        return [
+            (f"{dirs[0]}/{name}", f"{dirs[1]}/{stem}.txt")
+            for name, stem in self._conn.execute(
+                "SELECT name, stem FROM images WHERE split = ? ORDER BY name", (split,)
+            )
+        ]
+
+    def image_name_for_stem(self, split: str, stem: str) -> str | None:
+        row = self._conn.execute(
+            "SELECT name FROM images WHERE split = ? AND stem = ? ORDER BY name LIMIT 1", (split, stem)
+        ).fetchone()
+        return row[0] if row else None
+
+    def count_images(self, split: str) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM images WHERE split = ?", (split,)).fetchone()[0]
+
+    def has_label(self, split: str, image_name: str) -> bool | None:
+        row = self._conn.execute(
+            "SELECT label_size FROM images WHERE split = ? AND name = ?", (split, image_name)
+        ).fetchone()
+        return None if row is None else row[0] > 0
+
+    def image_info(self, split: str, image_name: str) -> dict[str, int | None] | None:
+        row = self._conn.execute(
+            "SELECT width, height, label_size, box_count FROM images WHERE split = ? AND name = ?",
+            (split, image_name),
+        ).fetchone()
+        if row is None:
+            return None
+        return {"width": row[0], "height": row[1], "label_size": row[2], "box_count": row[3]}
+
+    def label_rows(self, split: str) -> list[tuple[str, int, int]]:
+        """``(name, label_size, box_count)`` for every image in ``split``."""
+        return self._conn.execute(
+            "SELECT name, label_size, box_count FROM images WHERE split = ?", (split,)
+        ).fetchall()
+
+    def class_members(self, split: str) -> list[tuple[str, int]]:
+        """``(name, class_id)`` for every image that has at least one box of that class."""
+        return self._conn.execute(
+            "SELECT name, class_id FROM label_classes WHERE split = ?", (split,)
+        ).fetchall()
+
+    def image_hashes(self, split: str) -> dict[str, int]:
+        """Perceptual hashes by image name, leaving out images changed since they were hashed."""
+        rows = self._conn.execute(
+            "SELECT h.name, h.hash FROM image_hashes h JOIN images i ON i.split = h.split AND i.name = h.name "
+            "WHERE h.split = ? AND i.image_mtime_ns = h.image_mtime_ns AND i.image_size = h.image_size",
+            (split,),
+        )
+        return {name: _from_sqlite_int(value) for name, value in rows}
+
+    def class_histogram(self, split: str | None = None) -> dict[int, int]:
+        """Total boxes per class id, for one split or the whole project."""
+        if split is None:
+            rows = self._conn.execute("SELECT class_id, SUM(count) FROM label_classes GROUP BY class_id")
+        else:
+            rows = self._conn.execute(
+                "SELECT class_id, SUM(count) FROM label_classes WHERE split = ? GROUP BY class_id", (split,)
+            )
+        return {int(class_id): int(total) for class_id, total in rows}
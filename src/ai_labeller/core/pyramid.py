@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import threading
+
+from PIL import Image
+
+
+class ImagePyramid:
+    """Lazily built mip levels of one image, each half the size of the previous one.
+
+    ``full_size`` is the size of the original image when ``image`` is a reduced-resolution
+    proxy of it; scales and level factors are always relative to that full size.
+    """
+
+    def __init__(
+        self,
+        image: Image.Image,
+        min_side: int = 256,
+        full_size: tuple[int, int] | None = None,
+    ) -> None:
+        self.min_side = max(1, min_side)
+        self._levels: list[Image.Image] = [image]
+        self._lock = threading.Lock()
+        self.full_width = full_size[0] if full_size else image.width
+        self.base_factor = image.width / max(self.full_width, 1)
+
+    def covers_scale(self, scale: float) -> bool:
+        """True when the base image has enough resolution to be drawn at ``scale``."""
+        return self.base_factor >= 1.0 or scale <= self.base_factor * 1.0001
+
+    @property
+    def base(self) -> Image.Image:
+        return self._levels[0]
+
+    @property
+    def level_count(self) -> int:
+        return len(self._levels)
+
+    def level_for_scale(self, scale: float) -> tuple[Image.Image, float]:
+        """Return ``(level_image, level_factor)`` for the smallest level that still has
+        at least ``scale`` resolution, where ``level_factor`` is level size / full size."""
+        depth = 0
+        factor = self.base_factor
+        while factor / 2.0 >= scale:
+            factor /= 2.0
+            depth += 1
+        with self._lock:
+            while len(self._levels) <= depth:
+                prev = self._levels[-1]
+                if min(prev.width, prev.height) // 2 < self.min_side:
+                    break
+                self._levels.append(prev.reduce(2))
+            depth = min(depth, len(self._levels) - 1)
+            level = self._levels[depth]
+        return level, level.width / max(self.full_width, 1)
+
+    def close(self) -> None:
+        with self._lock:
+            for level in self._levels[1:]:
+                level.close()
+            del self._levels[1:]
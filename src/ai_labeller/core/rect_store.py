@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import numpy as np
+
+from .types import Rect
+
+# Column layout mirrors Rect: x1, y1, x2, y2, class_id, angle_deg.
+X1, Y1, X2, Y2, CLS, ANGLE = range(6)
+
+
+def normalize_angles(angles: np.ndarray) -> np.ndarray:
+    return ((angles + 180.0) % 360.0) - 180.0
+
+
+def points_to_canvas(points: np.ndarray, scale: float, offset_x: float, offset_y: float) -> np.ndarray:
+    """Map image-space points (..., 2) to canvas space."""
+    return points * scale + np.array([offset_x, offset_y])
+
+
+def points_to_img(points: np.ndarray, scale: float, offset_x: float, offset_y: float) -> np.ndarray:
+    return (points - np.array([offset_x, offset_y])) / scale
+
+
+def rotate_points(points: np.ndarray, centers: np.ndarray, angles_deg: np.ndarray) -> np.ndarray:
+    """Rotate per-box points (N, K, 2) around centers (N, 2) by angles (N,)."""
+    theta = np.radians(angles_deg)[:, None]
+    cos_t = np.cos(theta)
+    sin_t = np.sin(theta)
+    dx = points[..., 0] - centers[:, None, 0]
+    dy = points[..., 1] - centers[:, None, 1]
+    return np.stack(
+        (centers[:, None, 0] + dx * cos_t - dy * sin_t, centers[:, None, 1] + dx * sin_t + dy * cos_t),
+        axis=-1,
+    )
+
+
+class RectStore:
+    """Array-backed annotation boxes: an N x 6 float array plus an integer class column.
+
+    A store can also mirror a live rect list across frames: like ``SpatialIndex``,
+    ``source`` remembers the list the rows came from and ``dirty`` forces a rebuild.
+    ``sync`` converts only rows appended since the last call; in-place edits of
+    existing rows must be reported with ``update_rows`` or by setting ``dirty``.
+    """
+
+    def __init__(self, data: np.ndarray | None = None) -> None:
+        if data is None:
+            data = np.zeros((0, 6), dtype=np.float64)
+        self._set_data(data)
+        self.source: list[Rect] | None = None
+        self.dirty = True
+
+    def _set_data(self, data: np.ndarray) -> None:
+        self.data = np.asarray(data, dtype=np.float64).reshape(-1, 6)
+        self.class_ids = self.data[:, CLS].astype(np.int64)
+
+    def sync(self, rects: list[Rect]) -> "RectStore":
+        """Bring the rows in line with ``rects`` and return the store."""
+        if self.dirty or self.source is not rects or len(self) > len(rects):
+            self._set_data(RectStore.from_rects(rects).data)
+        elif len(self) < len(rects):
+            tail = RectStore.from_rects(rects[len(self):]).data
+            self._set_data(np.concatenate((self.data, tail)))
+        self.source = rects
+        self.dirty = False
+        return self
+
+    def update_rows(self, rects: list[Rect], indices: list[int]) -> None:
+        """Re-read rows ``indices`` of ``rects`` after they were edited in place."""
+        if self.dirty or self.source is not rects:
+            return
+        valid = [idx for idx in indices if 0 <= idx < len(self) and idx < len(rects)]
+        if not valid:
+            return
+        rows = RectStore.from_rects([rects[idx] for idx in valid])
+        self.data[valid] = rows.data
+        self.class_ids[valid] = rows.class_ids
+
+    @classmethod
+    def from_rects(cls, rects: list[Rect]) -> "RectStore":
+        if rects and all(len(rect) == 6 for rect in rects):
+            return cls(np.array(rects, dtype=np.float64))
+        data = np.zeros((len(rects), 6), dtype=np.float64)
+        for i, rect in enumerate(rects):
+            n = min(len(rect), 6)
+            data[i, :n] = rect[:n]
+        return cls(data)
+
+    def __len__(self) -> int:
+        return self.data.shape[0]
+
+    def to_rects(self) -> list[Rect]:
+        rects = self.data.tolist()
+        for rect, class_id in zip(rects, self.class_ids.tolist()):
+            rect[CLS] = class_id
+        return rects
+
+    @property
+    def angles(self) -> np.ndarray:
+        return normalize_angles(self.data[:, ANGLE])
+
+    def bounds(self) -> np.ndarray:
+        """Unrotated, ordered (x1, y1, x2, y2) per box."""
+        xs = np.sort(self.data[:, [X1, X2]], axis=1)
+        ys = np.sort(self.data[:, [Y1, Y2]], axis=1)
+        return np.stack((xs[:, 0], ys[:, 0], xs[:, 1], ys[:, 1]), axis=1)
+
+    def centers(self) -> np.ndarray:
+        b = self.bounds()
+        return np.stack(((b[:, 0] + b[:, 2]) / 2, (b[:, 1] + b[:, 3]) / 2), axis=1)
+
+    def rotated_corners(self) -> np.ndarray:
+        """Corners (N, 4, 2) in the same order as ``GeckoAI.get_rotated_corners``."""
+        b = self.bounds()
+        corners = np.stack(
+            (
+                np.stack((b[:, 0], b[:, 1]), axis=1),
+                np.stack((b[:, 2], b[:, 1]), axis=1),
+                np.stack((b[:, 2], b[:, 3]), axis=1),
+                np.stack((b[:, 0], b[:, 3]), axis=1),
+            ),
+            axis=1,
+        )
+        return rotate_points(corners, self.centers(), self.angles)
+
+    def heading_points(self) -> np.ndarray:
+        """Rotated top-center point (N, 2) used to draw the heading line."""
+        b = self.bounds()
+        top = np.stack(((b[:, 0] + b[:, 2]) / 2, b[:, 1]), axis=1)[:, None, :]
+        return rotate_points(top, self.centers(), self.angles)[:, 0, :]
+
+    def aabbs(self) -> np.ndarray:
+        """Axis-aligned extents (N, 4) of the rotated boxes."""
+        corners = self.rotated_corners()
+        return np.concatenate((corners.min(axis=1), corners.max(axis=1)), axis=1)
+
+    def clamped(self, width: float, height: float) -> "RectStore":
+        """Vectorized ``GeckoAI.clamp_box``: order corners, clip to the image, normalize angles."""
+        b = self.bounds()
+        b[:, [0, 2]] = np.clip(b[:, [0, 2]], 0, width)
+        b[:, [1, 3]] = np.clip(b[:, [1, 3]], 0, height)
+        data = np.column_stack((b, self.class_ids, self.angles))
+        return RectStore(data)
+
+    def to_yolo_text(self, width: float, height: float) -> str:
+        """Serialize as YOLO ``class cx cy w h`` lines normalized by image size."""
+        if not len(self):
+            return ""
+        d = self.data
+        cx = (d[:, X1] + d[:, X2]) / 2 / width
+        cy = (d[:, Y1] + d[:, Y2]) / 2 / height
+        w = (d[:, X2] - d[:, X1]) / width
+        h = (d[:, Y2] - d[:, Y1]) / height
+        rows = zip(self.class_ids.tolist(), cx.tolist(), cy.tolist(), w.tolist(), h.tolist())
+        return "".join(f"{c} {x:.6f} {y:.6f} {bw:.6f} {bh:.6f}\n" for c, x, y, bw, bh in rows)
+
+    @classmethod
+    def from_yolo_text(cls, text: str, width: float, height: float) -> tuple["RectStore", bool]:
+        """Parse YOLO label text (5/6-field boxes and 9-field OBB lines).
+
+        Returns the store and whether any line carried an inline angle. Raises
+        ``ValueError`` on malformed numbers, like the per-line parser it replaces.
+        """
+        rows = [line.split() for line in text.splitlines()]
+        rows = [parts for parts in rows if len(parts) >= 5]
+        data = np.zeros((len(rows), 6), dtype=np.float64)
+        if not rows:
+            return cls(data), False
+        obb_idx = [i for i, parts in enumerate(rows) if len(parts) == 9]
+        box_idx = [i for i, parts in enumerate(rows) if len(parts) != 9]
+        has_inline_angle = False
+
+        if box_idx:
+            fields = np.array([rows[i][:5] for i in box_idx], dtype=np.float64)
+            angles = np.array(
+                [float(rows[i][5]) if len(rows[i]) >= 6 else 0.0 for i in box_idx], dtype=np.float64
+            )
+            has_inline_angle = any(len(rows[i]) >= 6 for i in box_idx)
+            c, cx, cy, w, h = fields.T
+            data[box_idx] = np.column_stack(
+                (
+                    (cx - w / 2) * width,
+                    (cy - h / 2) * height,
+                    (cx + w / 2) * width,
+                    (cy + h / 2) * height,
+                    np.trunc(c),
+                    normalize_angles(angles),
+                )
+            )
+
+        if obb_idx:
+            fields = np.array([rows[i] for i in obb_idx], dtype=np.float64)
+            pts = fields[:, 1:9].reshape(-1, 4, 2) * np.array([width, height])
+            centers = pts.mean(axis=1)
+            delta = pts[:, 1] - pts[:, 0]
+            angles = np.degrees(np.arctan2(delta[:, 1], delta[:, 0]))
+            local = rotate_points(pts, centers, -angles)
+            obb = np.column_stack(
+                (local.min(axis=1), local.max(axis=1), np.trunc(fields[:, 0]), angles)
+            )
+            data[obb_idx] = RectStore(obb).clamped(width, height).data
+
+        return cls(data), has_inline_angle
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import Any, Callable
+
+
+class RenderScheduler:
+    """Coalesce render requests into at most one redraw per display frame.
+
+    ``tk_root`` only needs Tk's ``after``, ``after_idle`` and ``after_cancel``.
+    """
+
+    def __init__(
+        self,
+        tk_root: Any,
+        render: Callable[[], None],
+        frame_interval_ms: int = 16,
+        clock: Callable[[], float] = time.perf_counter,
+        history_size: int = 120,
+    ) -> None:
+        self.tk_root = tk_root
+        self._render = render
+        self.frame_interval_ms = frame_interval_ms
+        self._clock = clock
+        self._after_id: Any = None
+        self._last_frame_end: float | None = None
+        self.requested = 0
+        self.coalesced = 0
+        self.rendered = 0
+        self.frame_times_ms: deque[float] = deque(maxlen=history_size)
+
+    @property
+    def pending(self) -> bool:
+        return self._after_id is not None
+
+    def request(self) -> None:
+        """Mark the view dirty; the redraw happens on the next frame slot."""
+        self.requested += 1
+        if self._after_id is not None:
+            self.coalesced += 1
+            return
+        wait_ms = 0
+        if self._last_frame_end is not None:
+            elapsed_ms = (self._clock() - self._last_frame_end) * 1000.0
+            wait_ms = int(max(0.0, self.frame_interval_ms - elapsed_ms))
+        if wait_ms > 0:
+            self._after_id = self.tk_root.after(wait_ms, self._run)
+        else:
+            self._after_id = self.tk_root.after_idle(self._run)
+
+    def flush(self) -> None:
+        """Render immediately if a frame is pending."""
+        if self._after_id is None:
+            return
+        self.cancel()
+        self._run()
+
+    def cancel(self) -> None:
+        if self._after_id is None:
+            return
+        try:
+            self.tk_root.after_cancel(self._after_id)
+        except Exception:
+            pass
+        self._after_id = None
+
+    def _run(self) -> None:
+        self._after_id = None
+        started = self._clock()
+        try:
+            self._render()
+        finally:
+            self._last_frame_end = self._clock()
+            self.rendered += 1
+            self.frame_times_ms.append((self._last_frame_end - started) * 1000.0)
+
+    def stats(self) -> dict[str, float]:
+        times = list(self.frame_times_ms)
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "rendered": self.rendered,
+            "last_ms": times[-1] if times else 0.0,
+            "avg_ms": sum(times) / len(times) if times else 0.0,
+            "max_ms": max(times) if times else 0.0,
+        }
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+from typing import Any, Hashable
+
+DEFAULT_LAYERS = ("image", "ghost", "box", "label_bg", "label", "handle", "overlay", "hud")
+
+
+class CanvasScene:
+    """Retained canvas items keyed by caller-chosen keys.
+
+    Each frame the caller ``put``s every item it wants to show. Items whose coords and
+    options are unchanged cost no canvas call, changed items get ``coords``/``itemconfig``,
+    and items that were not put during the frame are deleted in ``end_frame``.
+    """
+
+    def __init__(self, canvas: Any, layers: tuple[str, ...] = DEFAULT_LAYERS) -> None:
+        self.canvas = canvas
+        self.layers = layers
+        self._items: dict[Hashable, int] = {}
+        self._kinds: dict[Hashable, str] = {}
+        self._layers: dict[Hashable, str] = {}
+        self._coords: dict[Hashable, tuple[float, ...] | None] = {}
+        self._options: dict[Hashable, dict[str, Any]] = {}
+        self._seen: set[Hashable] = set()
+        self._created = False
+        self.created_count = 0
+        self.updated_count = 0
+        self.skipped_count = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def begin_frame(self) -> None:
+        self._seen = set()
+        self._created = False
+
+    def put(
+        self,
+        key: Hashable,
+        kind: str,
+        coords: tuple[float, ...] | list[float],
+        layer: str,
+        **options: Any,
+    ) -> tuple[int, bool]:
+        """Create or update an item; return ``(item_id, changed)``."""
+        coords = tuple(coords)
+        self._seen.add(key)
+        item_id = self._items.get(key)
+        if item_id is not None and self._kinds[key] != kind:
+            self.canvas.delete(item_id)
+            self._drop(key)
+            item_id = None
+        if item_id is None:
+            creator = getattr(self.canvas, f"create_{kind}")
+            item_id = creator(*coords, tags=(layer,), **options)
+            self._items[key] = item_id
+            self._kinds[key] = kind
+            self._layers[key] = layer
+            self._coords[key] = coords
+            self._options[key] = dict(options)
+            self._created = True
+            self.created_count += 1
+            return item_id, True
+
+        changed = False
+        if self._coords[key] != coords:
+            self.canvas.coords(item_id, *coords)
+            self._coords[key] = coords
+            changed = True
+        previous = self._options[key]
+        delta = {name: value for name, value in options.items() if previous.get(name) != value}
+        if delta:
+            self.canvas.itemconfig(item_id, **delta)
+            previous.update(delta)
+            changed = True
+        if changed:
+            self.updated_count += 1
+        else:
+            self.skipped_count += 1
+        return item_id, changed
+
+    def coords_of(self, key: Hashable) -> tuple[float, ...] | None:
+        return self._coords.get(key)
+
+    def move_layers(self, layers: tuple[str, ...], dx: float, dy: float) -> None:
+        """Translate whole layers on the canvas without rebuilding their items."""
+        for layer in layers:
+            self.canvas.move(layer, dx, dy)
+        self._forget_coords(layers)
+
+    def scale_layers(self, layers: tuple[str, ...], x: float, y: float, factor: float) -> None:
+        """Scale whole layers around ``(x, y)`` on the canvas without rebuilding their items."""
+        for layer in layers:
+            self.canvas.scale(layer, x, y, factor, factor)
+        self._forget_coords(layers)
+
+    def _forget_coords(self, layers: tuple[str, ...]) -> None:
+        # Canvas-side transforms make cached coords stale; the next put must resend them.
+        for key, layer in self._layers.items():
+            if layer in layers:
+                self._coords[key] = None
+
+    def end_frame(self) -> None:
+        stale = [key for key in self._items if key not in self._seen]
+        for key in stale:
+            self.canvas.delete(self._items[key])
+            self._drop(key)
+        if self._created:
+            # New items are created on top; restore layer stacking once per frame.
+            for layer in self.layers:
+                self.canvas.tag_raise(layer)
+
+    def clear(self) -> None:
+        for item_id in self._items.values():
+            self.canvas.delete(item_id)
+        self._items.clear()
+        self._kinds.clear()
+        self._layers.clear()
+        self._coords.clear()
+        self._options.clear()
+        self._seen = set()
+
+    def _drop(self, key: Hashable) -> None:
+        self._items.pop(key, None)
+        self._kinds.pop(key, None)
+        self._layers.pop(key, None)
+        self._coords.pop(key, None)
+        self._options.pop(key, None)
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+
+import numpy as np
+
+
+class SpatialIndex:
+    """Uniform-grid index over axis-aligned boxes keyed by integer ids.
+
+    ``source`` remembers which list the index was built from and ``dirty`` forces a
+    rebuild, so callers can detect replaced or wholesale-edited lists.
+    """
+
+    def __init__(self, cell_size: float = 128.0) -> None:
+        self.cell_size = float(cell_size)
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._boxes: dict[int, tuple[float, float, float, float]] = {}
+        self.source: Any = None
+        self.dirty = True
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def _cell_range(self, box: tuple[float, float, float, float]) -> tuple[int, int, int, int]:
+        size = self.cell_size
+        return (
+            math.floor(box[0] / size),
+            math.floor(box[1] / size),
+            math.floor(box[2] / size),
+            math.floor(box[3] / size),
+        )
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._boxes.clear()
+
+    def rebuild(self, aabbs: np.ndarray, source: Any = None) -> None:
+        """Replace all entries with ``aabbs`` (N, 4), keyed 0..N-1."""
+        self.clear()
+        if len(aabbs):
+            extents = np.maximum(aabbs[:, 2] - aabbs[:, 0], aabbs[:, 3] - aabbs[:, 1])
+            # Cells about twice the typical box size keep most boxes in 1-4 cells.
+            self.cell_size = max(16.0, float(np.median(extents)) * 2.0)
+        for key, box in enumerate(aabbs.tolist()):
+            self.insert(key, box)
+        self.source = source
+        self.dirty = False
+
+    def insert(self, key: int, box: tuple[float, float, float, float] | list[float]) -> None:
+        box = (float(box[0]), float(box[1]), float(box[2]), float(box[3]))
+        if key in self._boxes:
+            self.remove(key)
+        self._boxes[key] = box
+        cx1, cy1, cx2, cy2 = self._cell_range(box)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                self._cells.setdefault((cx, cy), set()).add(key)
+
+    def update(self, key: int, box: tuple[float, float, float, float] | list[float]) -> None:
+        self.insert(key, box)
+
+    def remove(self, key: int) -> None:
+        box = self._boxes.pop(key, None)
+        if box is None:
+            return
+        cx1, cy1, cx2, cy2 = self._cell_range(box)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket is not None:
+                    bucket.discard(key)
+                    if not bucket:
+                        del self._cells[(cx, cy)]
+
+    def query_point(self, x: float, y: float) -> list[int]:
+        """Keys whose box contains the point, in ascending order."""
+        size = self.cell_size
+        bucket = self._cells.get((math.floor(x / size), math.floor(y / size)), ())
+        hits = []
+        for key in bucket:
+            x1, y1, x2, y2 = self._boxes[key]
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                hits.append(key)
+        hits.sort()
+        return hits
+
+    def query_rect(self, x1: float, y1: float, x2: float, y2: float) -> list[int]:
+        """Keys whose box intersects the rectangle, in ascending order."""
+        sx1, sx2 = sorted((x1, x2))
+        sy1, sy2 = sorted((y1, y2))
+        cx1, cy1, cx2, cy2 = self._cell_range((sx1, sy1, sx2, sy2))
+        candidates: set[int] = set()
+        if (cx2 - cx1 + 1) * (cy2 - cy1 + 1) > len(self._cells):
+            candidates = set(self._boxes)
+        else:
+            for cx in range(cx1, cx2 + 1):
+                for cy in range(cy1, cy2 + 1):
+                    candidates.update(self._cells.get((cx, cy), ()))
+        hits = []
+        for key in candidates:
+            bx1, by1, bx2, by2 = self._boxes[key]
+            if not (bx2 < sx1 or bx1 > sx2 or by2 < sy1 or by1 > sy2):
+                hits.append(key)
+        hits.sort()
+        return hits
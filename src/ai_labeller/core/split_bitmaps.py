@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import os
+from collections import Counter
+
+import numpy as np
+
+from .project_index import ProjectIndex, parse_label_classes
+
+
+class SplitBitmaps:
+    """Per-image flags of one split, aligned with the app's image list.
+
+    ``labeled`` marks images with a non-empty label file, ``empty`` images whose labels
+    hold no boxes, and ``classes[c]`` images with at least one box of class ``c``.
+    ``next_index`` finds the next set bit with one vectorized scan, so jumping never
+    decodes or parses the images that are skipped.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.labeled = np.zeros(size, dtype=bool)
+        self.empty = np.ones(size, dtype=bool)
+        self.classes: dict[int, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.labeled)
+
+    @classmethod
+    def from_index(cls, index: ProjectIndex, split: str, image_paths: list[str]) -> "SplitBitmaps":
+        bitmaps = cls(len(image_paths))
+        position = {os.path.basename(path): i for i, path in enumerate(image_paths)}
+        for name, label_size, box_count in index.label_rows(split):
+            i = position.get(name)
+            if i is not None:
+                bitmaps.labeled[i] = label_size > 0
+                bitmaps.empty[i] = box_count == 0
+        for name, class_id in index.class_members(split):
+            i = position.get(name)
+            if i is not None:
+                bitmaps._class_bits(class_id)[i] = True
+        return bitmaps
+
+    @classmethod
+    def from_label_files(cls, image_paths: list[str], label_dir: str) -> "SplitBitmaps":
+        """Fallback when no project index is available: read every label file once."""
+        bitmaps = cls(len(image_paths))
+        for i, path in enumerate(image_paths):
+            stem = os.path.splitext(os.path.basename(path))[0]
+            try:
+                with open(os.path.join(label_dir, f"{stem}.txt"), "r", encoding="utf-8") as handle:
+                    content = handle.read()
+            except (OSError, UnicodeDecodeError):
+                continue
+            bitmaps.set(i, content, parse_label_classes(content))
+        return bitmaps
+
+    def _class_bits(self, class_id: int) -> np.ndarray:
+        bits = self.classes.get(class_id)
+        if bits is None:
+            bits = np.zeros(len(self.labeled), dtype=bool)
+            self.classes[class_id] = bits
+        return bits
+
+    def set(self, i: int, content: str, histogram: Counter[int] | None = None) -> None:
+        """Record the label ``content`` just saved for image ``i``."""
+        histogram = parse_label_classes(content) if histogram is None else histogram
+        self.labeled[i] = bool(content)
+        self.empty[i] = not histogram
+        for class_id, bits in self.classes.items():
+            bits[i] = class_id in histogram
+        for class_id in histogram:
+            self._class_bits(class_id)[i] = True
+
+    def insert(self, i: int) -> None:
+        """Make room for a new, unlabeled image at position ``i``."""
+        self.labeled = np.insert(self.labeled, i, False)
+        self.empty = np.insert(self.empty, i, True)
+        for class_id, bits in self.classes.items():
+            self.classes[class_id] = np.insert(bits, i, False)
+
+    def remove(self, i: int) -> None:
+        self.labeled = np.delete(self.labeled, i)
+        self.empty = np.delete(self.empty, i)
+        for class_id, bits in self.classes.items():
+            self.classes[class_id] = np.delete(bits, i)
+
+    def mask(self, kind: str, class_id: int | None = None) -> np.ndarray:
+        if kind == "unlabeled":
+            return ~self.labeled
+        if kind == "empty":
+            return self.empty
+        if kind == "class":
+            bits = self.classes.get(int(class_id)) if class_id is not None else None
+            return bits if bits is not None else np.zeros(len(self.labeled), dtype=bool)
+        raise ValueError(f"Unknown navigation kind: {kind}")
+
+    @staticmethod
+    def next_index(mask: np.ndarray, start: int, wrap: bool = True) -> int | None:
+        """First set position after ``start``, wrapping to the beginning if allowed."""
+        # argmax on a bool array stops at the first True.
+        tail = mask[start + 1:]
+        if tail.size:
+            k = int(tail.argmax())
+            if tail[k]:
+                return start + 1 + k
+        if wrap:
+            head = mask[: max(0, start)]
+            if head.size:
+                k = int(head.argmax())
+                if head[k]:
+                    return k
+        return None
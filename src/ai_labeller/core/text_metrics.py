@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Hashable
+
+
+class TextMetricsCache:
+    """Cache text extents per (font, text) so label layout needs no canvas round-trip.
+
+    ``font_factory`` turns a font spec into an object with Tk font's ``measure(text)``
+    and ``metrics("linespace")``, e.g. ``lambda spec: tkinter.font.Font(font=spec)``.
+    """
+
+    def __init__(self, font_factory: Callable[[Any], Any], max_entries: int = 4096) -> None:
+        self._font_factory = font_factory
+        self._fonts: dict[Hashable, Any] = {}
+        self._linespace: dict[Hashable, int] = {}
+        self._widths: dict[tuple[Hashable, str], int] = {}
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def _font(self, font: Hashable) -> Any:
+        handle = self._fonts.get(font)
+        if handle is None:
+            handle = self._font_factory(font)
+            self._fonts[font] = handle
+            self._linespace[font] = int(handle.metrics("linespace"))
+        return handle
+
+    def measure(self, text: str, font: Hashable) -> tuple[int, int]:
+        """Return ``(width, line_height)`` in pixels."""
+        key = (font, text)
+        width = self._widths.get(key)
+        if width is None:
+            self.misses += 1
+            width = int(self._font(font).measure(text))
+            if len(self._widths) >= self.max_entries:
+                self._widths.clear()
+            self._widths[key] = width
+        else:
+            self.hits += 1
+        return width, self._linespace[font]
+
+    def pill_box(
+        self, x: float, y: float, text: str, font: Hashable, padding: int = 4
+    ) -> tuple[float, float, float, float]:
+        """Background rectangle for text anchored ``nw`` at ``(x, y)``."""
+        width, height = self.measure(text, font)
+        return x - padding, y - padding, x + width + padding, y + height + padding
+
+    def clear(self) -> None:
+        self._fonts.clear()
+        self._linespace.clear()
+        self._widths.clear()
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from PIL import Image
+
+THUMB_DIR_NAME = ".ai_labeller_thumbs"
+
+
+def build_thumbnail(path: str, size: int) -> Image.Image:
+    """Decode ``path`` into an RGB thumbnail that fits in ``size`` x ``size``."""
+    with Image.open(path) as image:
+        # JPEG draft decodes straight at 1/2..1/8 scale, which is most of the saving.
+        image.draft("RGB", (size, size))
+        image.thumbnail((size, size), Image.Resampling.BILINEAR)
+        return image.convert("RGB")
+
+
+class ThumbnailCache:
+    """Persistent per-project thumbnails built by a worker pool.
+
+    Thumbnails live in ``cache_dir`` as JPEGs named after a hash of the source path, with
+    their mtime set to the source's mtime; a thumbnail whose mtime differs is stale. Built
+    thumbnails are also kept in a small in-memory LRU. Worker threads never touch Tk:
+    paths whose thumbnails became available are reported through ``drain_ready``, and
+    paths that could not be read through ``failed``; those are not requested again
+    until ``invalidate``.
+    """
+
+    def __init__(self, cache_dir: str, size: int = 64, max_workers: int = 2, max_memory_items: int = 512) -> None:
+        self.cache_dir = cache_dir
+        self.size = size
+        self.max_memory_items = max_memory_items
+        self._memory: OrderedDict[str, Image.Image] = OrderedDict()
+        self._lock = threading.Lock()
+        self._queued: set[str] = set()
+        self._failed: set[str] = set()
+        self._generation = 0
+        self._ready: queue.SimpleQueue[str] = queue.SimpleQueue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumbs")
+
+    def thumb_path(self, image_path: str) -> str:
+        digest = hashlib.sha1(os.path.abspath(image_path).encode("utf-8")).hexdigest()[:24]
+        return os.path.join(self.cache_dir, f"{digest}.jpg")
+
+    def get(self, image_path: str) -> Image.Image | None:
+        """Return the thumbnail if it is in memory; never touches the disk."""
+        with self._lock:
+            image = self._memory.get(image_path)
+            if image is not None:
+                self._memory.move_to_end(image_path)
+            return image
+
+    def request(self, image_paths: list[str]) -> None:
+        """Queue thumbnails that are not in memory yet, in the given order."""
+        with self._lock:
+            generation = self._generation
+            for path in image_paths:
+                if path in self._memory or path in self._queued or path in self._failed:
+                    continue
+                self._queued.add(path)
+                self._executor.submit(self._load, path, generation)
+
+    def cancel(self) -> None:
+        """Forget queued requests, e.g. after the view scrolled far away."""
+        with self._lock:
+            self._generation += 1
+            self._queued.clear()
+
+    def invalidate(self, image_path: str) -> None:
+        with self._lock:
+            self._memory.pop(image_path, None)
+            self._failed.discard(image_path)
+
+    def failed(self, image_path: str) -> bool:
+        """Whether the thumbnail for ``image_path`` could not be built."""
+        with self._lock:
+            return image_path in self._failed
+
+    def drain_ready(self) -> list[str]:
+        ready: list[str] = []
+        while True:
+            try:
+                ready.append(self._ready.get_nowait())
+            except queue.Empty:
+                return ready
+
+    def shutdown(self) -> None:
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _load(self, image_path: str, generation: int) -> None:
+        try:
+            if generation != self._generation:
+                return
+            image = self._load_or_build(image_path)
+        except Exception:
+            # Unreadable images simply keep the placeholder.
+            with self._lock:
+                self._failed.add(image_path)
+            return
+        finally:
+            with self._lock:
+                if generation == self._generation:
+                    self._queued.discard(image_path)
+        with self._lock:
+            self._memory[image_path] = image
+            self._memory.move_to_end(image_path)
+            while len(self._memory) > self.max_memory_items:
+                self._memory.popitem(last=False)
+        self._ready.put(image_path)
+
+    def _load_or_build(self, image_path: str) -> Image.Image:
+        source_mtime_ns = os.stat(image_path).st_mtime_ns
+        thumb_path = self.thumb_path(image_path)
+        try:
+            if os.stat(thumb_path).st_mtime_ns == source_mtime_ns:
+                with Image.open(thumb_path) as cached:
+                    cached.load()
+                    return cached.copy()
+        except OSError:
+            pass
+        image = build_thumbnail(image_path, self.size)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_path = f"{thumb_path}.{threading.get_ident()}.tmp"
+        try:
+            image.save(temp_path, "JPEG", quality=85)
+            os.utime(temp_path, ns=(source_mtime_ns, source_mtime_ns))
+            os.replace(temp_path, thumb_path)
+        except OSError:
+            # A read-only project still gets in-memory thumbnails.
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return image
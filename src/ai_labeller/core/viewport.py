@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from PIL import Image
+
+
+@dataclass(frozen=True)
+class ViewportTile:
+    # Source crop in image pixels: (x1, y1, x2, y2), x2/y2 exclusive.
+    src_box: tuple[int, int, int, int]
+    # Resampled tile size in canvas pixels.
+    size: tuple[int, int]
+    scale: float
+
+    def dest_origin(self, offset_x: float, offset_y: float) -> tuple[float, float]:
+        """Canvas position of the tile's top-left corner for the given pan offset."""
+        return offset_x + self.src_box[0] * self.scale, offset_y + self.src_box[1] * self.scale
+
+    def covers(self, box: tuple[int, int, int, int]) -> bool:
+        return (
+            self.src_box[0] <= box[0]
+            and self.src_box[1] <= box[1]
+            and self.src_box[2] >= box[2]
+            and self.src_box[3] >= box[3]
+        )
+
+
+def visible_image_box(
+    img_w: int,
+    img_h: int,
+    scale: float,
+    offset_x: float,
+    offset_y: float,
+    canvas_w: int,
+    canvas_h: int,
+    margin_px: int = 0,
+) -> tuple[int, int, int, int] | None:
+    """Return the image-space box visible on canvas (plus margin), clamped to the image."""
+    if img_w <= 0 or img_h <= 0 or scale <= 0:
+        return None
+    if canvas_w <= 1 or canvas_h <= 1:
+        # Canvas not mapped yet: treat the whole image as visible.
+        return 0, 0, img_w, img_h
+    x1 = math.floor((-margin_px - offset_x) / scale)
+    y1 = math.floor((-margin_px - offset_y) / scale)
+    x2 = math.ceil((canvas_w + margin_px - offset_x) / scale)
+    y2 = math.ceil((canvas_h + margin_px - offset_y) / scale)
+    x1, x2 = max(0, x1), min(img_w, x2)
+    y1, y2 = max(0, y1), min(img_h, y2)
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return x1, y1, x2, y2
+
+
+class ViewportRenderer:
+    """Resample only the visible part of an image and reuse the last tile when possible."""
+
+    def __init__(self, margin_px: int = 128) -> None:
+        self.margin_px = margin_px
+        self._image: Image.Image | None = None
+        self._tile: ViewportTile | None = None
+        self._tile_image: Image.Image | None = None
+        self._resample: Image.Resampling | None = None
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self) -> None:
+        self._resample = None
+        self._image = None
+        self._tile = None
+        self._tile_image = None
+
+    def can_reuse(
+        self,
+        image: Image.Image,
+        scale: float,
+        offset_x: float,
+        offset_y: float,
+        canvas_w: int,
+        canvas_h: int,
+        resample: Image.Resampling | None = None,
+    ) -> bool:
+        """True when ``render`` would return the cached tile without resampling.
+
+        ``resample=None`` accepts a cached tile of any filter quality.
+        """
+        if self._tile is None or self._image is not image or self._tile.scale != scale:
+            return False
+        if resample is not None and resample != self._resample:
+            return False
+        needed = visible_image_box(image.width, image.height, scale, offset_x, offset_y, canvas_w, canvas_h)
+        return needed is not None and self._tile.covers(needed)
+
+    def render(
+        self,
+        image: Image.Image,
+        scale: float,
+        offset_x: float,
+        offset_y: float,
+        canvas_w: int,
+        canvas_h: int,
+        resample: Image.Resampling = Image.Resampling.NEAREST,
+    ) -> tuple[ViewportTile | None, Image.Image | None, bool]:
+        """Return ``(tile, tile_image, reused)`` for the current view.
+
+        ``reused`` is True when the cached tile still covers the visible area at the
+        same scale, so callers can keep their existing PhotoImage and only move it.
+        """
+        if self.can_reuse(image, scale, offset_x, offset_y, canvas_w, canvas_h, resample):
+            self.hits += 1
+            return self._tile, self._tile_image, True
+
+        src_box = visible_image_box(
+            image.width, image.height, scale, offset_x, offset_y, canvas_w, canvas_h, self.margin_px
+        )
+        if src_box is None:
+            return None, None, False
+        x1, y1, x2, y2 = src_box
+        size = (
+            max(1, int(round((x2 - x1) * scale))),
+            max(1, int(round((y2 - y1) * scale))),
+        )
+        tile_image = image.resize(size, resample, box=src_box)
+        self.misses += 1
+        self._image = image
+        self._tile = ViewportTile(src_box=src_box, size=size, scale=scale)
+        self._tile_image = tile_image
+        self._resample = resample
+        return self._tile, tile_image, False
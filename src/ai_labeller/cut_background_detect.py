@@ -10,6 +10,8 @@ import numpy as np
 from PIL import Image, ImageEnhance
 from tkinter import filedialog, messagebox
 
+from ai_labeller.core.geometry import iou_matrix
+
 
 IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
 
@@ -193,33 +195,22 @@ def _find_rois_by_minmax(
     if len(xs) == 0:
         return []
     scores = result[ys, xs]
-    candidates = list(zip(xs.tolist(), ys.tolist(), scores.tolist()))
-    candidates.sort(key=lambda item: item[2], reverse=True)
-    selected: list[tuple[int, int, float]] = []
-    boxes: list[tuple[int, int, int, int]] = []
-
-    def iou(box_a: tuple[int, int, int, int], box_b: tuple[int, int, int, int]) -> float:
-        xa1, ya1, xa2, ya2 = box_a
-        xb1, yb1, xb2, yb2 = box_b
-        xi1, yi1 = max(xa1, xb1), max(ya1, yb1)
-        xi2, yi2 = min(xa2, xb2), min(ya2, yb2)
-        inter = max(0, xi2 - xi1) * max(0, yi2 - yi1)
-        union = (
-            (max(0, xa2 - xa1) * max(0, ya2 - ya1))
-            + (max(0, xb2 - xb1) * max(0, yb2 - yb1))
-            - inter
-        )
-        return (inter / union) if union > 0 else 0.0
-
-    for x, y, score in candidates:
-        if len(selected) >= max_matches:
+    order = np.argsort(-scores, kind="stable")
+    xs, ys, scores = xs[order], ys[order], scores[order]
+    boxes = np.column_stack([xs, ys, xs + templ_w, ys + templ_h])
+    # Greedy NMS: each kept box suppresses every later candidate it overlaps, in one IoU row.
+    alive = np.ones(len(boxes), dtype=bool)
+    selected: list[int] = []
+    start = 0
+    while len(selected) < max_matches:
+        remaining = np.flatnonzero(alive[start:])
+        if not remaining.size:
             break
-        box = (x, y, x + templ_w, y + templ_h)
-        if any(iou(box, existing) > overlap_thresh for existing in boxes):
-            continue
-        selected.append((x, y, score))
-        boxes.append(box)
-    return [((int(x), int(y)), float(score)) for x, y, score in selected]
+        idx = start + int(remaining[0])
+        selected.append(idx)
+        start = idx + 1
+        alive[start:] &= iou_matrix(boxes[idx : idx + 1], boxes[start:])[0] <= overlap_thresh
+    return [((int(xs[i]), int(ys[i])), float(scores[i])) for i in selected]
 
 
 def _enhance_gray(img_bgr: np.ndarray) -> np.ndarray:
@@ -1,8 +1,10 @@
 import ctypes
 import ctypes.wintypes
+import bisect
 import copy
 import csv
 import datetime
+import functools
 import gc
 import glob
 import hashlib
@@ -13,6 +15,7 @@ import queue
 import random
 import re
 import shutil
+import sqlite3
 import subprocess
 import sys
 import tempfile
@@ -23,6 +26,7 @@ import warnings
 from collections import deque
 from importlib import resources
 from tkinter import filedialog, messagebox, simpledialog, ttk
+from tkinter import font as tkfont
 from typing import Any
 
 import numpy as np
@@ -31,12 +35,44 @@ from PIL import Image, ImageDraw, ImageTk
 from ai_labeller.core import (
     AppConfig,
     AppState,
+    CanvasScene,
     SessionState,
     HistoryManager,
+    HistoryStore,
+    DatasetStats,
+    DatasetStatsEngine,
+    DebouncedFileWriter,
+    DecodedImageCache,
+    FsEvent,
+    ImagePrefetcher,
+    ImagePyramid,
+    LabelWrite,
+    LabelWriteQueue,
+    PollingWatcher,
+    ProjectIndex,
+    RectStore,
+    RenderScheduler,
+    SpatialIndex,
+    SplitBitmaps,
+    TextMetricsCache,
+    ThumbnailCache,
+    ViewportRenderer,
     atomic_write_json,
     atomic_write_text,
+    project_state_path,
     setup_logging,
 )
+from ai_labeller.core.dataset_scan import IMAGE_EXTENSIONS, ScanEntry, scan_dir, scan_split
+from ai_labeller.core.dataset_stats import STATS_CACHE_FILE_NAME
+from ai_labeller.core.fs_watcher import DirMtimes
+from ai_labeller.core.geometry import convex_iou_matrix, iou_matrix, obb_corners, rect_obbs, suppress_duplicates
+from ai_labeller.core.history_store import HISTORY_FILE_NAME, content_fingerprint
+from ai_labeller.core.image_cache import decode_display_image
+from ai_labeller.core.logging_utils import close_trace_logging, setup_trace_logging
+from ai_labeller.core.near_duplicates import find_near_duplicates, hash_images
+from ai_labeller.core.perf import PerfMonitor, hit_rate
+from ai_labeller.core.rect_store import points_to_canvas
+from ai_labeller.core.thumbnails import THUMB_DIR_NAME
 
 # Optional dependencies
 try:
@@ -262,6 +298,28 @@ LANG_MAP = {
         "golden_export_done": "Golden folder exported.\nOutput: {path}",
         "export_failed": "Export failed: {err}",
         "golden_export_failed": "Golden export failed: {err}",
+        "perf_hud": "Performance HUD",
+        "perf_trace": "Performance Trace",
+        "perf_trace_on": "Performance trace enabled:\n{path}",
+        "perf_trace_off": "Performance trace disabled.",
+        "jump_unlabeled": "Next unlabeled image",
+        "jump_class": "Next image with current class",
+        "jump_empty": "Next image with no boxes",
+        "jump_none": "No matching image in this split.",
+        "dataset_stats": "Dataset Statistics",
+        "stats_refresh": "Refresh Statistics",
+        "stats_empty": "No statistics yet.",
+        "stats_running": "Computing statistics...",
+        "stats_failed": "Statistics failed: {err}",
+        "dedup_find": "Find Near-Duplicates",
+        "dedup_title": "Near-Duplicate Images",
+        "dedup_running": "Hashing {count} image(s)...",
+        "dedup_progress": "Hashing images: {done} / {total}",
+        "dedup_summary": "{groups} group(s), {images} image(s). Double-click to open.",
+        "dedup_none": "No near-duplicates found.",
+        "dedup_failed": "Near-duplicate scan failed: {err}",
+        "dedup_remove": "Remove Selected From Split",
+        "detect_duplicates_skipped": "{count} duplicate detection(s) skipped",
     },
 }
 
@@ -287,6 +345,30 @@ def _normalize_lang_map() -> None:
 
 
 _normalize_lang_map()
+
+
+def _rects_fingerprint(rects: list[list[float]], width: int, height: int) -> str:
+    """Fingerprint of boxes as they would be saved: their YOLO text plus their angles."""
+    store = RectStore.from_rects(rects)
+    return content_fingerprint(f"{store.to_yolo_text(width, height)}{store.angles.tolist()}")
+
+
+def _timed(name: str):
+    """Record a GeckoAI method's wall time under ``name`` in ``self.perf``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            with self.perf.timer(name):
+                return fn(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+# Canvas layers that pan/zoom gestures transform in place (everything but the bitmap).
+GESTURE_VECTOR_LAYERS = ("ghost", "box", "label_bg", "label", "handle", "overlay")
+NAV_LAYERS = ("nav_bg", "nav_thumb", "nav_text", "nav_badge")
+NAV_VISIBLE_ROWS = 6
+# Project index split key for image folders without images/<split> subfolders.
+FLAT_SPLIT = "_flat"
 # ==================== Main App ====================
 class GeckoAI:
     def __init__(self, root: tk.Tk, startup_mode: str = "chooser"):
@@ -295,8 +377,11 @@ class GeckoAI:
         self.theme = "dark"
         self.config = AppConfig()
         self.state = AppState()
-        self.history_manager = HistoryManager()
+        self.history_manager = HistoryManager(max_bytes=self.config.undo_memory_mb * 1024 * 1024)
         self.logger = setup_logging(os.path.join(os.path.expanduser("~"), ".ai_labeller.log"))
+        self.history_store = HistoryStore(self.config.undo_history_cache_mb * 1024 * 1024, logger=self.logger)
+        # (image_path, label_path, content fingerprint, rects fingerprint, width, height) of the last save_current.
+        self._saved_label_state: tuple[str, str, str, str, int, int] | None = None
 
         self.root.title(LANG_MAP[self.lang]["title"])
         self.root.geometry(self.config.default_window_size)
@@ -326,6 +411,45 @@ class GeckoAI:
         self.offset_y = 0
         self.img_pil = None
         self.img_tk = None
+        self.img_pyramid: ImagePyramid | None = None
+        # True while img_pil is an undecoded full-resolution handle and the pyramid shows a proxy.
+        self._img_is_proxy = False
+        # Image paths whose full-resolution decode failed; they stay on the display proxy.
+        self._full_res_failed: set[str] = set()
+        self.perf = PerfMonitor()
+        self.show_perf_hud = False
+        self.perf_trace_path = os.path.join(os.path.expanduser("~"), self.config.perf_trace_file_name)
+        self.viewport_renderer = ViewportRenderer(margin_px=self.config.viewport_margin_px)
+        self.image_cache = DecodedImageCache(max_bytes=self.config.image_cache_max_mb * 1024 * 1024)
+        self.image_prefetcher = ImagePrefetcher(
+            self.image_cache,
+            decode=functools.partial(decode_display_image, max_side=self.config.display_proxy_max_side),
+            max_workers=self.config.prefetch_workers,
+        )
+        # Per-project journals and caches kept on local disk, out of the share.
+        self.project_state_dir = os.path.join(os.path.expanduser("~"), self.config.project_state_dir_name)
+        # The crash journal is per project; load_project_from_path opens it.
+        self.label_writer = LabelWriteQueue(logger=self.logger)
+        self.thumb_cache: ThumbnailCache | None = None
+        self.project_index: ProjectIndex | None = None
+        # Built on the first jump after the image list changes; kept in sync by save_current.
+        self.split_bitmaps: SplitBitmaps | None = None
+        self.fs_watcher: PollingWatcher | None = None
+        self.stats_engine: DatasetStatsEngine | None = None
+        self.stats_queue: queue.Queue[tuple[str, Any]] = queue.Queue()
+        self._stats_running = False
+        self.dedup_queue: queue.Queue[tuple[Any, ...]] = queue.Queue()
+        self._dedup_running = False
+        self._fs_poll_id: Any = None
+        self._flat_project = False
+        self._nav_scroll_px = 0
+        self._nav_photos: dict[str, ImageTk.PhotoImage] = {}
+        # Image paths of the filmstrip rows the last refresh drew, sized by the canvas height.
+        self._nav_visible: list[str] = []
+        self._nav_label_state: dict[str, bool] = {}
+        self._nav_poll_id: Any = None
+        self.text_metrics = TextMetricsCache(lambda spec: tkfont.Font(root=self.root, font=spec))
+        self.render_scheduler = RenderScheduler(self.root, self.render)
         self.selected_idx = None
         self.selected_indices: set[int] = set()
         self.active_handle = None
@@ -341,6 +465,13 @@ class GeckoAI:
         self.show_all_labels = True
         self.var_show_prev_labels = tk.BooleanVar(value=False)
         self._prev_image_rects: list[list[float]] = []
+        self.rect_index = SpatialIndex()
+        self.prev_rect_index = SpatialIndex()
+        # Array mirrors of the rect lists, shared by render() and save_current().
+        self.rect_store = RectStore()
+        self.prev_rect_store = RectStore()
+        self._pan_anchor: tuple[int, int] | None = None
+        self._gesture_after_id: str | None = None
         self._loaded_image_path: str | None = None
         self._cursor_line_x: int | None = None
         self._cursor_line_y: int | None = None
@@ -353,6 +484,8 @@ class GeckoAI:
         self.det_model_mode = tk.StringVar(value="Official YOLO26m.pt (Bundled)")
         self._loaded_model_key: tuple[str, str] | None = None
         self._force_cpu_detection = False
+        # Detections the last YOLO run on this image dropped as duplicates; shown with the box count.
+        self._detect_skipped = 0
         self.model_library: list[str] = [self.config.yolo_model_path]
         self.var_export_format = tk.StringVar(value="YOLO (.txt)")
         self.var_auto_yolo = tk.BooleanVar(value=False)
@@ -360,6 +493,7 @@ class GeckoAI:
         self.var_propagate_mode = tk.StringVar(value="if_missing")
         self.var_yolo_conf = tk.DoubleVar(value=self.config.default_yolo_conf)
         self.session_path = os.path.join(os.path.expanduser("~"), self.config.session_file_name)
+        self.session_writer = DebouncedFileWriter(self.root, self.config.session_save_delay_ms, logger=self.logger)
         self.foundation_dino = None
         self.foundation_sam_predictor = None
         self._uncertainty_cache: dict[str, float] = {}
@@ -533,11 +667,12 @@ class GeckoAI:
         selected = self._get_selected_indices()
         if not selected:
             return "break"
-        self.push_history()
+        self.history_manager.record_remove(self.rects, selected)
         for idx in sorted(selected, reverse=True):
             self.rects.pop(idx)
+        self._invalidate_rects()
         self._set_selected_indices([])
-        self.render()
+        self.request_render()
         return "break"
 
     def select_all_boxes(self, e=None):
@@ -546,7 +681,7 @@ class GeckoAI:
         all_indices = list(range(len(self.rects)))
         self._set_selected_indices(all_indices, primary_idx=all_indices[-1])
         self._sync_class_combo_with_selection()
-        self.render()
+        self.request_render()
         return "break"
 
     def _get_selected_indices(self) -> list[int]:
@@ -581,9 +716,43 @@ class GeckoAI:
         if 0 <= only_cid < len(self.class_names):
             self.combo_cls.current(only_cid)
 
-    def _pick_box_at_point(self, ix: float, iy: float) -> int | None:
+    def _rect_index_for(self, rects: list[list[float]], index: SpatialIndex) -> SpatialIndex:
+        """Return ``index`` brought up to date with ``rects``.
+
+        Appended boxes are inserted incrementally; a replaced list, a shrunk list or an
+        explicit invalidation triggers one vectorized rebuild.
+        """
+        if index.dirty or index.source is not rects or len(index) > len(rects):
+            store = self.rect_store if rects is self.rects else self.prev_rect_store
+            index.rebuild(store.sync(rects).aabbs(), source=rects)
+        elif len(index) < len(rects):
+            start = len(index)
+            for key, box in enumerate(RectStore.from_rects(rects[start:]).aabbs().tolist(), start):
+                index.insert(key, box)
+        return index
+
+    def _invalidate_rects(self) -> None:
+        """Mark the derived index and store stale after an edit no row list describes."""
+        self.rect_index.dirty = True
+        self.rect_store.dirty = True
+
+    def _refresh_rect_index(self, indices: list[int]) -> None:
+        """Re-index boxes that were moved, resized, rotated or clamped in place."""
+        self.rect_store.update_rows(self.rects, indices)
+        index = self.rect_index
+        if index.dirty or index.source is not self.rects:
+            return
+        valid = [idx for idx in indices if 0 <= idx < len(self.rects) and idx < len(index)]
+        if not valid:
+            return
+        aabbs = RectStore.from_rects([self.rects[idx] for idx in valid]).aabbs()
+        for key, box in zip(valid, aabbs.tolist()):
+            index.update(key, box)
+
+    def _pick_rotated_box(self, rects: list[list[float]], index: SpatialIndex, ix: float, iy: float) -> int | None:
         candidates: list[tuple[float, int]] = []
-        for idx, rect in enumerate(self.rects):
+        for idx in self._rect_index_for(rects, index).query_point(ix, iy):
+            rect = rects[idx]
             if self._point_in_rotated_box(ix, iy, rect):
                 x1 = min(rect[0], rect[2])
                 y1 = min(rect[1], rect[3])
@@ -597,35 +766,14 @@ class GeckoAI:
         candidates.sort(key=lambda item: (item[0], -item[1]))
         return candidates[0][1]
 
+    def _pick_box_at_point(self, ix: float, iy: float) -> int | None:
+        return self._pick_rotated_box(self.rects, self.rect_index, ix, iy)
+
     def _pick_boxes_in_img_rect(self, ix1: float, iy1: float, ix2: float, iy2: float) -> list[int]:
-        sx1, sx2 = sorted((ix1, ix2))
-        sy1, sy2 = sorted((iy1, iy2))
-        hits: list[int] = []
-        for idx, rect in enumerate(self.rects):
-            corners = self.get_rotated_corners(rect)
-            rx1 = min(px for px, _ in corners)
-            ry1 = min(py for _, py in corners)
-            rx2 = max(px for px, _ in corners)
-            ry2 = max(py for _, py in corners)
-            intersects = not (rx2 < sx1 or rx1 > sx2 or ry2 < sy1 or ry1 > sy2)
-            if intersects:
-                hits.append(idx)
-        return hits
+        return self._rect_index_for(self.rects, self.rect_index).query_rect(ix1, iy1, ix2, iy2)
 
     def _pick_prev_box_at_point(self, ix: float, iy: float) -> int | None:
-        candidates: list[tuple[float, int]] = []
-        for idx, rect in enumerate(self._prev_image_rects):
-            if self._point_in_rotated_box(ix, iy, rect):
-                x1 = min(rect[0], rect[2])
-                y1 = min(rect[1], rect[3])
-                x2 = max(rect[0], rect[2])
-                y2 = max(rect[1], rect[3])
-                area = max(1.0, (x2 - x1) * (y2 - y1))
-                candidates.append((area, idx))
-        if not candidates:
-            return None
-        candidates.sort(key=lambda item: (item[0], -item[1]))
-        return candidates[0][1]
+        return self._pick_rotated_box(self._prev_image_rects, self.prev_rect_index, ix, iy)
     
     def setup_ui(self):
         # ==================== Top Toolbar ====================
@@ -646,6 +794,11 @@ class GeckoAI:
             relief="flat"
         )
         self.canvas.pack(side="left", fill="both", expand=True)
+        self.canvas_scene = CanvasScene(self.canvas)
+        self._cursor_line_x = None
+        self._cursor_line_y = None
+        self._cursor_text_id = None
+        self._cursor_bg_id = None
     
     def setup_toolbar(self):
         """Build the top toolbar."""
@@ -870,6 +1023,11 @@ class GeckoAI:
             ("Ctrl+Z", LANG_MAP[self.lang]["undo"]),
             ("Ctrl+Y", LANG_MAP[self.lang]["redo"]),
             ("Del", LANG_MAP[self.lang]["delete"]),
+            ("N", LANG_MAP[self.lang]["jump_unlabeled"]),
+            ("M", LANG_MAP[self.lang]["jump_class"]),
+            ("B", LANG_MAP[self.lang]["jump_empty"]),
+            ("F3", LANG_MAP[self.lang]["perf_hud"]),
+            ("Shift+F3", LANG_MAP[self.lang]["perf_trace"]),
         ]
         lines = [LANG_MAP[self.lang]["shortcut_help"]]
         for key, desc in items:
@@ -1067,6 +1225,9 @@ class GeckoAI:
         
         # ===== File info card =====
         self.create_info_card(self.sidebar_scroll_frame)
+
+        # ===== Dataset statistics card =====
+        self.create_stats_card(self.sidebar_scroll_frame)
         
         # ===== Class management card =====
         self.create_class_card(self.sidebar_scroll_frame)
@@ -1149,6 +1310,7 @@ class GeckoAI:
 
     def rebuild_ui(self):
         self.hide_shortcut_tooltip()
+        self.text_metrics.clear()
         for child in self.root.winfo_children():
             child.destroy()
         self.setup_custom_style()
@@ -1231,14 +1393,26 @@ class GeckoAI:
         image_select_row = tk.Frame(content, bg=COLORS["bg_white"])
         image_select_row.pack(fill="x")
 
-        self.combo_image = ttk.Combobox(
-            image_select_row,
-            values=[],
-            state="readonly",
-            font=self.font_primary
+        # Virtualized filmstrip: only the visible rows exist as canvas items.
+        nav_frame = tk.Frame(content, bg=COLORS["bg_white"])
+        nav_frame.pack(fill="x", pady=(6, 0))
+        self.nav_scrollbar = ttk.Scrollbar(nav_frame, orient="vertical", command=self._on_navigator_scrollbar)
+        self.nav_scrollbar.pack(side="right", fill="y")
+        self.nav_canvas = tk.Canvas(
+            nav_frame,
+            height=NAV_VISIBLE_ROWS * self._nav_row_height(),
+            bg=COLORS["bg_light"],
+            highlightthickness=0,
         )
-        self.combo_image.pack(side="left", fill="x", expand=True)
-        self.combo_image.bind("<<ComboboxSelected>>", self.on_image_selected)
+        self.nav_canvas.pack(side="left", fill="x", expand=True)
+        self.nav_scene = CanvasScene(self.nav_canvas, layers=NAV_LAYERS)
+        self.nav_canvas.bind("<Configure>", lambda e: self.refresh_image_navigator())
+        self.nav_canvas.bind("<ButtonPress-1>", self.on_image_selected)
+        self.nav_canvas.bind("<MouseWheel>", self._on_navigator_mousewheel)
+        self.nav_canvas.bind("<Button-4>", lambda e: self._scroll_navigator(-3 * self._nav_row_height()))
+        self.nav_canvas.bind("<Button-5>", lambda e: self._scroll_navigator(3 * self._nav_row_height()))
+
+        tk.Frame(image_select_row, bg=COLORS["bg_white"]).pack(side="left", fill="x", expand=True)
 
         self.create_toolbar_icon_button(
             image_select_row,
@@ -1293,6 +1467,34 @@ class GeckoAI:
         )
         self.lbl_class_count.pack(side="right")
 
+
+    def create_stats_card(self, parent):
+        """Create dataset statistics card."""
+        content = self.create_card(parent, LANG_MAP[self.lang]["dataset_stats"])
+
+        self.lbl_dataset_stats = tk.Label(
+            content,
+            text=LANG_MAP[self.lang]["stats_empty"],
+            font=self.font_mono,
+            fg=COLORS["text_secondary"],
+            bg=COLORS["bg_white"],
+            anchor="w",
+            justify="left",
+            wraplength=260,
+        )
+        self.lbl_dataset_stats.pack(fill="x", pady=(0, 12))
+
+        self.create_secondary_button(
+            content,
+            text=LANG_MAP[self.lang]["stats_refresh"],
+            command=self.refresh_dataset_stats,
+        ).pack(fill="x", pady=(0, 8))
+
+        self.create_secondary_button(
+            content,
+            text=LANG_MAP[self.lang]["dedup_find"],
+            command=self.find_near_duplicate_images,
+        ).pack(fill="x")
     
     def create_class_card(self, parent):
         """Create class management card."""
@@ -1446,7 +1648,12 @@ class GeckoAI:
             ("Q / E", "Rotate selected box"),
             ("Ctrl+Z", LANG_MAP[self.lang]["undo"]),
             ("Ctrl+Y", LANG_MAP[self.lang]["redo"]),
-            ("Del", LANG_MAP[self.lang]["delete"])
+            ("Del", LANG_MAP[self.lang]["delete"]),
+            ("N", LANG_MAP[self.lang]["jump_unlabeled"]),
+            ("M", LANG_MAP[self.lang]["jump_class"]),
+            ("B", LANG_MAP[self.lang]["jump_empty"]),
+            ("F3", LANG_MAP[self.lang]["perf_hud"]),
+            ("Shift+F3", LANG_MAP[self.lang]["perf_trace"])
         ]
         
         for key, desc in shortcuts:
@@ -1595,20 +1802,17 @@ class GeckoAI:
         if not self.image_files:
             self.lbl_filename.config(text=LANG_MAP[self.lang]["no_img"])
             self.lbl_progress.config(text="0 / 0")
-            if hasattr(self, "combo_image"):
-                self.combo_image.configure(values=[])
-                self.combo_image.set("")
         else:
             filename = os.path.basename(self.image_files[self.current_idx])
             self.lbl_filename.config(text=filename)
             self.lbl_progress.config(
                 text=f"{self.current_idx + 1} / {len(self.image_files)}"
             )
-            self.refresh_image_dropdown()
         
-        self.lbl_box_count.config(
-            text=f"{LANG_MAP[self.lang]['boxes']}: {len(self.rects)}"
-        )
+        box_text = f"{LANG_MAP[self.lang]['boxes']}: {len(self.rects)}"
+        if self._detect_skipped:
+            box_text += "  (" + LANG_MAP[self.lang]["detect_duplicates_skipped"].format(count=self._detect_skipped) + ")"
+        self.lbl_box_count.config(text=box_text)
         if hasattr(self, "lbl_class_count"):
             frame_class_count = len({int(r[4]) for r in self.rects if len(r) >= 5})
             total_class_count = len(self.class_names)
@@ -1616,22 +1820,175 @@ class GeckoAI:
                 text=f"{LANG_MAP[self.lang]['class_mgmt']}: {frame_class_count} / {total_class_count}"
             )
 
-    def refresh_image_dropdown(self):
-        if not hasattr(self, "combo_image"):
+    def _nav_row_height(self) -> int:
+        return self.config.thumbnail_size + 8
+
+    def refresh_image_navigator(self, reveal_current: bool = False) -> None:
+        """Redraw the filmstrip rows that are currently on screen."""
+        if not hasattr(self, "nav_canvas"):
             return
-        names = [os.path.basename(p) for p in self.image_files]
-        self.combo_image.configure(values=names)
-        if not names:
-            self.combo_image.set("")
+        try:
+            if not self.nav_canvas.winfo_exists():
+                return
+        except tk.TclError:
             return
-        if 0 <= self.current_idx < len(names):
-            self.combo_image.set(names[self.current_idx])
+        row_h = self._nav_row_height()
+        view_h = max(self.nav_canvas.winfo_height(), NAV_VISIBLE_ROWS * row_h)
+        view_w = max(self.nav_canvas.winfo_width(), 120)
+        total_h = len(self.image_files) * row_h
+        if reveal_current and self.image_files:
+            current_top = self.current_idx * row_h
+            if current_top < self._nav_scroll_px:
+                self._nav_scroll_px = current_top
+            elif current_top + row_h > self._nav_scroll_px + view_h:
+                self._nav_scroll_px = current_top + row_h - view_h
+        self._nav_scroll_px = int(min(max(0, self._nav_scroll_px), max(0, total_h - view_h)))
+        if total_h > 0:
+            self.nav_scrollbar.set(self._nav_scroll_px / total_h, min(1.0, (self._nav_scroll_px + view_h) / total_h))
+        else:
+            self.nav_scrollbar.set(0.0, 1.0)
+
+        first = self._nav_scroll_px // row_h
+        last = min(len(self.image_files), (self._nav_scroll_px + view_h) // row_h + 1)
+        thumb = self.config.thumbnail_size
+        scene = self.nav_scene
+        scene.begin_frame()
+        visible_paths: list[str] = []
+        photos: dict[str, ImageTk.PhotoImage] = {}
+        for idx in range(first, last):
+            path = self.image_files[idx]
+            visible_paths.append(path)
+            y = idx * row_h - self._nav_scroll_px
+            is_current = idx == self.current_idx
+            scene.put(
+                ("bg", idx),
+                "rectangle",
+                (0, y, view_w, y + row_h - 1),
+                "nav_bg",
+                fill=COLORS["primary"] if is_current else COLORS["bg_white"],
+                outline=COLORS["border"],
+            )
+            photo = self._nav_photos.get(path)
+            if photo is None and self.thumb_cache is not None:
+                thumb_image = self.thumb_cache.get(path)
+                if thumb_image is not None:
+                    photo = ImageTk.PhotoImage(thumb_image)
+            if photo is not None:
+                photos[path] = photo
+                scene.put(("thumb", idx), "image", (4 + thumb // 2, y + row_h // 2), "nav_thumb", image=photo)
+            else:
+                scene.put(
+                    ("thumb", idx),
+                    "rectangle",
+                    (4, y + 4, 4 + thumb, y + 4 + thumb),
+                    "nav_thumb",
+                    fill=COLORS["bg_light"],
+                    outline=COLORS["border"],
+                )
+            scene.put(
+                ("text", idx),
+                "text",
+                (thumb + 12, y + row_h // 2),
+                "nav_text",
+                text=f"{idx + 1}. {os.path.basename(path)}",
+                anchor="w",
+                font=self.font_primary,
+                fill=COLORS["text_white"] if is_current else COLORS["text_primary"],
+            )
+            labeled = self._navigator_label_state(path)
+            scene.put(
+                ("badge", idx),
+                "oval",
+                (view_w - 16, y + row_h // 2 - 5, view_w - 6, y + row_h // 2 + 5),
+                "nav_badge",
+                fill=COLORS["success"] if labeled else "",
+                outline=COLORS["success"] if labeled else COLORS["text_secondary"],
+                width=2,
+            )
+        scene.end_frame()
+        # Keep PhotoImages alive only for rows on screen.
+        self._nav_photos = photos
+        self._nav_visible = visible_paths
+        if self.thumb_cache is not None:
+            missing = self._nav_missing_thumbs()
+            if missing:
+                self.thumb_cache.request(missing)
+                if self._nav_poll_id is None:
+                    self._nav_poll_id = self.root.after(80, self._poll_navigator_thumbs)
+
+    def _nav_missing_thumbs(self) -> list[str]:
+        """Rows on screen still waiting for a thumbnail; unreadable images are not waited for."""
+        return [
+            path
+            for path in self._nav_visible
+            if path not in self._nav_photos and not self.thumb_cache.failed(path)
+        ]
+
+    def _poll_navigator_thumbs(self) -> None:
+        self._nav_poll_id = None
+        if self.thumb_cache is None:
+            return
+        ready = set(self.thumb_cache.drain_ready())
+        if ready.intersection(self._nav_visible):
+            self.refresh_image_navigator()
+        elif self._nav_missing_thumbs():
+            self._nav_poll_id = self.root.after(80, self._poll_navigator_thumbs)
+
+    def _navigator_label_state(self, image_path: str) -> bool:
+        state = self._nav_label_state.get(image_path)
+        if state is None:
+            base = os.path.splitext(os.path.basename(image_path))[0]
+            label_path = f"{self.project_root}/labels/{self.current_split}/{base}.txt"
+            pending_write = self.label_writer.lookup(label_path)
+            if pending_write is not None:
+                state = bool(pending_write.content)
+            elif self.project_index is not None:
+                state = bool(self.project_index.has_label(self._current_index_split(), os.path.basename(image_path)))
+            else:
+                state = os.path.isfile(label_path) and os.path.getsize(label_path) > 0
+            self._nav_label_state[image_path] = state
+        return state
+
+    def _scroll_navigator(self, delta_px: int) -> str:
+        self._nav_scroll_px += delta_px
+        if self.thumb_cache is not None:
+            # Rows scrolled past no longer need their thumbnails.
+            self.thumb_cache.cancel()
+        self.refresh_image_navigator()
+        return "break"
+
+    def _on_navigator_mousewheel(self, e: Any) -> str:
+        if e.delta:
+            return self._scroll_navigator(int(-3 * self._nav_row_height() * (e.delta / 120)))
+        return "break"
+
+    def _on_navigator_scrollbar(self, action: str, value: str, unit: str | None = None) -> None:
+        row_h = self._nav_row_height()
+        if action == "moveto":
+            self._nav_scroll_px = int(float(value) * len(self.image_files) * row_h)
+            if self.thumb_cache is not None:
+                self.thumb_cache.cancel()
+            self.refresh_image_navigator()
+        elif action == "scroll":
+            step = NAV_VISIBLE_ROWS * row_h if unit == "pages" else row_h
+            self._scroll_navigator(int(value) * step)
+
+    def _reset_thumbnail_cache(self) -> None:
+        if self.thumb_cache is not None:
+            self.thumb_cache.shutdown()
+            self.thumb_cache = None
+        if self.project_root:
+            self.thumb_cache = ThumbnailCache(
+                os.path.join(self.project_root, THUMB_DIR_NAME),
+                size=self.config.thumbnail_size,
+                max_workers=self.config.thumbnail_workers,
+            )
 
     def on_image_selected(self, e: Any = None) -> None:
         if not self.image_files:
             return
-        idx = self.combo_image.current()
-        if idx < 0 or idx == self.current_idx:
+        idx = (self._nav_scroll_px + int(e.y)) // self._nav_row_height()
+        if idx < 0 or idx >= len(self.image_files) or idx == self.current_idx:
             return
         self.save_current()
         self.current_idx = idx
@@ -1777,10 +2134,9 @@ class GeckoAI:
         ]
         for idx, class_name in enumerate(self.class_names):
             lines.append(f"class_{idx}: {q(class_name)}")
-        try:
-            atomic_write_text(yaml_path, "\n".join(lines) + "\n")
-        except Exception:
-            self.logger.exception("Failed to write project progress yaml: %s", yaml_path)
+        # updated_at alone must not trigger a rewrite.
+        fingerprint = "\n".join(line for line in lines if not line.startswith("updated_at:"))
+        self.session_writer.write(yaml_path, "\n".join(lines) + "\n", fingerprint=fingerprint)
 
     def _read_project_progress_yaml(self, project_root: str) -> dict[str, str]:
         yaml_path = self._project_progress_yaml_path(project_root)
@@ -1831,10 +2187,7 @@ class GeckoAI:
         )
         if self.image_files and 0 <= self.current_idx < len(self.image_files):
             state.image_name = os.path.basename(self.image_files[self.current_idx])
-        try:
-            atomic_write_json(self.session_path, state.__dict__)
-        except Exception:
-            self.logger.exception("Failed to save session state")
+        self.session_writer.write(self.session_path, json.dumps(state.__dict__, ensure_ascii=False))
         self._write_project_progress_yaml()
 
     def load_session_state(self) -> None:
@@ -2764,15 +3117,16 @@ class GeckoAI:
         id_cfg_path = self._find_golden_id_config_in_folder(golden_dir)
         id_cfg = self._load_golden_id_config(id_cfg_path)
         targets: list[dict[str, Any]] = []
-        for class_id, rect_norm in candidates:
+        for class_id, rect_norm, poly_norm in candidates:
             class_name = class_mapping.get(int(class_id)) if class_mapping else None
-            targets.append(
-                {
-                    "class_id": int(class_id),
-                    "class_name": class_name,
-                    "rect_norm": rect_norm,
-                }
-            )
+            target = {
+                "class_id": int(class_id),
+                "class_name": class_name,
+                "rect_norm": rect_norm,
+            }
+            if poly_norm is not None:
+                target["poly_norm"] = poly_norm
+            targets.append(target)
         if not targets:
             messagebox.showwarning("Golden Sample", "No valid target in selected label.", parent=self.root)
             return
@@ -2881,7 +3235,7 @@ class GeckoAI:
             messagebox.showwarning("Golden Sample", "Golden capture is not active.", parent=self.root)
             return
         try:
-            self.save_current()
+            self.save_current(wait=True)
         except Exception:
             self.logger.exception("Failed to save current annotations before golden finalize")
 
@@ -2912,14 +3266,15 @@ class GeckoAI:
         candidates = self._parse_yolo_label_file(lbl_dst)
         class_mapping = self._load_mapping_from_dataset_yaml(yaml_dst)
         targets: list[dict[str, Any]] = []
-        for class_id, rect_norm in candidates:
-            targets.append(
-                {
-                    "class_id": int(class_id),
-                    "class_name": class_mapping.get(int(class_id)),
-                    "rect_norm": rect_norm,
-                }
-            )
+        for class_id, rect_norm, poly_norm in candidates:
+            target = {
+                "class_id": int(class_id),
+                "class_name": class_mapping.get(int(class_id)),
+                "rect_norm": rect_norm,
+            }
+            if poly_norm is not None:
+                target["poly_norm"] = poly_norm
+            targets.append(target)
         if not targets:
             messagebox.showwarning("Golden Sample", "Exported label has no valid targets.", parent=self.root)
             return
@@ -3164,8 +3519,11 @@ class GeckoAI:
         self.root.wait_window(win)
         return state["result"]
 
-    def _parse_yolo_label_file(self, label_path: str) -> list[tuple[int, tuple[float, float, float, float]]]:
-        items: list[tuple[int, tuple[float, float, float, float]]] = []
+    def _parse_yolo_label_file(
+        self, label_path: str
+    ) -> list[tuple[int, tuple[float, float, float, float], tuple[float, ...] | None]]:
+        """(class id, normalized extent, normalized OBB corners or None) per valid label line."""
+        items: list[tuple[int, tuple[float, float, float, float], tuple[float, ...] | None]] = []
         try:
             with open(label_path, "r", encoding="utf-8") as f:
                 lines = f.readlines()
@@ -3179,11 +3537,13 @@ class GeckoAI:
                 cid = int(float(parts[0]))
             except Exception:
                 continue
+            poly: tuple[float, ...] | None = None
             if len(parts) >= 9:
                 try:
                     pts = list(map(float, parts[1:9]))
                 except Exception:
                     continue
+                poly = tuple(max(0.0, min(1.0, v)) for v in pts)
                 xs = [pts[0], pts[2], pts[4], pts[6]]
                 ys = [pts[1], pts[3], pts[5], pts[7]]
                 x1, x2 = min(xs), max(xs)
@@ -3201,7 +3561,7 @@ class GeckoAI:
             y2 = max(0.0, min(1.0, y2))
             if x2 <= x1 or y2 <= y1:
                 continue
-            items.append((cid, (x1, y1, x2, y2)))
+            items.append((cid, (x1, y1, x2, y2), poly))
         return items
 
     def _find_dataset_yaml_for_label(self, label_path: str) -> str | None:
@@ -3981,25 +4341,6 @@ class GeckoAI:
             if self._detect_verdict_label is not None:
                 self._detect_verdict_label.config(fg=COLORS["text_secondary"])
 
-    def _bbox_iou(self, a: tuple[float, float, float, float], b: tuple[float, float, float, float]) -> float:
-        ax1, ay1, ax2, ay2 = a
-        bx1, by1, bx2, by2 = b
-        inter_x1 = max(ax1, bx1)
-        inter_y1 = max(ay1, by1)
-        inter_x2 = min(ax2, bx2)
-        inter_y2 = min(ay2, by2)
-        iw = max(0.0, inter_x2 - inter_x1)
-        ih = max(0.0, inter_y2 - inter_y1)
-        inter = iw * ih
-        if inter <= 0.0:
-            return 0.0
-        area_a = max(0.0, ax2 - ax1) * max(0.0, ay2 - ay1)
-        area_b = max(0.0, bx2 - bx1) * max(0.0, by2 - by1)
-        union = area_a + area_b - inter
-        if union <= 1e-9:
-            return 0.0
-        return inter / union
-
     def _evaluate_golden_match(self, result0: Any) -> tuple[str | None, str]:
         if self.detect_run_mode_var.get().strip().lower() != "golden" or self._detect_golden_sample is None:
             self._detect_last_cut_piece_count = 0
@@ -4020,13 +4361,21 @@ class GeckoAI:
             return "FAIL", "invalid frame shape"
 
         boxes = getattr(result0, "boxes", None)
-        if boxes is None or getattr(boxes, "xyxy", None) is None or getattr(boxes, "cls", None) is None:
+        obb = getattr(result0, "obb", None)
+        det_polys: np.ndarray | None = None
+        if boxes is not None and getattr(boxes, "xyxy", None) is not None and getattr(boxes, "cls", None) is not None:
+            det_xyxy = boxes.xyxy.tolist()
+            det_cls = boxes.cls.tolist()
+        elif obb is not None and getattr(obb, "xyxyxyxy", None) is not None and getattr(obb, "cls", None) is not None:
+            # OBB models report corners instead of boxes.
+            det_polys = np.asarray(obb.xyxyxyxy.tolist(), dtype=np.float64).reshape(-1, 4, 2) / np.array([w, h])
+            det_xyxy = np.concatenate([det_polys.min(axis=1), det_polys.max(axis=1)], axis=1) * np.array([w, h, w, h])
+            det_cls = obb.cls.tolist()
+        else:
             self._detect_last_ocr_id = ""
             self._detect_last_ocr_sub_id = ""
             return "FAIL", "no detections"
 
-        det_xyxy = boxes.xyxy.tolist()
-        det_cls = boxes.cls.tolist()
         names_map = getattr(result0, "names", {}) or {}
         def normalize_name(name: str) -> str:
             return str(name).strip().lower()
@@ -4038,47 +4387,49 @@ class GeckoAI:
                 return str(names_map[cid])
             return str(cid)
 
+        det_cids = [int(det_cls[i]) if i < len(det_cls) else -1 for i in range(len(det_xyxy))]
+        det_names = np.array([normalize_name(det_name_for_cid(cid)) for cid in det_cids], dtype=object)
+        det_cids_arr = np.array(det_cids, dtype=np.int64)
+        det_norm = np.asarray(det_xyxy, dtype=np.float64).reshape(-1, 4) / np.array([w, h, w, h], dtype=np.float64)
+        scored_targets = [target for target in targets if target.get("rect_norm") is not None]
+        # One IoU matrix per frame: targets x detections.
+        if det_polys is None and not any(target.get("poly_norm") for target in scored_targets):
+            ious = iou_matrix([target["rect_norm"] for target in scored_targets], det_norm)
+        else:
+            # Rotated targets or detections: compare the actual quads, not their extents.
+            target_polys = obb_corners(rect_obbs([target["rect_norm"] for target in scored_targets]))
+            for k, target in enumerate(scored_targets):
+                if target.get("poly_norm"):
+                    target_polys[k] = np.reshape(target["poly_norm"], (4, 2))
+            if det_polys is None:
+                det_polys = obb_corners(rect_obbs(det_norm))
+            ious = convex_iou_matrix(target_polys, det_polys)
+
         matched_targets = 0
         best_ious: list[float] = []
-        for target in targets:
-            rect_norm = target.get("rect_norm")
-            if rect_norm is None:
-                continue
+        for target, target_ious in zip(scored_targets, ious):
             tgt_class_id = target.get("class_id")
             tgt_class_name = normalize_name(target.get("class_name")) if target.get("class_name") else ""
-            target_matched = False
-            target_best_iou = 0.0
-
-            for i, box in enumerate(det_xyxy):
-                det_norm = (
-                    float(box[0]) / float(w),
-                    float(box[1]) / float(h),
-                    float(box[2]) / float(w),
-                    float(box[3]) / float(h),
-                )
-                iou = self._bbox_iou(rect_norm, det_norm)
-                target_best_iou = max(target_best_iou, iou)
-                cid = int(det_cls[i]) if i < len(det_cls) else -1
-                dname = normalize_name(det_name_for_cid(cid))
-
-                class_match = False
-                if tgt_class_name:
-                    class_match = dname == tgt_class_name
-                elif tgt_class_id is not None:
-                    class_match = cid == int(tgt_class_id)
-
-                pos_match = iou >= iou_thr
-                if mode == "class" and class_match:
-                    target_matched = True
-                    break
-                if mode == "position" and pos_match:
-                    target_matched = True
-                    break
-                if mode == "both" and class_match and pos_match:
-                    target_matched = True
-                    break
-
-            best_ious.append(target_best_iou)
+            if tgt_class_name:
+                class_match = det_names == tgt_class_name
+            elif tgt_class_id is not None:
+                class_match = det_cids_arr == int(tgt_class_id)
+            else:
+                class_match = np.zeros(len(det_cids), dtype=bool)
+            pos_match = target_ious >= iou_thr
+            if mode == "class":
+                target_hits = class_match
+            elif mode == "position":
+                target_hits = pos_match
+            elif mode == "both":
+                target_hits = class_match & pos_match
+            else:
+                target_hits = np.zeros(len(det_cids), dtype=bool)
+
+            target_matched = bool(target_hits.any())
+            # Like the sequential scan this replaced, the best IoU only counts detections up to the first match.
+            scanned = int(target_hits.argmax()) + 1 if target_matched else len(target_ious)
+            best_ious.append(float(target_ious[:scanned].max()) if scanned else 0.0)
             if target_matched:
                 matched_targets += 1
 
@@ -4907,7 +5258,7 @@ class GeckoAI:
     def return_to_source_select(self, e: Any = None) -> None:
         if self.project_root and self.image_files:
             try:
-                self.save_current()
+                self.save_current(wait=True)
             except Exception:
                 self.logger.exception("Failed to save before returning to source selector")
         mode = getattr(self, "_startup_mode", "chooser")
@@ -5091,12 +5442,330 @@ class GeckoAI:
 
         return None
 
+    def _open_label_journal(self) -> None:
+        """Journal label writes on local disk and replay what a crashed run left there.
+
+        The journal is fsynced on every save, so it stays off the share.
+        """
+        journal_path = project_state_path(
+            self.project_state_dir, self.project_root, self.config.label_journal_file_name
+        )
+        replayed = self.label_writer.open_journal(journal_path, timeout=30.0)
+        if replayed:
+            self.logger.warning("Replaying %d unsaved label write(s) from the journal", replayed)
+
+    def _reset_history_store(self) -> None:
+        """Start a per-project undo history store, optionally spilling to local disk."""
+        self._stash_current_history()
+        self.history_store.close()
+        spill_path = None
+        if self.project_root and self.config.undo_history_spill:
+            spill_path = project_state_path(self.project_state_dir, self.project_root, HISTORY_FILE_NAME)
+        self.history_store = HistoryStore(
+            self.config.undo_history_cache_mb * 1024 * 1024, spill_path=spill_path, logger=self.logger
+        )
+
+    def _stash_current_history(self) -> None:
+        """Hand the current image's undo stacks to history_store, if they match what was saved."""
+        saved, self._saved_label_state = self._saved_label_state, None
+        if saved is None:
+            return
+        image_path, label_path, fingerprint, rects_fingerprint, width, height = saved
+        if image_path != self._loaded_image_path or rects_fingerprint != _rects_fingerprint(self.rects, width, height):
+            # Edited since the last save; the saved fingerprint would not describe these stacks.
+            self.history_store.discard(label_path)
+            return
+        self.history_store.stash(label_path, fingerprint, self.history_manager)
+
+    def _reset_project_index(self) -> None:
+        if self.project_index is not None:
+            self.project_index.close()
+            self.project_index = None
+        self.stats_engine = None
+        if hasattr(self, "lbl_dataset_stats"):
+            self.lbl_dataset_stats.config(text=LANG_MAP[self.lang]["stats_empty"])
+        if not self.project_root:
+            return
+        try:
+            self.project_index = ProjectIndex(self.project_root)
+        except sqlite3.Error:
+            # Read-only or unsupported share: fall back to directory listings.
+            self.logger.exception("Project index unavailable for %s", self.project_root)
+
+    def refresh_dataset_stats(self) -> None:
+        """Recompute dataset-wide label statistics on a worker thread."""
+        if self._stats_running or not self.project_root:
+            return
+        project_root = self.project_root
+        if self.stats_engine is None:
+            # Cached on local disk: in flat projects the project root is the image folder.
+            self.stats_engine = DatasetStatsEngine(
+                project_state_path(self.project_state_dir, project_root, STATS_CACHE_FILE_NAME)
+            )
+        splits = [FLAT_SPLIT] if self._flat_project else self._existing_image_splits(project_root)
+        split_dirs = [self._index_split_dirs(project_root, split) for split in splits]
+        engine = self.stats_engine
+        # Labels still queued for writing would be read stale by the worker.
+        self.flush_label_writes()
+        self._stats_running = True
+        self.lbl_dataset_stats.config(text=LANG_MAP[self.lang]["stats_running"])
+
+        def worker() -> None:
+            try:
+                entries = [entry for dirs in split_dirs for entry in scan_split(*dirs)]
+                stats = engine.compute(entries)
+                try:
+                    engine.save()
+                except OSError:
+                    self.logger.warning("Could not save statistics cache for %s", project_root)
+                self.stats_queue.put(("done", project_root, stats))
+            except Exception as exc:
+                self.logger.exception("Dataset statistics failed")
+                self.stats_queue.put(("error", project_root, str(exc)))
+
+        threading.Thread(target=worker, name="dataset-stats", daemon=True).start()
+        self.root.after(100, self._poll_stats_queue)
+
+    def _poll_stats_queue(self) -> None:
+        try:
+            kind, project_root, payload = self.stats_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(100, self._poll_stats_queue)
+            return
+        self._stats_running = False
+        if project_root != self.project_root:
+            return
+        if kind == "error":
+            text = LANG_MAP[self.lang]["stats_failed"].format(err=payload)
+        else:
+            text = self._format_dataset_stats(payload)
+            self.logger.info(
+                "Dataset statistics: %d images, %d boxes, %d file(s) parsed, %d reused",
+                payload.image_count,
+                payload.box_count,
+                payload.parsed_files,
+                payload.reused_files,
+            )
+        self.lbl_dataset_stats.config(text=text)
+        self._refresh_sidebar_scrollregion()
+
+    def _format_dataset_stats(self, stats: DatasetStats) -> str:
+        if not stats.image_count:
+            return LANG_MAP[self.lang]["no_img"]
+        lines = [
+            f"Images   {stats.image_count} ({stats.labeled_count} labeled)",
+            f"Boxes    {stats.box_count} ({stats.box_count / stats.image_count:.1f} / image)",
+        ]
+        busiest = len(stats.boxes_per_image) - 1
+        if busiest > 0:
+            lines.append(f"Max/img  {busiest}, empty {int(stats.boxes_per_image[0])}")
+        for class_id, count in sorted(stats.class_counts.items(), key=lambda item: -item[1]):
+            name = self.class_names[class_id] if 0 <= class_id < len(self.class_names) else f"#{class_id}"
+            lines.append(f"  {name}: {count}")
+        if stats.width_percentiles:
+            w5, w50, w95 = stats.width_percentiles
+            h5, h50, h95 = stats.height_percentiles
+            a5, a50, a95 = stats.aspect_percentiles
+            lines.append(f"W p5/50/95  {w5:.3f} {w50:.3f} {w95:.3f}")
+            lines.append(f"H p5/50/95  {h5:.3f} {h50:.3f} {h95:.3f}")
+            lines.append(f"W/H p5/50/95  {a5:.2f} {a50:.2f} {a95:.2f}")
+        if stats.out_of_bounds:
+            lines.append(f"Out of bounds  {stats.out_of_bounds} box(es)")
+            lines.extend(f"  {os.path.basename(path)}" for path in stats.out_of_bounds_files[:5])
+        if stats.malformed_lines:
+            lines.append(f"Malformed lines  {stats.malformed_lines}")
+        return "\n".join(lines)
+
+    def find_near_duplicate_images(self) -> None:
+        """Hash every image of every split in a process pool and list near-identical groups."""
+        if self._dedup_running or not self.project_root:
+            return
+        project_root = self.project_root
+        splits = [FLAT_SPLIT] if self._flat_project else self._existing_image_splits(project_root)
+        hashes: dict[tuple[str, str], int] = {}
+        missing: list[tuple[str, str]] = []
+        for split in splits:
+            index = self._refreshed_index(project_root, split)
+            cached = index.image_hashes(split) if index is not None else {}
+            for path in self._list_split_images_for_root(project_root, split):
+                value = cached.get(os.path.basename(path))
+                if value is None:
+                    missing.append((split, path))
+                else:
+                    hashes[(split, path)] = value
+        max_distance = self.config.near_duplicate_max_distance
+        max_workers = self.config.hash_workers or None
+        self._dedup_running = True
+        self.logger.info("Near-duplicate scan: %d cached hash(es), %d to compute", len(hashes), len(missing))
+
+        win = tk.Toplevel(self.root)
+        win.title(LANG_MAP[self.lang]["dedup_title"])
+        win.geometry("560x460")
+        win.configure(bg=COLORS["bg_light"])
+        status = tk.Label(
+            win,
+            text=LANG_MAP[self.lang]["dedup_running"].format(count=len(missing)),
+            font=self.font_primary,
+            fg=COLORS["text_secondary"],
+            bg=COLORS["bg_light"],
+            anchor="w",
+        )
+        status.pack(fill="x", padx=16, pady=(16, 8))
+
+        def worker() -> None:
+            try:
+                def progress(done: int, total: int) -> None:
+                    self.dedup_queue.put(("progress", done, total))
+
+                computed = hash_images([path for _, path in missing], max_workers=max_workers, on_progress=progress)
+                new_hashes = {item: computed[item[1]] for item in missing if item[1] in computed}
+                groups = find_near_duplicates({**hashes, **new_hashes}, max_distance)
+                self.dedup_queue.put(("done", project_root, new_hashes, groups))
+            except Exception as exc:
+                self.logger.exception("Near-duplicate scan failed")
+                self.dedup_queue.put(("error", project_root, str(exc)))
+
+        threading.Thread(target=worker, name="near-duplicates", daemon=True).start()
+        self.root.after(100, lambda: self._poll_dedup_queue(win, status))
+
+    def _poll_dedup_queue(self, win: tk.Toplevel, status: tk.Label) -> None:
+        while True:
+            try:
+                event = self.dedup_queue.get_nowait()
+            except queue.Empty:
+                self.root.after(100, lambda: self._poll_dedup_queue(win, status))
+                return
+            if event[0] != "progress":
+                break
+            if win.winfo_exists():
+                status.config(text=LANG_MAP[self.lang]["dedup_progress"].format(done=event[1], total=event[2]))
+        self._dedup_running = False
+        kind, project_root = event[0], event[1]
+        if kind == "error":
+            if win.winfo_exists():
+                status.config(text=LANG_MAP[self.lang]["dedup_failed"].format(err=event[2]))
+            return
+        new_hashes, groups = event[2], event[3]
+        if project_root == self.project_root and self.project_index is not None and new_hashes:
+            by_split: dict[str, dict[str, int]] = {}
+            for (split, path), value in new_hashes.items():
+                by_split.setdefault(split, {})[os.path.basename(path)] = value
+            try:
+                for split, split_hashes in by_split.items():
+                    self.project_index.record_hashes(split, split_hashes)
+            except sqlite3.Error:
+                self.logger.exception("Failed to cache image hashes")
+        if not win.winfo_exists() or project_root != self.project_root:
+            return
+        self._show_near_duplicate_groups(win, status, groups)
+
+    def _show_near_duplicate_groups(
+        self, win: tk.Toplevel, status: tk.Label, groups: list[list[tuple[str, str]]]
+    ) -> None:
+        if not groups:
+            status.config(text=LANG_MAP[self.lang]["dedup_none"])
+            return
+        status.config(
+            text=LANG_MAP[self.lang]["dedup_summary"].format(
+                groups=len(groups), images=sum(len(group) for group in groups)
+            )
+        )
+        list_wrap = tk.Frame(win, bg=COLORS["bg_light"])
+        list_wrap.pack(fill="both", expand=True, padx=16, pady=(0, 8))
+        lb = tk.Listbox(list_wrap, font=self.font_mono, activestyle="none", selectmode="browse")
+        lb.pack(side="left", fill="both", expand=True)
+        sb = ttk.Scrollbar(list_wrap, orient="vertical", command=lb.yview)
+        sb.pack(side="right", fill="y")
+        lb.config(yscrollcommand=sb.set)
+
+        # One entry per listbox line; group headers map to None.
+        rows: list[tuple[str, str] | None] = []
+        for number, group in enumerate(groups, start=1):
+            lb.insert("end", f"#{number} ({len(group)})")
+            rows.append(None)
+            for split, path in group:
+                prefix = "" if split == FLAT_SPLIT else f"{split}/"
+                lb.insert("end", f"    {prefix}{os.path.basename(path)}")
+                rows.append((split, path))
+
+        def selected() -> tuple[int, tuple[str, str]] | None:
+            sel = lb.curselection()
+            if not sel or rows[sel[0]] is None:
+                return None
+            return sel[0], rows[sel[0]]
+
+        def do_open(_e=None) -> None:
+            choice = selected()
+            if choice is not None:
+                self._open_image_in_split(*choice[1])
+
+        def do_remove() -> None:
+            choice = selected()
+            if choice is None or not self._open_image_in_split(*choice[1]):
+                return
+            self.remove_current_from_split()
+            if not os.path.exists(choice[1][1]) and win.winfo_exists():
+                lb.delete(choice[0])
+                del rows[choice[0]]
+
+        lb.bind("<Double-Button-1>", do_open)
+        self.create_primary_button(
+            win,
+            text=LANG_MAP[self.lang]["dedup_remove"],
+            command=do_remove,
+            bg=COLORS["danger"],
+        ).pack(fill="x", padx=16, pady=(0, 16))
+
+    def _open_image_in_split(self, split: str, image_path: str) -> bool:
+        """Show ``image_path``, switching to ``split`` first if needed."""
+        if split != self._current_index_split():
+            self.save_current()
+            self.current_split = split
+            try:
+                self.combo_split.set(split)
+            except tk.TclError:
+                pass
+            self.load_split_data(preferred_image=os.path.basename(image_path))
+        try:
+            idx = self.image_files.index(image_path)
+        except ValueError:
+            return False
+        if idx != self.current_idx:
+            self.save_current()
+            self.current_idx = idx
+            self.load_img()
+        return True
+
+    def _index_split_dirs(self, project_root: str, split: str) -> tuple[str, str]:
+        if split == FLAT_SPLIT:
+            return project_root, f"{project_root}/labels/train"
+        return f"{project_root}/images/{split}", f"{project_root}/labels/{split}"
+
+    def _current_index_split(self) -> str:
+        return FLAT_SPLIT if self._flat_project else self.current_split
+
+    def _refreshed_index(self, project_root: str, split: str) -> ProjectIndex | None:
+        """Return the project index with ``split`` brought up to date, if it covers ``project_root``."""
+        if self.project_index is None or project_root != self.project_root:
+            return None
+        image_dir, label_dir = self._index_split_dirs(project_root, split)
+        try:
+            self.project_index.refresh(split, image_dir, label_dir)
+        except sqlite3.Error:
+            self.logger.exception("Failed to refresh project index for split %s", split)
+            return None
+        return self.project_index
+
     def _list_split_images_for_root(self, project_root: str, split: str) -> list[str]:
-        img_path = f"{project_root}/images/{split}"
-        return sorted([
-            f for f in glob.glob(f"{img_path}/*.*")
-            if f.lower().endswith((".png", ".jpg", ".jpeg"))
-        ])
+        index = self._refreshed_index(project_root, split)
+        if index is not None:
+            return index.image_paths(split)
+        image_dir = self._index_split_dirs(project_root, split)[0]
+        return [f"{image_dir}/{name}" for name in sorted(scan_dir(image_dir, IMAGE_EXTENSIONS))]
+
+    def _scan_split_for_root(self, project_root: str, split: str) -> list[ScanEntry]:
+        """One scandir pass over a split's image and label folders, joined by stem."""
+        return scan_split(*self._index_split_dirs(project_root, split))
 
     def _existing_image_splits(self, project_root: str) -> list[str]:
         splits: list[str] = []
@@ -5131,25 +5800,28 @@ class GeckoAI:
             result["has_labels_folder"] = os.path.isdir(labels_path)
 
             if result["has_images_folder"]:
-                for split in ("train", "val", "test"):
-                    split_path = os.path.join(images_path, split)
-                    if not os.path.isdir(split_path):
-                        continue
-                    files = [
-                        f for f in os.listdir(split_path)
-                        if f.lower().endswith((".png", ".jpg", ".jpeg"))
-                    ]
-                    if files:
-                        result["splits_found"].append(split)
-                        result["images_by_split"][split] = len(files)
-                        result["total_images"] += len(files)
+                # Reuse an existing project index; never create one just to diagnose a folder.
+                index = ProjectIndex(directory) if ProjectIndex.exists(directory) else None
+                try:
+                    for split in ("train", "val", "test"):
+                        split_path = os.path.join(images_path, split)
+                        if not os.path.isdir(split_path):
+                            continue
+                        if index is not None:
+                            index.refresh(split, *self._index_split_dirs(directory.replace("\\", "/"), split))
+                            count = index.count_images(split)
+                        else:
+                            count = len(scan_dir(split_path, IMAGE_EXTENSIONS))
+                        if count:
+                            result["splits_found"].append(split)
+                            result["images_by_split"][split] = count
+                            result["total_images"] += count
+                finally:
+                    if index is not None:
+                        index.close()
                 result["is_yolo_project"] = len(result["splits_found"]) > 0
 
-            root_images = [
-                f for f in os.listdir(directory)
-                if f.lower().endswith((".png", ".jpg", ".jpeg"))
-            ]
-            result["flat_images"] = len(root_images)
+            result["flat_images"] = len(scan_dir(directory, IMAGE_EXTENSIONS))
         except Exception as exc:
             result["errors"].append(str(exc))
         return result
@@ -5182,16 +5854,24 @@ class GeckoAI:
         messagebox.showwarning("Folder Diagnosis", "\n".join(lines), parent=self.root)
 
     def load_images_folder_only(self, directory: str) -> None:
+        self.flush_label_writes()
         self.project_root = directory
+        self._flat_project = True
+        self.split_bitmaps = None
+        self._reset_thumbnail_cache()
+        self._reset_project_index()
+        self._open_label_journal()
+        self._nav_label_state.clear()
+        self._nav_scroll_px = 0
         self.current_split = "train"
         self.combo_split.set(self.current_split)
 
-        self.image_files = sorted([
-            f for f in glob.glob(f"{self.project_root}/*.*")
-            if f.lower().endswith((".png", ".jpg", ".jpeg"))
-        ])
-
         os.makedirs(f"{self.project_root}/labels/{self.current_split}", exist_ok=True)
+        index = self._refreshed_index(self.project_root, FLAT_SPLIT)
+        if index is not None:
+            self.image_files = index.image_paths(FLAT_SPLIT)
+        else:
+            self.image_files = self._list_split_images_for_root(self.project_root, FLAT_SPLIT)
 
         if not self.image_files:
             messagebox.showinfo(
@@ -5199,69 +5879,135 @@ class GeckoAI:
                 LANG_MAP[self.lang]["no_img"],
             )
             self.current_idx = 0
-            self.img_pil = None
-            self.img_tk = None
+            self._release_display_image()
             self.rects = []
             self.update_info_text()
+            self.refresh_image_navigator()
             self.render()
             self.save_session_state()
             return
 
         self.current_idx = 0
         self.load_img()
+        self._start_fs_watcher()
 
     def on_app_close(self) -> None:
         self._stop_detect_stream()
+        self._stop_fs_watcher()
+        self.image_prefetcher.shutdown()
+        if self.thumb_cache is not None:
+            self.thumb_cache.shutdown()
         try:
             self.save_current()
+            self._stash_current_history()
         except Exception:
             self.logger.exception("Failed while saving on close")
+        self.history_store.close()
+        if not self.label_writer.close(timeout=30.0):
+            self.logger.error("Label writes still pending at close; they stay in the journal")
         if self.training_process is not None and self.training_process.poll() is None:
             try:
                 self.training_process.terminate()
             except Exception:
                 self.logger.exception("Failed to terminate training process on close")
-        if self.img_pil is not None:
-            self.img_pil.close()
-            self.img_pil = None
+        self._release_display_image()
+        self.render_scheduler.cancel()
+        if self._gesture_after_id is not None:
+            self.root.after_cancel(self._gesture_after_id)
+            self._gesture_after_id = None
+        self.logger.info("Render stats: %s", self.render_scheduler.stats())
+        if self.perf.trace_logger is not None:
+            self.perf.trace("summary", **self.perf.snapshot())
+            close_trace_logging()
         self.save_session_state()
+        self.session_writer.flush()
+        if self.project_index is not None:
+            self.project_index.close()
         self.root.destroy()
 
+    def _release_display_image(self) -> None:
+        """Drop the current image and everything derived from it."""
+        if self.img_pyramid is not None:
+            self.img_pyramid.close()
+            self.img_pyramid = None
+        # A decoded display image is owned by image_cache and may be shown again; only the
+        # full-resolution handle behind a proxy belongs to us.
+        if self._img_is_proxy and self.img_pil is not None:
+            self.img_pil.close()
+        self._img_is_proxy = False
+        self.img_pil = None
+        self.img_tk = None
+        self.viewport_renderer.invalidate()
+
+    def request_render(self) -> None:
+        """Schedule a coalesced redraw for the next frame."""
+        self.render_scheduler.request()
+
+    def _load_full_resolution(self) -> None:
+        """Decode the full-resolution image once the view zooms past the display proxy."""
+        with self.perf.timer("full_res_decode"):
+            self.img_pil.load()
+        self._img_is_proxy = False
+        self.img_pyramid.close()
+        self.img_pyramid = ImagePyramid(self.img_pil)
+        self.viewport_renderer.invalidate()
+
+    @_timed("frame")
     def render(self) -> None:
         """Redraw canvas image, boxes, guides, and overlays."""
-        self.canvas.delete("all")
-        self._cursor_line_x = None
-        self._cursor_line_y = None
-        self._cursor_text_id = None
-        self._cursor_bg_id = None
-
+        scene = self.canvas_scene
         if not self.img_pil:
+            scene.clear()
             return
-        
-        # 1. Draw current image
-        w = int(self.img_pil.width * self.scale)
-        h = int(self.img_pil.height * self.scale)
-        self.img_tk = ImageTk.PhotoImage(
-            self.img_pil.resize((w, h), Image.Resampling.NEAREST)
-        )
-        self.canvas.create_image(
-            self.offset_x,
-            self.offset_y,
-            image=self.img_tk,
-            anchor="nw"
-        )
+        if (
+            self._img_is_proxy
+            and not self.img_pyramid.covers_scale(self.scale)
+            and self.img_pil.filename not in self._full_res_failed
+        ):
+            try:
+                self._load_full_resolution()
+            except Exception:
+                self._full_res_failed.add(self.img_pil.filename)
+                self.logger.exception(
+                    "Failed to decode full-resolution image; keeping the proxy: %s", self.img_pil.filename
+                )
+
+        scene.begin_frame()
+
+        # 1. Draw current image (only the visible region, reusing the last tile when possible)
+        source, level_factor = self.img_pil, 1.0
+        if self.img_pyramid is not None:
+            source, level_factor = self.img_pyramid.level_for_scale(self.scale)
+        level_scale = self.scale / level_factor
+        with self.perf.timer("resample"):
+            tile, tile_image, reused = self.viewport_renderer.render(
+                source,
+                level_scale,
+                self.offset_x,
+                self.offset_y,
+                self.canvas.winfo_width(),
+                self.canvas.winfo_height(),
+                Image.Resampling.NEAREST if level_scale >= 1.0 else Image.Resampling.BILINEAR,
+            )
+        if tile is not None:
+            if not reused or self.img_tk is None:
+                self.img_tk = ImageTk.PhotoImage(tile_image)
+            tile_x, tile_y = tile.dest_origin(self.offset_x, self.offset_y)
+            scene.put(("image",), "image", (tile_x, tile_y), "image", image=self.img_tk, anchor="nw")
 
         # Optional ghost overlay from last viewed image labels.
         if self.var_show_prev_labels.get() and self._prev_image_rects:
             ghost_color = "#A8B0BA"
-            for rect in self._prev_image_rects:
-                corners = self.get_rotated_corners(rect)
-                canvas_points: list[float] = []
-                for px, py in corners:
-                    cxp, cyp = self.img_to_canvas(px, py)
-                    canvas_points.extend([cxp, cyp])
-                self.canvas.create_polygon(
+            ghost_store = self.prev_rect_store.sync(self._prev_image_rects)
+            ghost_points = points_to_canvas(
+                ghost_store.rotated_corners(), self.scale, self.offset_x, self.offset_y
+            ).reshape(-1, 8)
+            for i, canvas_points in enumerate(ghost_points.tolist()):
+                scene.put(
+                    ("ghost", i),
+                    "polygon",
                     canvas_points,
+                    "ghost",
                     outline=ghost_color,
                     width=1,
                     fill="",
@@ -5273,51 +6019,50 @@ class GeckoAI:
             COLORS["box_1"], COLORS["box_2"], COLORS["box_3"],
             COLORS["box_4"], COLORS["box_5"], COLORS["box_6"]
         ]
+
+        # All per-box geometry for this frame is computed in one vectorized pass.
+        store = self.rect_store.sync(self.rects)
+        box_points = points_to_canvas(
+            store.rotated_corners(), self.scale, self.offset_x, self.offset_y
+        ).reshape(-1, 8)
+        center_points = points_to_canvas(store.centers(), self.scale, self.offset_x, self.offset_y)
+        heading_points = points_to_canvas(store.heading_points(), self.scale, self.offset_x, self.offset_y)
+        label_xs = box_points[:, 0::2].min(axis=1).tolist() if len(store) else []
+        label_ys = box_points[:, 1::2].min(axis=1).tolist() if len(store) else []
+        angles = store.angles.tolist()
+        class_ids = store.class_ids.tolist()
+        heading_lines = np.concatenate((center_points, heading_points), axis=1).tolist()
         
         selected_set = set(self._get_selected_indices())
-        for i, rect in enumerate(self.rects):
-            x1, y1 = self.img_to_canvas(rect[0], rect[1])
-            x2, y2 = self.img_to_canvas(rect[2], rect[3])
-            corners = self.get_rotated_corners(rect)
-            canvas_points: list[float] = []
-            for px, py in corners:
-                cxp, cyp = self.img_to_canvas(px, py)
-                canvas_points.extend([cxp, cyp])
-            
+        for i, canvas_points in enumerate(box_points.tolist()):
+            rect = self.rects[i]
             is_selected = i in selected_set
-            class_id = int(rect[4])
+            class_id = class_ids[i]
             color = COLORS["box_selected"] if is_selected else box_colors[class_id % len(box_colors)]
             width = 3 if is_selected else 2
             
             # Draw rotated bounding polygon
-            self.canvas.create_polygon(
-                canvas_points,
-                outline=color,
-                width=width,
-                fill=""
-            )
+            scene.put(("box", i), "polygon", canvas_points, "box", outline=color, width=width, fill="")
 
             # Heading line helps visualizing orientation.
-            angle_deg = self.get_rect_angle_deg(rect)
+            angle_deg = angles[i]
             if abs(angle_deg) > 1e-3:
-                cx_mid = (rect[0] + rect[2]) / 2
-                cy_mid = (rect[1] + rect[3]) / 2
-                xh = (rect[0] + rect[2]) / 2
-                yh = min(rect[1], rect[3])
-                pxh, pyh = self.rotate_point_around_center(xh, yh, cx_mid, cy_mid, angle_deg)
-                cxc, cyc = self.img_to_canvas(cx_mid, cy_mid)
-                cxx, cyy = self.img_to_canvas(pxh, pyh)
-                self.canvas.create_line(cxc, cyc, cxx, cyy, fill=color, width=2)
+                scene.put(("heading", i), "line", heading_lines[i], "box", fill=color, width=2)
             
             # Draw handles/rotation knob when single-selected
             if is_selected and self.selected_idx == i and len(selected_set) == 1:
-                for hx, hy in self.get_handles(rect):
+                for h_idx, (hx, hy) in enumerate(self.get_handles(rect)):
                     cx, cy = self.img_to_canvas(hx, hy)
-                    self.canvas.create_oval(
-                        cx - self.HANDLE_SIZE,
-                        cy - self.HANDLE_SIZE,
-                        cx + self.HANDLE_SIZE,
-                        cy + self.HANDLE_SIZE,
+                    scene.put(
+                        ("handle", h_idx),
+                        "oval",
+                        (
+                            cx - self.HANDLE_SIZE,
+                            cy - self.HANDLE_SIZE,
+                            cx + self.HANDLE_SIZE,
+                            cy + self.HANDLE_SIZE,
+                        ),
+                        "handle",
                         fill=COLORS["bg_white"],
                         outline=color,
                         width=2
@@ -5325,13 +6070,13 @@ class GeckoAI:
                 top_x, top_y, rot_x, rot_y = self.get_rotation_handle_points(rect)
                 ctx, cty = self.img_to_canvas(top_x, top_y)
                 crx, cry = self.img_to_canvas(rot_x, rot_y)
-                self.canvas.create_line(ctx, cty, crx, cry, fill=color, width=2)
+                scene.put(("handle", "stem"), "line", (ctx, cty, crx, cry), "handle", fill=color, width=2)
                 knob_r = self.HANDLE_SIZE + 1
-                self.canvas.create_oval(
-                    crx - knob_r,
-                    cry - knob_r,
-                    crx + knob_r,
-                    cry + knob_r,
+                scene.put(
+                    ("handle", "knob"),
+                    "oval",
+                    (crx - knob_r, cry - knob_r, crx + knob_r, cry + knob_r),
+                    "handle",
                     fill=color,
                     outline=COLORS["bg_white"],
                     width=2,
@@ -5348,57 +6093,122 @@ class GeckoAI:
                     class_name = f"{class_name} ({angle_deg:.1f}簞)"
                 
                 # Position label above top-most point of rotated box
-                min_canvas_y = min(canvas_points[1::2]) if canvas_points else y1
-                min_canvas_x = min(canvas_points[0::2]) if canvas_points else x1
-                label_y = max(min_canvas_y - 24, 8)  # Keep label inside canvas top margin
+                min_canvas_x = label_xs[i]
+                label_y = max(label_ys[i] - 24, 8)  # Keep label inside canvas top margin
                 
-                # Draw text and colored background pill
-                text_id = self.canvas.create_text(
-                    min_canvas_x + 8,
-                    label_y + 4,
+                # Draw text and colored background pill (sized from cached font metrics)
+                text_x = min_canvas_x + 8
+                text_y = label_y + 4
+                scene.put(
+                    ("label", i),
+                    "text",
+                    (text_x, text_y),
+                    "label",
                     text=class_name,
                     fill=COLORS["text_white"],
                     font=self.font_primary,
                     anchor="nw"
                 )
-                
-                bbox = self.canvas.bbox(text_id)
-                if bbox:
-                    padding = 4
-                    bg_id = self.canvas.create_rectangle(
-                        bbox[0] - padding,
-                        bbox[1] - padding,
-                        bbox[2] + padding,
-                        bbox[3] + padding,
-                        fill=color,
-                        outline=""
-                    )
-                    self.canvas.tag_lower(bg_id, text_id)
+                scene.put(
+                    ("label_bg", i),
+                    "rectangle",
+                    self.text_metrics.pill_box(text_x, text_y, class_name, self.font_primary),
+                    "label_bg",
+                    fill=color,
+                    outline="",
+                )
         
         # 3. Draw temporary rectangle while dragging
         if self.temp_rect_coords:
-            cx, cy, ex, ey = self.temp_rect_coords
-            self.canvas.create_rectangle(
-                cx, cy, ex, ey,
+            scene.put(
+                ("overlay", "temp"),
+                "rectangle",
+                self.temp_rect_coords,
+                "overlay",
                 outline=COLORS["primary_light"],
                 width=2,
                 dash=(6, 4)
             )
         if self.select_rect_coords:
-            cx, cy, ex, ey = self.select_rect_coords
-            self.canvas.create_rectangle(
-                cx, cy, ex, ey,
+            scene.put(
+                ("overlay", "select"),
+                "rectangle",
+                self.select_rect_coords,
+                "overlay",
                 outline=COLORS["box_selected"],
                 width=2,
                 dash=(4, 4)
             )
+        if self.show_perf_hud:
+            self._put_perf_hud(scene)
+        scene.end_frame()
+        self.perf.trace("frame", items=len(scene), boxes=len(self.rects), scale=round(self.scale, 4))
         
         # 4. Update cursor overlay
         self.update_cursor_overlay()
+        self.canvas.tag_raise("cursor_overlay")
         
         # Refresh side info labels
         self.update_info_text()
     
+    def _perf_hud_lines(self) -> list[str]:
+        perf = self.perf
+        frames = self.render_scheduler.stats()
+        tiles = self.viewport_renderer
+        metrics = self.text_metrics
+        images = self.image_cache
+        return [
+            f"frame {perf.last_ms('frame'):.1f} ms  avg {perf.avg_ms('frame'):.1f}  max {perf.max_ms('frame'):.1f}",
+            f"resample {perf.last_ms('resample'):.1f} ms  tile hit {hit_rate(tiles.hits, tiles.misses):.0%}",
+            f"items {len(self.canvas_scene)}  boxes {len(self.rects)}  text hit {hit_rate(metrics.hits, metrics.misses):.0%}",
+            f"frames req {frames['requested']}  coalesced {frames['coalesced']}  drawn {frames['rendered']}",
+            f"load_img {perf.last_ms('load_img'):.1f} ms  save {perf.last_ms('save_current'):.1f} ms  queued {self.label_writer.pending_count}",
+            f"image cache {len(images)}  {images.current_bytes / 1e6:.0f} MB  hit {hit_rate(images.hits, images.misses):.0%}",
+            f"undo {self.history_manager.undo_depth}/{self.history_manager.redo_depth}  "
+            f"{self.history_manager.nbytes / 1e3:.0f} KB  kept {len(self.history_store)} "
+            f"{self.history_store.nbytes / 1e6:.1f} MB  spilled {self.history_store.spilled}",
+        ]
+
+    def _put_perf_hud(self, scene: CanvasScene) -> None:
+        lines = self._perf_hud_lines()
+        width = max(self.text_metrics.measure(line, self.font_mono)[0] for line in lines)
+        line_h = self.text_metrics.measure(lines[0], self.font_mono)[1]
+        x, y, pad = 12, 12, 6
+        scene.put(
+            ("hud", "bg"),
+            "rectangle",
+            (x - pad, y - pad, x + width + pad, y + line_h * len(lines) + pad),
+            "hud",
+            fill=COLORS["bg_dark"],
+            outline=COLORS["primary"],
+        )
+        scene.put(
+            ("hud", "text"),
+            "text",
+            (x, y),
+            "hud",
+            text="\n".join(lines),
+            fill=COLORS["text_primary"] if self.theme == "light" else COLORS["text_white"],
+            font=self.font_mono,
+            anchor="nw",
+        )
+
+    def toggle_perf_hud(self, e: Any = None) -> None:
+        self.show_perf_hud = not self.show_perf_hud
+        self.request_render()
+
+    def toggle_perf_trace(self, e: Any = None) -> None:
+        L = LANG_MAP[self.lang]
+        if self.perf.trace_logger is None:
+            self.perf.trace_logger = setup_trace_logging(self.perf_trace_path)
+            self.logger.info("Performance trace enabled: %s", self.perf_trace_path)
+            messagebox.showinfo(L["perf_trace"], L["perf_trace_on"].format(path=self.perf_trace_path))
+        else:
+            self.perf.trace("summary", **self.perf.snapshot())
+            self.perf.trace_logger = None
+            close_trace_logging()
+            messagebox.showinfo(L["perf_trace"], L["perf_trace_off"])
+
     # ==================== Mouse Interaction ====================
     
     def on_mouse_move(self, e: Any) -> None:
@@ -5443,15 +6253,7 @@ class GeckoAI:
             self.canvas.coords(self._cursor_text_id, mx + 12, my - 12)
             self.canvas.itemconfig(self._cursor_text_id, text=coord_text)
 
-        coord_bbox = self.canvas.bbox(self._cursor_text_id)
-        if not coord_bbox:
-            return
-
-        padding = 4
-        bx1 = coord_bbox[0] - padding
-        by1 = coord_bbox[1] - padding
-        bx2 = coord_bbox[2] + padding
-        by2 = coord_bbox[3] + padding
+        bx1, by1, bx2, by2 = self.text_metrics.pill_box(mx + 12, my - 12, coord_text, self.font_mono)
         if self._cursor_bg_id is None:
             self._cursor_bg_id = self.canvas.create_rectangle(
                 bx1,
@@ -5492,14 +6294,14 @@ class GeckoAI:
                 self.rotate_drag_offset_deg = pointer_deg - self.get_rect_angle_deg(active_rect)
                 self.active_rotate_handle = True
                 self.drag_start = (ix, iy)
-                self.push_history()
+                self.history_manager.record_modify(self.rects, [self.selected_idx], merge_key="rotate")
                 return
             for i, (hx, hy) in enumerate(self.get_handles(active_rect)):
                 dist = np.sqrt((ix - hx) ** 2 + (iy - hy) ** 2) * self.scale
                 if dist < self.config.mouse_handle_hit_radius_px:
                     self.active_handle = i
                     self.drag_start = (ix, iy)
-                    self.push_history()
+                    self.history_manager.record_modify(self.rects, [self.selected_idx], merge_key="resize")
                     return
         
         # Check if pointer is inside an existing box
@@ -5526,7 +6328,7 @@ class GeckoAI:
                 self.is_moving_box = True
                 self.drag_start = (ix, iy)
                 self._sync_class_combo_with_selection()
-                self.push_history()
+                self.history_manager.record_modify(self.rects, self._get_selected_indices(), merge_key="move")
         else:
             if is_ctrl_select:
                 self.drag_start = (ix, iy)
@@ -5538,7 +6340,7 @@ class GeckoAI:
                 self.drag_start = (ix, iy)
                 self.temp_rect_coords = (e.x, e.y, e.x, e.y)
         
-        self.render()
+        self.request_render()
 
     def on_mouse_down_right(self, e):
         """Right button starts drawing a new box directly."""
@@ -5563,14 +6365,14 @@ class GeckoAI:
         self.is_moving_box = False
         self.drag_start = (ix, iy)
         self.temp_rect_coords = (e.x, e.y, e.x, e.y)
-        self.render()
+        self.request_render()
     
     def on_mouse_drag(self, e):
         """Handle drag: resize, move, rotate, or draw selection box."""
         self.mouse_pos = (e.x, e.y)
         
         if not self.img_pil or not self.drag_start:
-            self.render()
+            self.request_render()
             return
         
         ix, iy = self.canvas_to_img(e.x, e.y)
@@ -5586,6 +6388,7 @@ class GeckoAI:
             cy = (rect[1] + rect[3]) / 2
             pointer_deg = math.degrees(math.atan2(iy - cy, ix - cx))
             self.set_rect_angle_deg(rect, pointer_deg - self.rotate_drag_offset_deg)
+            self._refresh_rect_index([self.selected_idx])
         elif self.selected_idx is not None and self.active_handle is not None:
             # Resize selected box by active handle
             rect = self.rects[self.selected_idx]
@@ -5601,6 +6404,7 @@ class GeckoAI:
                 rect[2] = lx
             if self.active_handle in [4, 5, 6]:
                 rect[3] = ly
+            self._refresh_rect_index([self.selected_idx])
         
         elif self.is_moving_box:
             # Move selected box
@@ -5622,6 +6426,7 @@ class GeckoAI:
                     rect[1] += clamped_dy
                     rect[2] += clamped_dx
                     rect[3] += clamped_dy
+                self._refresh_rect_index(selected)
             self.drag_start = (ix, iy)
         elif self.is_drag_selecting:
             if self.select_rect_coords:
@@ -5642,7 +6447,7 @@ class GeckoAI:
                     e.y
                 )
         
-        self.render()
+        self.request_render()
     
     def on_mouse_up(self, e):
         """?????"""
@@ -5657,7 +6462,7 @@ class GeckoAI:
             self.is_drag_selecting = False
             self.select_rect_coords = None
             self.drag_start = None
-            self.render()
+            self.request_render()
             return
 
         if self.temp_rect_coords:
@@ -5672,13 +6477,15 @@ class GeckoAI:
             
             # Keep minimum box size threshold
             if (new_box[2] - new_box[0]) > 2 and (new_box[3] - new_box[1]) > 2:
-                self.push_history()
                 self.rects.append(new_box)
+                self.history_manager.record_add(self.rects, [len(self.rects) - 1])
             
             self.temp_rect_coords = None
         
-        for idx in self._get_selected_indices():
+        clamped_indices = self._get_selected_indices()
+        for idx in clamped_indices:
             self.rects[idx] = self.clamp_box(self.rects[idx])
+        self._refresh_rect_index(clamped_indices)
         
         self.is_moving_box = False
         self.active_handle = None
@@ -5686,7 +6493,7 @@ class GeckoAI:
         self.rotate_drag_offset_deg = 0.0
         self.is_drag_selecting = False
         self.select_rect_coords = None
-        self.render()
+        self.request_render()
 
     def on_mouse_up_right(self, e):
         """Finish right-button box drawing."""
@@ -5699,12 +6506,12 @@ class GeckoAI:
         if prev_idx is None:
             return
         copied = self.clamp_box(copy.deepcopy(self._prev_image_rects[prev_idx]))
-        self.push_history()
         self.rects.append(copied)
         pasted_idx = len(self.rects) - 1
+        self.history_manager.record_add(self.rects, [pasted_idx])
         self._set_selected_indices([pasted_idx], primary_idx=pasted_idx)
         self._sync_class_combo_with_selection()
-        self.render()
+        self.request_render()
     
     def on_zoom(self, e):
         """Zoom image around mouse pointer."""
@@ -5714,7 +6521,61 @@ class GeckoAI:
         self.offset_y = e.y - (e.y - self.offset_y) * factor
         self.scale *= factor
         
-        self.render()
+        if not self.img_pil:
+            return
+        # Gesture mode: scale existing vector items in place and defer the full redraw.
+        self.canvas_scene.scale_layers(GESTURE_VECTOR_LAYERS, e.x, e.y, factor)
+        self._render_gesture_frame()
+
+    def on_pan_start(self, e: Any) -> None:
+        """Middle button starts panning the view."""
+        self._pan_anchor = (e.x, e.y)
+
+    def on_pan_drag(self, e: Any) -> None:
+        if not self.img_pil or self._pan_anchor is None:
+            return
+        dx = e.x - self._pan_anchor[0]
+        dy = e.y - self._pan_anchor[1]
+        self._pan_anchor = (e.x, e.y)
+        self.offset_x += dx
+        self.offset_y += dy
+        self.mouse_pos = (e.x, e.y)
+        self.canvas_scene.move_layers(("image",) + GESTURE_VECTOR_LAYERS, dx, dy)
+        self._render_gesture_frame()
+
+    def on_pan_end(self, e: Any) -> None:
+        self._pan_anchor = None
+
+    def _render_gesture_frame(self) -> None:
+        """Refresh only the bitmap, at low quality, while a pan/zoom gesture is active."""
+        cw, ch = self.canvas.winfo_width(), self.canvas.winfo_height()
+        source, level_factor = self.img_pil, 1.0
+        if self.img_pyramid is not None:
+            source, level_factor = self.img_pyramid.level_for_scale(self.scale)
+        level_scale = self.scale / level_factor
+        if not self.viewport_renderer.can_reuse(source, level_scale, self.offset_x, self.offset_y, cw, ch):
+            # One pyramid level coarser than the final frame, nearest-neighbour sampled.
+            if self.img_pyramid is not None:
+                source, level_factor = self.img_pyramid.level_for_scale(self.scale / 2.0)
+            level_scale = self.scale / level_factor
+        tile, tile_image, reused = self.viewport_renderer.render(
+            source, level_scale, self.offset_x, self.offset_y, cw, ch, Image.Resampling.NEAREST
+        )
+        if tile is not None:
+            if not reused or self.img_tk is None:
+                self.img_tk = ImageTk.PhotoImage(tile_image)
+            tile_x, tile_y = tile.dest_origin(self.offset_x, self.offset_y)
+            self.canvas_scene.put(("image",), "image", (tile_x, tile_y), "image", image=self.img_tk, anchor="nw")
+            self.canvas.tag_lower("image")
+        self.update_cursor_overlay()
+        if self._gesture_after_id is not None:
+            self.root.after_cancel(self._gesture_after_id)
+        self._gesture_after_id = self.root.after(self.config.gesture_settle_ms, self._end_view_gesture)
+
+    def _end_view_gesture(self) -> None:
+        """Gesture went idle: do one full-quality redraw."""
+        self._gesture_after_id = None
+        self.request_render()
     
     # ==================== Class Operations ====================
     
@@ -5727,20 +6588,23 @@ class GeckoAI:
         if new_cid < 0:
             return
         if any(self.rects[idx][4] != new_cid for idx in selected):
-            self.push_history()
+            self.history_manager.record_modify(self.rects, selected)
             for idx in selected:
                 self.rects[idx][4] = new_cid
-            self.render()
+            self.rect_store.update_rows(self.rects, selected)
+            self.request_render()
 
     def rotate_selected_boxes(self, delta_deg: float) -> None:
         selected = self._get_selected_indices()
         if not selected:
             return
-        self.push_history()
+        # Holding the rotate key repeats this; the steps merge into one undo entry.
+        self.history_manager.record_modify(self.rects, selected, merge_key="rotate")
         for idx in selected:
             rect = self.rects[idx]
             self.set_rect_angle_deg(rect, self.get_rect_angle_deg(rect) + delta_deg)
-        self.render()
+        self._refresh_rect_index(selected)
+        self.request_render()
     
     def edit_classes_table(self):
         """Open class table editor dialog."""
@@ -5820,7 +6684,9 @@ class GeckoAI:
                 if cid > del_idx:
                     rect[4] = cid - 1
                 remapped_rects.append(rect)
-            self.rects = remapped_rects
+            # In place, so the snapshot taken above still refers to the live list.
+            self.rects[:] = remapped_rects
+            self._invalidate_rects()
 
             self.class_names.pop(del_idx)
             refresh()
@@ -5961,9 +6827,10 @@ class GeckoAI:
                 win.destroy()
                 return
 
-            self.push_history()
+            self.history_manager.record_modify(self.rects, selected)
             for idx in selected:
                 self.rects[idx][4] = to_idx
+            self.rect_store.update_rows(self.rects, selected)
             self.combo_cls.current(to_idx)
             self.render()
             win.destroy()
@@ -6036,10 +6903,19 @@ class GeckoAI:
         image_path = self.image_files[self.current_idx]
         image_name = os.path.basename(image_path)
         base = os.path.splitext(image_name)[0]
+        # A full-resolution handle behind a display proxy keeps the file open.
+        held_open = self._img_is_proxy
+        if held_open:
+            self.save_current()
+            self._release_display_image()
+        self.flush_label_writes()
 
         try:
             moved_image_path = self._build_removed_path("images", image_path)
             shutil.move(image_path, moved_image_path)
+            self.image_cache.discard(image_path)
+            if self.project_index is not None:
+                self.project_index.remove_image(self._current_index_split(), image_name)
             label_dir = os.path.join(self.project_root, "labels", self.current_split)
             for ext in (".txt", ".json"):
                 label_path = os.path.join(label_dir, f"{base}{ext}")
@@ -6053,17 +6929,20 @@ class GeckoAI:
                             shutil.move(rot_path, moved_rot_path)
         except Exception as e:
             messagebox.showerror("Error", str(e))
+            if held_open:
+                self.load_img()
             return
 
         del self.image_files[self.current_idx]
+        if self.split_bitmaps is not None and len(self.split_bitmaps) == len(self.image_files) + 1:
+            self.split_bitmaps.remove(self.current_idx)
         if self.current_idx >= len(self.image_files):
             self.current_idx = max(0, len(self.image_files) - 1)
 
         if self.image_files:
             self.load_img()
         else:
-            self.img_pil = None
-            self.img_tk = None
+            self._release_display_image()
             self.rects = []
             self.history_manager.clear()
             self.selected_idx = None
@@ -6167,7 +7046,7 @@ class GeckoAI:
         os.makedirs(split_lbl_dir, exist_ok=True)
 
         if self.image_files and self.img_pil:
-            self.save_current()
+            self.save_current(wait=True)
 
         try:
             shutil.move(removed_img_path, target_img_path)
@@ -6196,6 +7075,24 @@ class GeckoAI:
         msg = LANG_MAP[self.lang].get("restore_done", "Restored: {name}").format(name=os.path.basename(target_img_path))
         messagebox.showinfo(LANG_MAP[self.lang]["title"], msg)
 
+    def _open_display_image(self, path: str) -> None:
+        """Set img_pil and img_pyramid for ``path``, through the decoded-image cache."""
+        display = self.image_prefetcher.get(path)
+        if display is None:
+            display = decode_display_image(path, self.config.display_proxy_max_side)
+            self.image_cache.put(path, display)
+        full = Image.open(path)
+        if full.size == display.size:
+            full.close()
+            self.img_pil = display
+        else:
+            # Keep the header-only full-resolution handle so widths, heights and label
+            # coordinates stay in full-resolution space; pixels are decoded on demand.
+            self.img_pil = full
+            self._img_is_proxy = True
+        self.img_pyramid = ImagePyramid(display, full_size=full.size)
+
+    @_timed("load_img")
     def load_img(self) -> None:
         """????????"""
         if not self.image_files:
@@ -6203,12 +7100,13 @@ class GeckoAI:
         
         path = self.image_files[self.current_idx]
         prev_path = self._loaded_image_path
+        self._detect_skipped = 0
         self.update_info_text()
-        if self.img_pil is not None:
-            self.img_pil.close()
-            self.img_pil = None
+        # Only navigation scrolls the filmstrip to the current image; renders leave it alone.
+        self.refresh_image_navigator(reveal_current=True)
+        self._release_display_image()
         try:
-            self.img_pil = Image.open(path)
+            self._open_display_image(path)
         except Exception:
             self.logger.exception("Failed to load image: %s", path)
             messagebox.showerror("Error", f"Failed to open image:\n{path}")
@@ -6219,6 +7117,7 @@ class GeckoAI:
             self._prev_image_rects = copy.deepcopy(prev_rects)
         prev_selected_indices = self._get_selected_indices()
         prev_selected_rects = [copy.deepcopy(self.rects[idx]) for idx in prev_selected_indices if 0 <= idx < len(self.rects)]
+        self._stash_current_history()
         self.rects = []
         self.history_manager.clear()
         self.selected_idx = None
@@ -6237,7 +7136,12 @@ class GeckoAI:
         label_path = f"{self.project_root}/labels/{self.current_split}/{base}.txt"
         rot_meta_path = self._rotation_meta_path_for_label(label_path)
         
-        label_exists = os.path.exists(label_path) and os.path.getsize(label_path) > 0
+        # A save still queued in the label writer is newer than the file on disk.
+        pending_write = self.label_writer.lookup(label_path)
+        if pending_write is not None:
+            label_exists = bool(pending_write.content)
+        else:
+            label_exists = os.path.exists(label_path) and os.path.getsize(label_path) > 0
         propagate_mode = self.var_propagate_mode.get()
         should_propagate = False
         if self.var_propagate.get():
@@ -6247,31 +7151,22 @@ class GeckoAI:
                 should_propagate = True
 
         loaded_rects: list[list[float]] = []
+        label_text = ""
         if label_exists:
             W, H = self.img_pil.width, self.img_pil.height
-            has_inline_angle = False
             try:
-                with open(label_path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        parts = line.split()
-                        if len(parts) == 9:
-                            c = int(float(parts[0]))
-                            pts_norm = list(map(float, parts[1:9]))
-                            loaded_rects.append(self.obb_norm_to_rect(pts_norm, W, H, c))
-                        elif len(parts) >= 5:
-                            c, cx, cy, w, h = map(float, parts[:5])
-                            angle_deg = float(parts[5]) if len(parts) >= 6 else 0.0
-                            has_inline_angle = has_inline_angle or len(parts) >= 6
-                            loaded_rects.append([
-                                (cx - w / 2) * W,
-                                (cy - h / 2) * H,
-                                (cx + w / 2) * W,
-                                (cy + h / 2) * H,
-                                int(c),
-                                self.normalize_angle_deg(angle_deg),
-                            ])
+                if pending_write is not None:
+                    label_text = pending_write.content
+                else:
+                    with open(label_path, 'r', encoding='utf-8') as f:
+                        label_text = f.read()
+                label_store, has_inline_angle = RectStore.from_yolo_text(label_text, W, H)
+                loaded_rects = label_store.to_rects()
                 if loaded_rects and not has_inline_angle:
-                    loaded_angles = self._read_rotation_meta_angles(rot_meta_path)
+                    if pending_write is not None:
+                        loaded_angles = pending_write.angles_deg
+                    else:
+                        loaded_angles = self._read_rotation_meta_angles(rot_meta_path)
                     if loaded_angles and len(loaded_angles) == len(loaded_rects):
                         for rect, angle in zip(loaded_rects, loaded_angles):
                             self.set_rect_angle_deg(rect, angle)
@@ -6279,8 +7174,11 @@ class GeckoAI:
                 self.logger.exception("Failed to parse label file: %s", label_path)
                 messagebox.showerror("Error", f"Failed to read label file: {label_path}")
                 loaded_rects = []
+                label_text = ""
 
         self.rects = loaded_rects
+        loaded_count = len(loaded_rects)
+        self.history_store.restore(label_path, content_fingerprint(label_text), self.history_manager, self.rects)
 
         if should_propagate:
             source_rects = prev_rects
@@ -6295,17 +7193,38 @@ class GeckoAI:
                 self.rects.extend(propagated_rects)
             elif not label_exists:
                 self.rects = propagated_rects
+        if self.rects is not loaded_rects or len(self.rects) != loaded_count:
+            # Propagated boxes are a new starting point the restored deltas don't know about.
+            self.history_manager.clear()
 
         if not label_exists and not self.rects:
             if self.var_auto_yolo.get():
                 self.run_yolo_detection()
+
+        if self.project_index is not None:
+            index_split, image_name = self._current_index_split(), os.path.basename(path)
+            info = self.project_index.image_info(index_split, image_name)
+            if info is not None and info["width"] is None:
+                self.project_index.record_dimensions(index_split, image_name, self.img_pil.width, self.img_pil.height)
         
         self.fit_image_to_canvas()
         self.save_session_state()
         self._loaded_image_path = path
+        self._prefetch_neighbor_images()
+
+    def _prefetch_neighbor_images(self) -> None:
+        """Decode the next/previous images in the background, nearest first."""
+        radius = self.config.prefetch_radius
+        wanted: list[str] = []
+        for step in range(1, radius + 1):
+            for idx in (self.current_idx + step, self.current_idx - step):
+                if 0 <= idx < len(self.image_files):
+                    wanted.append(self.image_files[idx])
+        self.image_prefetcher.prefetch(wanted)
     
-    def save_current(self) -> None:
-        """?????????"""
+    @_timed("save_current")
+    def save_current(self, wait: bool = False) -> None:
+        """Queue the current labels for writing; ``wait`` blocks until they are on disk."""
         if not self.project_root or not self.img_pil:
             return
         
@@ -6316,41 +7235,48 @@ class GeckoAI:
         label_path = f"{self.project_root}/labels/{self.current_split}/{base}.txt"
         rot_meta_path = self._rotation_meta_path_for_label(label_path)
 
-        lines = []
-        angles_deg: list[float] = []
-        for rect in self.rects:
-            cx = (rect[0] + rect[2]) / 2 / W
-            cy = (rect[1] + rect[3]) / 2 / H
-            w = (rect[2] - rect[0]) / W
-            h = (rect[3] - rect[1]) / H
-            lines.append(f"{int(rect[4])} {cx:.6f} {cy:.6f} {w:.6f} {h:.6f}\n")
-            angles_deg.append(self.get_rect_angle_deg(rect))
-        if not lines:
-            if os.path.exists(label_path):
-                try:
-                    os.remove(label_path)
-                except OSError:
-                    self.logger.exception("Failed to remove empty label file: %s", label_path)
-            if os.path.exists(rot_meta_path):
-                try:
-                    os.remove(rot_meta_path)
-                except OSError:
-                    self.logger.exception("Failed to remove empty rotation meta file: %s", rot_meta_path)
-            return
-        try:
-            atomic_write_text(label_path, "".join(lines))
-            if any(abs(a) > 1e-3 for a in angles_deg):
-                atomic_write_json(rot_meta_path, {"version": 1, "angles_deg": angles_deg})
-            elif os.path.exists(rot_meta_path):
-                os.remove(rot_meta_path)
-        except Exception:
-            self.logger.exception("Failed to save label file: %s", label_path)
-            messagebox.showerror("Error", f"Failed to save label file:\n{label_path}")
-            return
+        store = self.rect_store.sync(self.rects)
+        angles_deg = store.angles.tolist()
+        write = LabelWrite(
+            label_path=label_path,
+            content=store.to_yolo_text(W, H),
+            rot_meta_path=rot_meta_path,
+            angles_deg=angles_deg if any(abs(a) > 1e-3 for a in angles_deg) else None,
+        )
+        self.label_writer.submit(write)
+        self._saved_label_state = (
+            path, label_path, content_fingerprint(write.content), _rects_fingerprint(self.rects, W, H), W, H
+        )
+        if self.split_bitmaps is not None and len(self.split_bitmaps) == len(self.image_files):
+            self.split_bitmaps.set(self.current_idx, write.content)
+        if self.project_index is not None:
+            try:
+                self.project_index.record_label(self._current_index_split(), os.path.basename(path), write.content)
+            except sqlite3.Error:
+                self.logger.exception("Failed to update project index for %s", path)
+        if self._nav_label_state.get(path) != bool(write.content):
+            self._nav_label_state[path] = bool(write.content)
+            self.refresh_image_navigator()
+        if wait:
+            self.flush_label_writes()
+        else:
+            self._report_label_write_errors()
+
+    def flush_label_writes(self) -> None:
+        """Wait for queued label writes; call before anything reads labels from disk."""
+        self.label_writer.flush()
+        self._report_label_write_errors()
+
+    def _report_label_write_errors(self) -> None:
+        errors = self.label_writer.take_errors()
+        if errors:
+            paths = "\n".join(path for path, _ in errors[:5])
+            messagebox.showerror("Error", f"Failed to save label file:\n{paths}")
 
     def _reindex_dataset_labels_after_class_delete(self, deleted_idx: int) -> None:
         if not self.project_root:
             return
+        self.flush_label_writes()
 
         label_files: list[str] = []
         split_roots = [s for s in ("train", "val", "test") if os.path.isdir(f"{self.project_root}/labels/{s}")]
@@ -6404,7 +7330,15 @@ class GeckoAI:
                     self.logger.exception("Failed to remove empty label file: %s", lbl_path)
     
     def load_project_from_path(self, directory, preferred_image=None, save_session=True):
+        self._stop_fs_watcher()
+        self.flush_label_writes()
+        self.session_writer.flush()
         self.project_root = directory.replace('\\', '/')
+        self._flat_project = False
+        self._reset_thumbnail_cache()
+        self._reset_project_index()
+        self._reset_history_store()
+        self._open_label_journal()
         self.ensure_yolo_label_dirs(self.project_root)
 
         progress = self._read_project_progress_yaml(self.project_root)
@@ -6470,6 +7404,12 @@ class GeckoAI:
     
     def load_split_data(self, preferred_image=None):
         """??????"""
+        self.image_prefetcher.cancel()
+        self.split_bitmaps = None
+        self._nav_label_state.clear()
+        self._nav_scroll_px = 0
+        if self.thumb_cache is not None:
+            self.thumb_cache.cancel()
         img_path = f"{self.project_root}/images/{self.current_split}"
 
         if self.project_root and not os.path.exists(img_path):
@@ -6521,34 +7461,183 @@ class GeckoAI:
                 self.load_img()
             else:
                 self.current_idx = 0
-                self.img_pil = None
-                self.img_tk = None
+                self._release_display_image()
                 self.rects = []
                 self.update_info_text()
+                self.refresh_image_navigator()
         else:
             self.image_files = []
             self.current_idx = 0
-            self.img_pil = None
-            self.img_tk = None
+            self._release_display_image()
             self.rects = []
             self.update_info_text()
+            self.refresh_image_navigator()
         
         self.render()
         self.save_session_state()
+        self._start_fs_watcher()
+
+    def _start_fs_watcher(self) -> None:
+        """Watch the current split's folders so files dropped in by other tools show up live."""
+        self._stop_fs_watcher()
+        interval_ms = self.config.fs_watch_interval_ms
+        if not self.project_root or interval_ms <= 0:
+            return
+        image_dir, label_dir = self._index_split_dirs(self.project_root, self._current_index_split())
+        self.fs_watcher = PollingWatcher(image_dir, label_dir, interval_s=interval_ms / 1000.0)
+        self.fs_watcher.start()
+        self._fs_poll_id = self.root.after(interval_ms, self._poll_fs_events)
+
+    def _stop_fs_watcher(self) -> None:
+        if self.fs_watcher is not None:
+            self.fs_watcher.stop()
+            self.fs_watcher = None
+        if self._fs_poll_id is not None:
+            try:
+                self.root.after_cancel(self._fs_poll_id)
+            except Exception:
+                pass
+            self._fs_poll_id = None
+
+    def _poll_fs_events(self) -> None:
+        self._fs_poll_id = None
+        if self.fs_watcher is None:
+            return
+        # Detect mode owns the screen; leave changes queued in the watcher until it ends.
+        if not self._detect_mode_active:
+            events = self.fs_watcher.drain()
+            try:
+                events = self._index_fs_events(events, self.fs_watcher.drained_dir_mtimes)
+                if events:
+                    self._apply_fs_events(events)
+            except Exception:
+                self.logger.exception("Failed to apply file system changes")
+        self._fs_poll_id = self.root.after(self.config.fs_watch_interval_ms, self._poll_fs_events)
+
+    def _split_bitmaps_in_sync(self) -> bool:
+        return self.split_bitmaps is not None and len(self.split_bitmaps) == len(self.image_files)
+
+    def _index_fs_events(
+        self, events: list[FsEvent], dir_mtimes: tuple[DirMtimes, DirMtimes] | None
+    ) -> list[FsEvent]:
+        """Patch the project index from the watcher's scan; return the events not caused by our own saves."""
+        external: list[FsEvent] = []
+        images: dict[str, tuple[int, int] | None] = {}
+        labels: dict[str, tuple[int, int] | None] = {}
+        recorded: set[str] = set()
+        for event in events:
+            name = os.path.basename(event.path)
+            if not event.is_label:
+                images[name] = event.stat
+            elif self.label_writer.lookup(event.path) is not None:
+                # A newer save is still queued; save_current already recorded it everywhere.
+                continue
+            else:
+                labels[name] = event.stat
+                if self.label_writer.wrote(event.path, event.stat):
+                    recorded.add(name)
+                    continue
+            external.append(event)
+        if self.project_index is not None and (events or dir_mtimes is not None):
+            try:
+                self.project_index.apply_changes(
+                    self._current_index_split(), images, labels, dir_mtimes, frozenset(recorded)
+                )
+            except sqlite3.Error:
+                self.logger.exception("Failed to update project index from file system changes")
+        return external
+
+    def _apply_fs_events(self, events: list[FsEvent]) -> None:
+        """Patch image_files, current_idx and the derived caches without a full rescan."""
+        index_split = self._current_index_split()
+        current_path = self.image_files[self.current_idx] if self.image_files else None
+        current_gone = False
+        reload_pixels = False
+        for event in events:
+            if event.is_label:
+                self._apply_label_fs_event(event, index_split)
+                continue
+            pos = bisect.bisect_left(self.image_files, event.path)
+            present = pos < len(self.image_files) and self.image_files[pos] == event.path
+            if event.kind == "added" and not present:
+                in_sync = self._split_bitmaps_in_sync()
+                self.image_files.insert(pos, event.path)
+                if in_sync:
+                    self.split_bitmaps.insert(pos)
+                if current_path is not None and pos <= self.current_idx:
+                    self.current_idx += 1
+            elif event.kind == "removed" and present:
+                in_sync = self._split_bitmaps_in_sync()
+                del self.image_files[pos]
+                if in_sync:
+                    self.split_bitmaps.remove(pos)
+                if pos < self.current_idx:
+                    self.current_idx -= 1
+                elif pos == self.current_idx:
+                    current_gone = True
+                self.image_cache.discard(event.path)
+                self._nav_label_state.pop(event.path, None)
+                if self.thumb_cache is not None:
+                    self.thumb_cache.invalidate(event.path)
+            elif event.kind == "modified" and present:
+                self.image_cache.discard(event.path)
+                self._full_res_failed.discard(event.path)
+                if self.thumb_cache is not None:
+                    self.thumb_cache.invalidate(event.path)
+                reload_pixels = reload_pixels or event.path == current_path
+        self.logger.info("Applied %d file system change(s) to split %s", len(events), self.current_split)
+
+        if current_path is None or current_gone:
+            # The shown image vanished (or the split was empty): show whatever is now at the index.
+            self.current_idx = min(self.current_idx, max(0, len(self.image_files) - 1))
+            if self.image_files:
+                self.load_img()
+            else:
+                self._release_display_image()
+                self.rects = []
+                self.update_info_text()
+                self.refresh_image_navigator()
+                self.render()
+            return
+        if reload_pixels:
+            self._release_display_image()
+            try:
+                self._open_display_image(current_path)
+            except Exception:
+                self.logger.exception("Failed to reload modified image: %s", current_path)
+            self.request_render()
+        self.update_info_text()
+        self.refresh_image_navigator()
+
+    def _apply_label_fs_event(self, event: FsEvent, index_split: str) -> None:
+        stem = os.path.splitext(os.path.basename(event.path))[0]
+        name = self.project_index.image_name_for_stem(index_split, stem) if self.project_index else None
+        if name is None:
+            self.split_bitmaps = None
+            self._nav_label_state.clear()
+            return
+        image_path = f"{self._index_split_dirs(self.project_root, index_split)[0]}/{name}"
+        self._nav_label_state.pop(image_path, None)
+        pos = bisect.bisect_left(self.image_files, image_path)
+        if not (pos < len(self.image_files) and self.image_files[pos] == image_path):
+            return
+        if self._split_bitmaps_in_sync():
+            try:
+                with open(event.path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError):
+                content = ""
+            self.split_bitmaps.set(pos, content)
 
     def _list_split_images(self, split: str) -> list[str]:
-        img_path = f"{self.project_root}/images/{split}"
-        return sorted([
-            f for f in glob.glob(f"{img_path}/*.*")
-            if f.lower().endswith(('.png', '.jpg', '.jpeg'))
-        ])
+        return self._list_split_images_for_root(self.project_root, split)
     
     def autolabel_red(self) -> None:
         """Auto-label reddish regions using LAB + contour filtering."""
         if not HAS_CV2 or not self.img_pil:
             return
         try:
-            self.push_history()
+            first_new = len(self.rects)
 
             img = cv2.cvtColor(np.array(self.img_pil), cv2.COLOR_RGB2BGR)
             lab = cv2.cvtColor(img, cv2.COLOR_BGR2LAB)
@@ -6576,6 +7665,7 @@ class GeckoAI:
                         x, y, x + w, y + h,
                         self.combo_cls.current()
                     ]))
+            self.history_manager.record_add(self.rects, range(first_new, len(self.rects)))
 
             self.render()
         except Exception:
@@ -6650,7 +7740,7 @@ class GeckoAI:
                 else:
                     raise
             
-            self.push_history()
+            first_new = len(self.rects)
             detection_count = 0
             fallback_class_idx = self.combo_cls.current()
             if fallback_class_idx < 0:
@@ -6668,9 +7758,21 @@ class GeckoAI:
                         class_idx
                     ]))
                     detection_count += 1
+            if self.config.detect_skip_duplicates:
+                # Re-running detection should not stack copies on boxes that are already labelled.
+                detected = self.rects[first_new:]
+                kept = suppress_duplicates(detected, self.config.detect_duplicate_iou, self.rects[:first_new])
+                self.rects[first_new:] = [detected[i] for i in kept]
+            self._detect_skipped = first_new + detection_count - len(self.rects)
+            self._invalidate_rects()
+            self.history_manager.record_add(self.rects, range(first_new, len(self.rects)))
             
             self.render()
-            self.logger.info("YOLO detection complete: %s boxes", detection_count)
+            self.logger.info(
+                "YOLO detection complete: %s boxes, %s duplicate(s) skipped",
+                len(self.rects) - first_new,
+                self._detect_skipped,
+            )
         except FileNotFoundError as exc:
             self.logger.error("Model path error: %s", exc)
             messagebox.showerror("Model Error", str(exc))
@@ -6720,25 +7822,16 @@ class GeckoAI:
         return "0" if self._can_use_cuda_runtime() else "cpu"
 
     def _list_split_labeled_images_for_root(self, project_root: str, split: str) -> list[str]:
-        labeled: list[str] = []
-        for img_path in self._list_split_images_for_root(project_root, split):
-            base = os.path.splitext(os.path.basename(img_path))[0]
-            lbl_path = f"{project_root}/labels/{split}/{base}.txt"
-            if os.path.isfile(lbl_path) and os.path.getsize(lbl_path) > 0:
-                labeled.append(img_path)
-        return labeled
+        index = self._refreshed_index(project_root, split)
+        if index is not None:
+            return index.image_paths(split, labeled_only=True)
+        return [entry.image_path for entry in self._scan_split_for_root(project_root, split) if entry.labeled]
 
     def _list_flat_labeled_images_for_root(self, project_root: str) -> list[str]:
-        labeled: list[str] = []
-        for img_path in sorted(
-            f for f in glob.glob(f"{project_root}/*.*")
-            if f.lower().endswith((".png", ".jpg", ".jpeg"))
-        ):
-            base = os.path.splitext(os.path.basename(img_path))[0]
-            lbl_path = f"{project_root}/labels/train/{base}.txt"
-            if os.path.isfile(lbl_path) and os.path.getsize(lbl_path) > 0:
-                labeled.append(img_path)
-        return labeled
+        index = self._refreshed_index(project_root, FLAT_SPLIT)
+        if index is not None:
+            return index.image_paths(FLAT_SPLIT, labeled_only=True)
+        return [entry.image_path for entry in self._scan_split_for_root(project_root, FLAT_SPLIT) if entry.labeled]
 
     def _write_training_dataset_files(
         self,
@@ -7373,7 +8466,8 @@ class GeckoAI:
             )
             return
         if self.image_files and self.img_pil:
-            self.save_current()
+            self.save_current(wait=True)
+        self.refresh_dataset_stats()
 
         split_roots = [s for s in ("train", "val", "test") if os.path.isdir(f"{self.project_root}/images/{s}")]
         if split_roots:
@@ -7518,28 +8612,31 @@ class GeckoAI:
         split_roots = [s for s in ("train", "val", "test") if os.path.isdir(f"{self.project_root}/images/{s}")]
         if split_roots:
             for split in split_roots:
-                for img_path in self._list_split_images_for_root(self.project_root, split):
-                    base = os.path.splitext(os.path.basename(img_path))[0]
-                    lbl_path = f"{self.project_root}/labels/{split}/{base}.txt"
-                    entries.append((split, img_path, lbl_path))
+                index = self._refreshed_index(self.project_root, split)
+                if index is not None:
+                    entries.extend((split, img_path, lbl_path) for img_path, lbl_path in index.entries(split))
+                    continue
+                entries.extend(
+                    (split, entry.image_path, entry.label_path)
+                    for entry in self._scan_split_for_root(self.project_root, split)
+                )
             return entries
 
         # Flat image folder mode
-        for img_path in sorted(
-            f for f in glob.glob(f"{self.project_root}/*.*")
-            if f.lower().endswith((".png", ".jpg", ".jpeg"))
-        ):
-            base = os.path.splitext(os.path.basename(img_path))[0]
-            lbl_path = f"{self.project_root}/labels/train/{base}.txt"
-            entries.append(("train", img_path, lbl_path))
-        return entries
+        index = self._refreshed_index(self.project_root, FLAT_SPLIT)
+        if index is not None:
+            return [("train", img_path, lbl_path) for img_path, lbl_path in index.entries(FLAT_SPLIT)]
+        return [
+            ("train", entry.image_path, entry.label_path)
+            for entry in self._scan_split_for_root(self.project_root, FLAT_SPLIT)
+        ]
 
     def export_all_by_selected_format(self) -> None:
         if not self.project_root:
             messagebox.showwarning(LANG_MAP[self.lang]["title"], LANG_MAP[self.lang]["export_no_project"], parent=self.root)
             return
         if self.image_files and self.img_pil:
-            self.save_current()
+            self.save_current(wait=True)
 
         out_dir = filedialog.askdirectory(
             parent=self.root,
@@ -7790,7 +8887,7 @@ class GeckoAI:
             )
             return
         if self.img_pil:
-            self.save_current()
+            self.save_current(wait=True)
 
         out_dir = filedialog.askdirectory(
             parent=self.root,
@@ -8098,22 +9195,24 @@ class GeckoAI:
         return x * self.scale + self.offset_x, y * self.scale + self.offset_y
     
     def push_history(self) -> None:
-        """??????"""
+        """Snapshot the whole box list; for bulk edits that no single delta describes."""
         self.history_manager.push_snapshot(self.rects)
     
     def undo(self) -> None:
         """Undo last edit."""
         if self.history_manager.undo():
+            self._invalidate_rects()
             if self.project_root and self.img_pil:
                 self.save_current()
-            self.render()
+            self.request_render()
     
     def redo(self) -> None:
         """??"""
         if self.history_manager.redo():
+            self._invalidate_rects()
             if self.project_root and self.img_pil:
                 self.save_current()
-            self.render()
+            self.request_render()
     
     def save_and_next(self):
         """??????????????????"""
@@ -8124,6 +9223,34 @@ class GeckoAI:
         self.current_idx = min(len(self.image_files) - 1, self.current_idx + 1)
         self.load_img()
     
+    def _current_split_bitmaps(self) -> SplitBitmaps:
+        if self.split_bitmaps is None or len(self.split_bitmaps) != len(self.image_files):
+            index_split = self._current_index_split()
+            index = self._refreshed_index(self.project_root, index_split)
+            if index is not None:
+                self.split_bitmaps = SplitBitmaps.from_index(index, index_split, self.image_files)
+            else:
+                self.flush_label_writes()
+                label_dir = self._index_split_dirs(self.project_root, index_split)[1]
+                self.split_bitmaps = SplitBitmaps.from_label_files(self.image_files, label_dir)
+        return self.split_bitmaps
+
+    def jump_to_next(self, kind: str) -> None:
+        """Jump to the next image that is unlabeled, has the current class, or has no boxes."""
+        if self._detect_mode_active and self._detect_workspace_frame is not None:
+            return
+        if not self.project_root or not self.image_files:
+            return
+        class_id = self.combo_cls.current() if kind == "class" else None
+        self.save_current()
+        bitmaps = self._current_split_bitmaps()
+        target = SplitBitmaps.next_index(bitmaps.mask(kind, class_id), self.current_idx)
+        if target is None:
+            messagebox.showinfo(LANG_MAP[self.lang]["title"], LANG_MAP[self.lang]["jump_none"])
+            return
+        self.current_idx = target
+        self.load_img()
+
     def prev_img(self):
         """????"""
         if self._detect_mode_active and self._detect_workspace_frame is not None:
@@ -8143,6 +9270,9 @@ class GeckoAI:
         self.canvas.bind("<B3-Motion>", self.on_mouse_drag)
         self.canvas.bind("<ButtonRelease-3>", self.on_mouse_up_right)
         self.canvas.bind("<MouseWheel>", self.on_zoom)
+        self.canvas.bind("<ButtonPress-2>", self.on_pan_start)
+        self.canvas.bind("<B2-Motion>", self.on_pan_drag)
+        self.canvas.bind("<ButtonRelease-2>", self.on_pan_end)
         self.canvas.bind("<Configure>", self.on_canvas_resize)
         
         self.root.bind("<Key-f>", lambda e: self.save_and_next())
@@ -8162,6 +9292,14 @@ class GeckoAI:
         self.root.bind("<KP_Delete>", self.delete_selected)
         self.canvas.bind("<Delete>", self.delete_selected)
         self.canvas.bind("<KP_Delete>", self.delete_selected)
+        self.root.bind("<Key-n>", lambda e: self.jump_to_next("unlabeled"))
+        self.root.bind("<Key-N>", lambda e: self.jump_to_next("unlabeled"))
+        self.root.bind("<Key-m>", lambda e: self.jump_to_next("class"))
+        self.root.bind("<Key-M>", lambda e: self.jump_to_next("class"))
+        self.root.bind("<Key-b>", lambda e: self.jump_to_next("empty"))
+        self.root.bind("<Key-B>", lambda e: self.jump_to_next("empty"))
+        self.root.bind("<F3>", self.toggle_perf_hud)
+        self.root.bind("<Shift-F3>", self.toggle_perf_trace)
 
     def on_canvas_resize(self, e):
         if not self.img_pil:
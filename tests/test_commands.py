@@ -22,6 +22,81 @@ class HistoryManagerTests(unittest.TestCase):
         self.assertTrue(history.redo())
         self.assertEqual(len(rects), 2)
 
+    def test_add_remove_modify_deltas(self):
+        rects = [[0.0, 0.0, 5.0, 5.0, 0], [1.0, 1.0, 2.0, 2.0, 1], [3.0, 3.0, 4.0, 4.0, 2]]
+        original = [list(rect) for rect in rects]
+        history = HistoryManager()
+
+        rects.append([6.0, 6.0, 7.0, 7.0, 0])
+        history.record_add(rects, [3])
+        history.record_remove(rects, [0, 2])
+        del rects[2], rects[0]
+        history.record_modify(rects, [0])
+        rects[0][4] = 5
+        after = [list(rect) for rect in rects]
+
+        for _ in range(3):
+            self.assertTrue(history.undo())
+        self.assertEqual(rects, original)
+        self.assertFalse(history.undo())
+        for _ in range(3):
+            self.assertTrue(history.redo())
+        self.assertEqual(rects, after)
+
+    def test_reorder(self):
+        rects = [[0.0], [1.0], [2.0]]
+        history = HistoryManager()
+        order = [2, 0, 1]
+        rects[:] = [rects[j] for j in order]
+        history.record_reorder(rects, order)
+        history.undo()
+        self.assertEqual(rects, [[0.0], [1.0], [2.0]])
+        history.redo()
+        self.assertEqual(rects, [[2.0], [0.0], [1.0]])
+
+    def test_merges_repeated_modifications_within_window(self):
+        now = [0.0]
+        rects = [[0.0, 0.0, 5.0, 5.0, 0, 0.0]]
+        history = HistoryManager(merge_window_s=1.0, clock=lambda: now[0])
+        for step in range(5):
+            history.record_modify(rects, [0], merge_key="rotate")
+            rects[0][5] += 5.0
+            now[0] += 0.2
+        self.assertEqual(history.undo_depth, 1)
+        now[0] += 5.0
+        history.record_modify(rects, [0], merge_key="rotate")
+        rects[0][5] += 5.0
+        self.assertEqual(history.undo_depth, 2)
+
+        history.undo()
+        self.assertEqual(rects[0][5], 25.0)
+        history.undo()
+        self.assertEqual(rects[0][5], 0.0)
+
+    def test_skips_modifications_that_changed_nothing(self):
+        rects = [[0.0, 0.0, 5.0, 5.0, 0]]
+        history = HistoryManager()
+        rects.append([1.0, 1.0, 2.0, 2.0, 1])
+        history.record_add(rects, [1])
+        # Clicking a box records a move before knowing whether it will be dragged.
+        history.record_modify(rects, [1], merge_key="move")
+        self.assertTrue(history.undo())
+        self.assertEqual(len(rects), 1)
+
+    def test_memory_cap_drops_oldest_entries(self):
+        rects = [[float(i), 0.0, 1.0, 1.0, 0] for i in range(100)]
+        history = HistoryManager(max_bytes=20_000)
+        for i in range(100):
+            history.record_modify(rects, [i])
+            rects[i][4] = 1
+        self.assertLessEqual(history.nbytes, 20_000)
+        self.assertLess(history.undo_depth, 100)
+        while history.undo():
+            pass
+        # Only the newest edits can still be undone.
+        self.assertEqual(rects[-1][4], 0)
+        self.assertEqual(rects[0][4], 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,42 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import unittest
+
+from ai_labeller.core.dataset_scan import scan_split
+
+
+class DatasetScanTests(unittest.TestCase):
+    def test_joins_images_and_labels_by_stem(self):
+        with tempfile.TemporaryDirectory() as root:
+            image_dir, label_dir = f"{root}/images", f"{root}/labels"
+            os.makedirs(image_dir)
+            os.makedirs(label_dir)
+            for name in ("b.JPG", "a.png", "readme.md", "._a.png"):
+                open(f"{image_dir}/{name}", "w").close()
+            os.makedirs(f"{image_dir}/c.jpg")
+            with open(f"{label_dir}/b.txt", "w", encoding="utf-8") as handle:
+                handle.write("0 0.5 0.5 0.1 0.1\n")
+            open(f"{label_dir}/a.txt", "w").close()
+
+            entries = scan_split(image_dir, label_dir)
+
+            self.assertEqual([e.image_path for e in entries], [f"{image_dir}/a.png", f"{image_dir}/b.JPG"])
+            self.assertEqual([e.label_path for e in entries], [f"{label_dir}/a.txt", f"{label_dir}/b.txt"])
+            self.assertEqual([e.labeled for e in entries], [False, True])
+            self.assertEqual(entries[1].label_size, 18)
+
+    def test_missing_label_folder(self):
+        with tempfile.TemporaryDirectory() as root:
+            open(f"{root}/x.jpg", "w").close()
+            entries = scan_split(root, f"{root}/labels/train")
+            self.assertEqual(len(entries), 1)
+            self.assertIsNone(entries[0].label_mtime_ns)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from ai_labeller.core.dataset_scan import scan_split
+from ai_labeller.core.dataset_stats import DatasetStatsEngine, parse_label_boxes
+
+
+class ParseLabelBoxesTests(unittest.TestCase):
+    def test_skips_malformed_lines_and_extra_columns(self):
+        boxes, malformed = parse_label_boxes("0 0.5 0.5 0.2 0.1\n\n1 .2 .3 .1 .1 45\nbad line\n2 1 1\n")
+        np.testing.assert_allclose(boxes, [[0, 0.5, 0.5, 0.2, 0.1], [1, 0.2, 0.3, 0.1, 0.1]], rtol=1e-6)
+        self.assertEqual(malformed, 2)
+
+    def test_obb_lines_use_the_extent_of_their_corners(self):
+        content = "0 .2 .2 .4 .2 .4 .4 .2 .4\n1 .5 .1 .7 .3 .5 .5 .3 .3\n"
+        boxes, malformed = parse_label_boxes(content)
+        self.assertEqual(malformed, 0)
+        np.testing.assert_allclose(boxes, [[0, 0.3, 0.3, 0.2, 0.2], [1, 0.5, 0.3, 0.4, 0.4]], atol=1e-6)
+
+        mixed, malformed = parse_label_boxes("2 0.5 0.5 0.2 0.1\n" + content)
+        self.assertEqual(malformed, 0)
+        np.testing.assert_allclose(mixed[1:], boxes, atol=1e-6)
+
+    def test_empty_content(self):
+        boxes, malformed = parse_label_boxes("\n")
+        self.assertEqual(boxes.shape, (0, 5))
+        self.assertEqual(malformed, 0)
+
+
+class DatasetStatsEngineTests(unittest.TestCase):
+    def _write(self, path, content):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(content)
+
+    def test_aggregates_and_only_reparses_changed_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            image_dir, label_dir = f"{root}/images", f"{root}/labels"
+            os.makedirs(image_dir)
+            os.makedirs(label_dir)
+            for name in ("a.jpg", "b.jpg", "c.jpg"):
+                open(f"{image_dir}/{name}", "w").close()
+            self._write(f"{label_dir}/a.txt", "0 0.5 0.5 0.2 0.1\n1 0.5 0.5 0.1 0.1\n")
+            self._write(f"{label_dir}/b.txt", "1 0.95 0.5 0.2 0.2\n")
+            cache_path = f"{root}/stats.npz"
+
+            engine = DatasetStatsEngine(cache_path)
+            stats = engine.compute(scan_split(image_dir, label_dir))
+            self.assertEqual((stats.image_count, stats.labeled_count, stats.box_count), (3, 2, 3))
+            self.assertEqual(stats.class_counts, {0: 1, 1: 2})
+            self.assertEqual(stats.boxes_per_image.tolist(), [1, 1, 1])
+            self.assertEqual(stats.out_of_bounds, 1)
+            self.assertEqual(stats.out_of_bounds_files, [f"{label_dir}/b.txt"])
+            self.assertAlmostEqual(stats.aspect_percentiles[1], 2 ** 0.5, places=5)
+            self.assertEqual(stats.parsed_files, 2)
+            engine.save()
+
+            self._write(f"{label_dir}/b.txt", "2 0.5 0.5 0.2 0.2\n2 0.5 0.5 0.3 0.3\n")
+            reloaded = DatasetStatsEngine(cache_path)
+            stats = reloaded.compute(scan_split(image_dir, label_dir))
+            self.assertEqual((stats.parsed_files, stats.reused_files), (1, 1))
+            self.assertEqual(stats.class_counts, {0: 1, 1: 1, 2: 2})
+            self.assertEqual(stats.out_of_bounds, 0)
+            self.assertEqual(int(stats.size_histogram.sum()), 4)
+
+    def test_drops_cache_entries_for_deleted_labels(self):
+        with tempfile.TemporaryDirectory() as root:
+            open(f"{root}/a.jpg", "w").close()
+            self._write(f"{root}/a.txt", "0 0.5 0.5 0.2 0.2\n")
+            engine = DatasetStatsEngine()
+            engine.compute(scan_split(root, root))
+            self.assertEqual(len(engine), 1)
+            os.remove(f"{root}/a.txt")
+            stats = engine.compute(scan_split(root, root))
+            self.assertEqual(len(engine), 0)
+            self.assertEqual(stats.box_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
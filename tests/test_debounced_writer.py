@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import unittest
+
+from ai_labeller.core.debounced_writer import DebouncedFileWriter
+
+
+class FakeRoot:
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, delay_ms, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run(self):
+        callbacks, self.pending = list(self.pending.values()), {}
+        for callback in callbacks:
+            callback()
+
+
+class DebouncedFileWriterTests(unittest.TestCase):
+    def test_batches_writes_and_skips_unchanged_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "session.json")
+            root = FakeRoot()
+            writer = DebouncedFileWriter(root, delay_ms=500)
+
+            writer.write(path, "a")
+            writer.write(path, "b")
+            self.assertEqual(len(root.pending), 1)
+            self.assertFalse(os.path.exists(path))
+            root.run()
+            with open(path, encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "b")
+
+            writer.write(path, "b at 12:01", fingerprint="b")
+            root.run()
+            self.assertEqual((writer.written, writer.skipped), (1, 1))
+
+    def test_flush_writes_immediately_and_cancels_timer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "progress.yaml")
+            root = FakeRoot()
+            writer = DebouncedFileWriter(root)
+
+            writer.write(path, "split: train\n")
+            writer.flush()
+            self.assertEqual(root.pending, {})
+            self.assertFalse(writer.pending)
+            self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import unittest
+
+from ai_labeller.core.fs_watcher import FsEvent, PollingWatcher
+
+
+class PollingWatcherTests(unittest.TestCase):
+    def test_reports_added_modified_and_removed_files(self):
+        with tempfile.TemporaryDirectory() as root:
+            image_dir, label_dir = f"{root}/images", f"{root}/labels"
+            os.makedirs(image_dir)
+            os.makedirs(label_dir)
+            open(f"{image_dir}/a.jpg", "w").close()
+            open(f"{image_dir}/b.jpg", "w").close()
+            watcher = PollingWatcher(image_dir, label_dir, full_scan_every=1)
+
+            self.assertEqual(watcher.poll_once(), [])
+            self.assertEqual(watcher.poll_once(), [])
+
+            open(f"{image_dir}/c.png", "w").close()
+            with open(f"{label_dir}/a.txt", "w") as f:
+                f.write("0 0.5 0.5 0.1 0.1\n")
+            os.remove(f"{image_dir}/b.jpg")
+            with open(f"{image_dir}/a.jpg", "w") as f:
+                f.write("changed")
+
+            events = set(watcher.poll_once())
+            self.assertEqual(
+                events,
+                {
+                    FsEvent("added", f"{image_dir}/c.png"),
+                    FsEvent("removed", f"{image_dir}/b.jpg"),
+                    FsEvent("modified", f"{image_dir}/a.jpg"),
+                    FsEvent("added", f"{label_dir}/a.txt", is_label=True),
+                },
+            )
+            self.assertEqual(watcher.poll_once(), [])
+
+    def test_skips_scan_while_folder_mtimes_are_unchanged(self):
+        with tempfile.TemporaryDirectory() as root:
+            open(f"{root}/a.jpg", "w").close()
+            watcher = PollingWatcher(root, f"{root}/labels", full_scan_every=100)
+            watcher.poll_once()
+            stat = os.stat(root)
+            with open(f"{root}/a.jpg", "w") as f:
+                f.write("rewritten in place")
+            # Rewriting a file does not touch its folder; pin the folder mtime to be sure.
+            os.utime(root, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertEqual(watcher.poll_once(), [])
+
+            watcher.full_scan_every = 1
+            self.assertEqual(watcher.poll_once(), [FsEvent("modified", f"{root}/a.jpg")])
+
+    def test_background_thread_queues_events(self):
+        with tempfile.TemporaryDirectory() as root:
+            watcher = PollingWatcher(root, f"{root}/labels", interval_s=0.01)
+            watcher.poll_once()
+            open(f"{root}/new.jpg", "w").close()
+            watcher.start()
+            try:
+                for _ in range(200):
+                    events = watcher.drain()
+                    if events:
+                        break
+                    watcher._stop.wait(0.01)
+            finally:
+                watcher.stop()
+            self.assertEqual(events, [FsEvent("added", f"{root}/new.jpg")])
+            self.assertEqual(events[0].stat, (os.stat(f"{root}/new.jpg").st_mtime_ns, 0))
+            self.assertEqual(watcher.drained_dir_mtimes[1], (os.stat(root).st_mtime_ns, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,9 +3,73 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
+import math
+import random
 import unittest
 
-from ai_labeller.core.geometry import calculate_iou, fuse_boxes
+import numpy as np
+
+from ai_labeller.core.geometry import (
+    calculate_iou,
+    fuse_boxes,
+    iou_matrix,
+    obb_corners,
+    obb_iou_matrix,
+    rect_iou_matrix,
+    suppress_duplicates,
+)
+
+
+def _fuse_boxes_pairwise(boxes, iou_thresh, dist_thresh):
+    """The original O(n^2)-per-pass fuse_boxes, kept as the reference."""
+    if len(boxes) <= 1:
+        return boxes
+    keep_fusing = True
+    current = [box[:] for box in boxes]
+    while keep_fusing:
+        keep_fusing = False
+        merged = []
+        used = [False] * len(current)
+        for i, box in enumerate(current):
+            if used[i]:
+                continue
+            curr = box[:]
+            used[i] = True
+            for j in range(i + 1, len(current)):
+                if used[j]:
+                    continue
+                other = current[j]
+                should_merge = calculate_iou(curr, other) > iou_thresh
+                if not should_merge:
+                    h_dist = max(0, max(curr[0], other[0]) - min(curr[2], other[2]))
+                    v_overlap = min(curr[3], other[3]) - max(curr[1], other[1])
+                    if v_overlap > 0 and h_dist <= dist_thresh:
+                        should_merge = True
+                if should_merge:
+                    curr = [
+                        min(curr[0], other[0]),
+                        min(curr[1], other[1]),
+                        max(curr[2], other[2]),
+                        max(curr[3], other[3]),
+                        curr[4],
+                    ]
+                    used[j] = True
+                    keep_fusing = True
+            merged.append(curr)
+        current = merged
+    return current
+
+
+def _random_boxes(rng, count, extent, max_size, integers=False):
+    boxes = []
+    for _ in range(count):
+        x, y = rng.uniform(0, extent), rng.uniform(0, extent)
+        w, h = rng.uniform(1, max_size), rng.uniform(1, max_size)
+        box = [x, y, x + w, y + h, rng.randrange(3)]
+        if integers:
+            box[:4] = [int(v) for v in box[:4]]
+        boxes.append(box)
+    return boxes
 
 
 class GeometryTests(unittest.TestCase):
@@ -21,6 +85,106 @@ class GeometryTests(unittest.TestCase):
         fused = fuse_boxes(boxes, iou_thresh=0.1, dist_thresh=0)
         self.assertEqual(len(fused), 1)
 
+    def test_fuse_matches_pairwise_reference(self):
+        rng = random.Random(7)
+        cases = [
+            (0.1, 5, False),
+            (0.3, 0, False),
+            (0.0, 12, True),
+            (0.5, -1, False),
+            (-0.1, 0, False),
+        ]
+        for iou_thresh, dist_thresh, integers in cases:
+            for count, extent, max_size in ((10, 50, 20), (120, 400, 40), (400, 2000, 60), (300, 300, 200)):
+                boxes = _random_boxes(rng, count, extent, max_size, integers)
+                with self.subTest(iou=iou_thresh, dist=dist_thresh, count=count, extent=extent):
+                    self.assertEqual(
+                        fuse_boxes(boxes, iou_thresh, dist_thresh),
+                        _fuse_boxes_pairwise(boxes, iou_thresh, dist_thresh),
+                    )
+
+    def test_fuse_keeps_first_class_and_extra_fields(self):
+        boxes = [
+            [0.0, 0.0, 10.0, 10.0, 2, 15.0],
+            [12.0, 2.0, 20.0, 8.0, 1, 0.0],
+            [100.0, 100.0, 110.0, 110.0, 1, 30.0],
+        ]
+        fused = fuse_boxes(boxes, iou_thresh=0.5, dist_thresh=3)
+        self.assertEqual(fused, [[0.0, 0.0, 20.0, 10.0, 2], [100.0, 100.0, 110.0, 110.0, 1, 30.0]])
+
+    def test_iou_matrix_matches_pairwise(self):
+        rng = random.Random(3)
+        a = _random_boxes(rng, 15, 100, 40)
+        b = _random_boxes(rng, 9, 100, 40)
+        matrix = iou_matrix(a, b)
+        self.assertEqual(matrix.shape, (15, 9))
+        for i, box_a in enumerate(a):
+            for j, box_b in enumerate(b):
+                self.assertAlmostEqual(matrix[i, j], calculate_iou(box_a, box_b))
+        self.assertEqual(iou_matrix([], b).shape, (0, 9))
+
+    def test_obb_corners_rotate_about_centre(self):
+        corners = obb_corners([[0.0, 0.0, 4.0, 2.0, 90.0]])
+        np.testing.assert_allclose(corners[0], [[3.0, -1.0], [3.0, 3.0], [1.0, 3.0], [1.0, -1.0]], atol=1e-9)
+
+    def test_obb_iou_matrix(self):
+        square = [0.0, 0.0, 2.0, 2.0, 45.0]
+        others = [
+            [0.0, 0.0, 2.0, 2.0, 0.0],
+            [0.0, 0.0, 2.0, 2.0, -135.0],
+            [5.0, 5.0, 6.0, 6.0, 0.0],
+        ]
+        matrix = obb_iou_matrix([square], others)
+        # A square against itself turned 45 degrees overlaps in a regular octagon.
+        octagon = 8 * (math.sqrt(2) - 1)
+        np.testing.assert_allclose(matrix[0], [octagon / (8 - octagon), 1.0, 0.0], atol=1e-9)
+
+    def test_obb_iou_without_rotation_matches_axis_aligned(self):
+        boxes = _random_boxes(random.Random(5), 40, 200, 60)
+        obbs = [box[:4] + [0.0] for box in boxes]
+        np.testing.assert_allclose(obb_iou_matrix(obbs, obbs), iou_matrix(boxes, boxes), atol=1e-9)
+
+    def test_rect_iou_matrix_uses_rect_angle(self):
+        rects = [[0.0, 0.0, 10.0, 2.0, 0], [0.0, 0.0, 10.0, 2.0, 1, 90.0]]
+        matrix = rect_iou_matrix(rects, rects)
+        # A 10x2 bar and the same bar turned upright only share their 2x2 centre.
+        np.testing.assert_allclose(matrix, [[1.0, 4 / 36], [4 / 36, 1.0]], atol=1e-9)
+
+    def test_suppress_duplicates_against_existing_and_earlier(self):
+        existing = [[0.0, 0.0, 10.0, 10.0, 0, 30.0]]
+        rects = [
+            [0.2, 0.0, 10.2, 10.0, 0, 31.0],
+            [50.0, 50.0, 60.0, 60.0, 0],
+            [50.5, 50.0, 60.5, 60.0, 0],
+            [0.0, 0.0, 10.0, 10.0, 0],
+        ]
+        # The last rect is the existing one unrotated: IoU 0.73, kept at 0.8 but not at 0.7.
+        self.assertEqual(suppress_duplicates(rects, 0.8, existing), [1, 3])
+        self.assertEqual(suppress_duplicates(rects, 0.7, existing), [1])
+        self.assertEqual(suppress_duplicates([], 0.8, existing), [])
+
+    def test_suppress_duplicates_only_within_a_class(self):
+        existing = [[0.0, 0.0, 10.0, 10.0, 0]]
+        rects = [[0.0, 0.0, 10.0, 10.0, 1], [0.0, 0.0, 10.0, 10.0, 0], [0.5, 0.0, 10.5, 10.0, 1]]
+        self.assertEqual(suppress_duplicates(rects, 0.7, existing), [0])
+        self.assertEqual(suppress_duplicates(rects, 0.7), [0, 1])
+
+    def test_fuse_with_angles_compares_rotated_footprints(self):
+        # Turned upright, the bar reaches down into the second box.
+        boxes = [
+            [0.0, 4.0, 10.0, 6.0, 0, 90.0],
+            [3.0, 9.0, 7.0, 12.0, 1],
+            [50.0, 50.0, 60.0, 54.0, 2, 30.0],
+        ]
+        self.assertEqual(len(fuse_boxes(boxes, iou_thresh=0.05, dist_thresh=0)), 3)
+
+        fused = fuse_boxes(boxes, iou_thresh=0.05, dist_thresh=0, use_angles=True)
+        self.assertEqual(len(fused), 2)
+        # The merged box is the upright union of both footprints and drops the angle.
+        np.testing.assert_allclose(fused[0], [3.0, 0.0, 7.0, 12.0, 0], atol=1e-9)
+        # An unmerged rotated rect is returned unchanged, angle included.
+        self.assertEqual(fused[1], boxes[2])
+
 
 if __name__ == "__main__":
     unittest.main()
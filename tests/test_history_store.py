@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import unittest
+
+from ai_labeller.core.commands import HistoryManager
+from ai_labeller.core.history_store import HistoryStore, content_fingerprint
+
+
+def edited_history(rects):
+    history = HistoryManager()
+    rects.append([1.0, 1.0, 2.0, 2.0, 0])
+    history.record_add(rects, [len(rects) - 1])
+    history.record_modify(rects, [0])
+    rects[0][4] = 3
+    return history
+
+
+class HistoryStoreTests(unittest.TestCase):
+    def test_restores_stacks_onto_reloaded_rects(self):
+        rects = [[0.0, 0.0, 5.0, 5.0, 0]]
+        history = edited_history(rects)
+        history.undo()
+        store = HistoryStore(max_bytes=1 << 20)
+        store.stash("a.txt", content_fingerprint("saved"), history)
+        self.assertEqual(len(store), 1)
+        self.assertGreater(store.nbytes, 0)
+
+        reloaded = [list(rect) for rect in rects]
+        restored = HistoryManager()
+        self.assertTrue(store.restore("a.txt", content_fingerprint("saved"), restored, reloaded))
+        self.assertEqual((restored.undo_depth, restored.redo_depth), (1, 1))
+        restored.undo()
+        self.assertEqual(reloaded, [[0.0, 0.0, 5.0, 5.0, 0]])
+        restored.redo()
+        restored.redo()
+        self.assertEqual(reloaded, [[0.0, 0.0, 5.0, 5.0, 3], [1.0, 1.0, 2.0, 2.0, 0]])
+        self.assertEqual(len(store), 0)
+
+    def test_stale_fingerprint_is_ignored(self):
+        rects = [[0.0, 0.0, 5.0, 5.0, 0]]
+        store = HistoryStore(max_bytes=1 << 20)
+        store.stash("a.txt", content_fingerprint("v1"), edited_history(rects))
+        restored = HistoryManager()
+        self.assertFalse(store.restore("a.txt", content_fingerprint("v2"), restored, rects))
+        self.assertEqual(restored.undo_depth, 0)
+
+    def test_evicted_entries_spill_to_disk(self):
+        with tempfile.TemporaryDirectory() as root:
+            store = HistoryStore(max_bytes=1, spill_path=f"{root}/history.sqlite")
+            for key in ("a.txt", "b.txt"):
+                store.stash(key, content_fingerprint(key), edited_history([[0.0, 0.0, 5.0, 5.0, 0]]))
+            self.assertEqual(len(store), 0)
+            self.assertEqual(store.spilled, 2)
+            store.close()
+
+            reopened = HistoryStore(max_bytes=1 << 20, spill_path=f"{root}/history.sqlite")
+            rects = [[0.0, 0.0, 5.0, 5.0, 3], [1.0, 1.0, 2.0, 2.0, 0]]
+            restored = HistoryManager()
+            self.assertTrue(reopened.restore("b.txt", content_fingerprint("b.txt"), restored, rects))
+            while restored.undo():
+                pass
+            self.assertEqual(rects, [[0.0, 0.0, 5.0, 5.0, 0]])
+            reopened.close()
+
+    def test_restore_without_spills_does_not_create_the_file(self):
+        with tempfile.TemporaryDirectory() as root:
+            spill_path = f"{root}/state/history.sqlite"
+            store = HistoryStore(max_bytes=1 << 20, spill_path=spill_path)
+            self.assertFalse(store.restore("a.txt", content_fingerprint("a"), HistoryManager(), []))
+            self.assertFalse(os.path.exists(spill_path))
+            store.close()
+            self.assertFalse(os.path.exists(spill_path))
+
+
+if __name__ == "__main__":
+    unittest.main()
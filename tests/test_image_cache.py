@@ -0,0 +1,59 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import tempfile
+import threading
+import unittest
+
+from PIL import Image
+
+from ai_labeller.core.image_cache import DecodedImageCache, ImagePrefetcher, decode_display_image
+
+
+class DecodedImageCacheTests(unittest.TestCase):
+    def test_lru_eviction_by_bytes(self):
+        cache = DecodedImageCache(max_bytes=2 * 10 * 10 * 3)
+        for name in ("a", "b"):
+            cache.put(name, Image.new("RGB", (10, 10)))
+        self.assertIsNotNone(cache.get("a"))
+        cache.put("c", Image.new("RGB", (10, 10)))
+
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(cache.current_bytes, 600)
+
+    def test_prefetch_and_cancel(self):
+        cache = DecodedImageCache(max_bytes=10_000_000)
+        gate = threading.Event()
+        decoded = []
+
+        def decode(path):
+            gate.wait(5)
+            decoded.append(path)
+            return Image.new("L", (4, 4))
+
+        prefetcher = ImagePrefetcher(cache, decode=decode, max_workers=1)
+        prefetcher.prefetch(["a", "b", "c"])
+        prefetcher.cancel()
+        gate.set()
+        prefetcher.prefetch(["d"])
+        self.assertIsNotNone(prefetcher.get("d"))
+        prefetcher.shutdown()
+
+        self.assertNotIn("a", cache)
+        self.assertNotIn("c", decoded)
+
+    def test_display_decode_uses_jpeg_draft(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = str(Path(tmp) / "big.jpg")
+            Image.new("RGB", (2400, 1600), "gray").save(path)
+
+            proxy = decode_display_image(path, max_side=1000)
+            self.assertEqual(proxy.size, (1200, 800))
+            self.assertEqual(decode_display_image(path, max_side=0).size, (2400, 1600))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -8,7 +8,7 @@ from pathlib import Path as _Path
 
 sys.path.insert(0, str(_Path(__file__).resolve().parents[1] / "src"))
 
-from ai_labeller.core.io_utils import atomic_write_json, atomic_write_text
+from ai_labeller.core.io_utils import atomic_write_json, atomic_write_text, project_state_path
 
 
 class AtomicIoTests(unittest.TestCase):
@@ -30,6 +30,15 @@ class AtomicIoTests(unittest.TestCase):
         atomic_write_json(str(path), data)
         self.assertEqual(json.loads(path.read_text(encoding="utf-8")), data)
 
+    def test_project_state_path_is_stable_per_project(self):
+        state_dir = str(self.tmp_root / "state")
+        first = project_state_path(state_dir, str(self.tmp_root / "project"), "journal.jsonl")
+        again = project_state_path(state_dir, str(self.tmp_root / "project" / "."), "journal.jsonl")
+        other = project_state_path(state_dir, str(self.tmp_root / "other"), "journal.jsonl")
+        self.assertEqual(first, again)
+        self.assertNotEqual(first, other)
+        self.assertEqual(Path(first).parent.parent, Path(state_dir))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,108 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import json
+import os
+import tempfile
+import unittest
+
+from ai_labeller.core.label_writer import LabelWrite, LabelWriteQueue
+
+
+class LabelWriteQueueTests(unittest.TestCase):
+    def test_writes_latest_content_and_clears_journal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            label = os.path.join(tmp, "labels", "a.txt")
+            rot = os.path.join(tmp, "labels", "a.rot.json")
+            journal = os.path.join(tmp, "journal.jsonl")
+            queue = LabelWriteQueue()
+            self.assertEqual(queue.open_journal(journal), 0)
+
+            queue.submit(LabelWrite(label, "0 0.5 0.5 0.1 0.1\n", rot, [15.0]))
+            queue.submit(LabelWrite(label, "1 0.5 0.5 0.2 0.2\n", rot, [30.0]))
+            self.assertTrue(queue.flush(timeout=5))
+
+            with open(label, encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "1 0.5 0.5 0.2 0.2\n")
+            with open(rot, encoding="utf-8") as handle:
+                self.assertEqual(json.load(handle)["angles_deg"], [30.0])
+            self.assertEqual(os.path.getsize(journal), 0)
+            stat = os.stat(label)
+            self.assertTrue(queue.wrote(label, (stat.st_mtime_ns, stat.st_size)))
+            self.assertFalse(queue.wrote(label, (stat.st_mtime_ns + 1, stat.st_size)))
+
+            queue.submit(LabelWrite(label, "", rot))
+            self.assertTrue(queue.close(timeout=5))
+            self.assertFalse(os.path.exists(label))
+            self.assertFalse(os.path.exists(rot))
+            self.assertFalse(os.path.exists(journal))
+
+    def test_replays_journal_left_by_previous_run(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            label = os.path.join(tmp, "b.txt")
+            journal = os.path.join(tmp, "journal.jsonl")
+            with open(journal, "w", encoding="utf-8") as handle:
+                for content in ("0 0.1 0.1 0.1 0.1\n", "2 0.3 0.3 0.1 0.1\n"):
+                    record = {"label_path": label, "content": content, "rot_meta_path": label + ".rot", "angles_deg": None}
+                    handle.write(json.dumps(record) + "\n")
+
+            queue = LabelWriteQueue()
+            self.assertEqual(queue.open_journal(journal), 1)
+            queue.close(timeout=5)
+
+            with open(label, encoding="utf-8") as handle:
+                self.assertEqual(handle.read(), "2 0.3 0.3 0.1 0.1\n")
+            self.assertFalse(os.path.exists(journal))
+
+    def test_second_instance_does_not_touch_a_locked_journal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            label = os.path.join(tmp, "c.txt")
+            journal = os.path.join(tmp, "journal.jsonl")
+            record = {"label_path": label, "content": "0 0.1 0.1 0.1 0.1\n", "rot_meta_path": label + ".rot", "angles_deg": None}
+            with open(journal, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(record) + "\n")
+
+            first = LabelWriteQueue()
+            self.assertEqual(first.open_journal(journal), 1)
+            self.assertTrue(first.flush(timeout=5))
+            first.submit(LabelWrite(os.path.join(tmp, "d.txt"), "1 0.2 0.2 0.1 0.1\n", label + ".rot"))
+
+            second = LabelWriteQueue()
+            self.assertEqual(second.open_journal(journal), 0)
+            other = os.path.join(tmp, "e.txt")
+            second.submit(LabelWrite(other, "2 0.3 0.3 0.1 0.1\n", other + ".rot"))
+            self.assertTrue(second.close(timeout=5))
+            self.assertTrue(os.path.exists(journal))
+            self.assertTrue(os.path.exists(other))
+
+            self.assertTrue(first.close(timeout=5))
+            self.assertFalse(os.path.exists(journal))
+
+    def test_switching_journals_keeps_failed_writes_in_the_old_one(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            journal_a = os.path.join(tmp, "a.jsonl")
+            journal_b = os.path.join(tmp, "b.jsonl")
+            blocker = os.path.join(tmp, "blocker")
+            with open(blocker, "w", encoding="utf-8") as handle:
+                handle.write("")
+            bad = os.path.join(blocker, "x.txt")  # parent is a file, so the write fails
+
+            queue = LabelWriteQueue()
+            queue.open_journal(journal_a)
+            queue.submit(LabelWrite(bad, "0 0.1 0.1 0.1 0.1\n", bad + ".rot"))
+            self.assertTrue(queue.flush(timeout=5))
+            self.assertEqual(len(queue.take_errors()), 1)
+
+            queue.open_journal(journal_b)
+            with open(journal_a, encoding="utf-8") as handle:
+                self.assertEqual(json.loads(handle.readline())["label_path"], bad)
+            good = os.path.join(tmp, "good.txt")
+            queue.submit(LabelWrite(good, "1 0.1 0.1 0.1 0.1\n", good + ".rot"))
+            self.assertTrue(queue.close(timeout=5))
+            self.assertFalse(os.path.exists(journal_b))
+
+
+if __name__ == "__main__":
+    unittest.main()
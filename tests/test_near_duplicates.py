@@ -0,0 +1,66 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image
+
+from ai_labeller.core.near_duplicates import BKTree, find_near_duplicates, hamming, hash_images
+
+
+class BKTreeTests(unittest.TestCase):
+    def test_search_matches_brute_force(self):
+        rng = random.Random(7)
+        values = [rng.getrandbits(64) for _ in range(300)]
+        # Near copies of a few values, so there is something inside the radius.
+        values += [v ^ (1 << rng.randrange(64)) for v in values[:30]]
+        tree = BKTree()
+        for i, value in enumerate(values):
+            tree.add(value, i)
+        for query in values[:50]:
+            expected = sorted((hamming(query, v), i) for i, v in enumerate(values) if hamming(query, v) <= 6)
+            self.assertEqual(sorted(tree.search(query, 6)), expected)
+
+
+class NearDuplicateTests(unittest.TestCase):
+    def test_groups_are_transitive_and_sorted(self):
+        hashes = {"c": 0b0000, "a": 0b0001, "b": 0b0011, "d": 0xFFFF_0000, "e": 0xFFFF_0001, "f": 0xF0F0_F0F0}
+        self.assertEqual(find_near_duplicates(hashes, max_distance=1), [["a", "b", "c"], ["d", "e"]])
+
+    def test_hash_survives_resizing_and_recompression(self):
+        rng = np.random.default_rng(3)
+        pixels = rng.integers(0, 255, (12, 16, 3), dtype=np.uint8)
+        base = Image.fromarray(pixels).resize((640, 480), Image.Resampling.BILINEAR)
+        other = Image.fromarray(rng.integers(0, 255, (12, 16, 3), dtype=np.uint8)).resize((640, 480))
+        with tempfile.TemporaryDirectory() as root:
+            base.save(f"{root}/a.png")
+            base.resize((320, 240)).save(f"{root}/b.jpg", quality=70)
+            other.save(f"{root}/c.png")
+            open(f"{root}/broken.jpg", "w").close()
+            hashes = hash_images([f"{root}/{name}" for name in ("a.png", "b.jpg", "c.png", "broken.jpg")])
+        self.assertNotIn(f"{root}/broken.jpg", hashes)
+        self.assertLessEqual(hamming(hashes[f"{root}/a.png"], hashes[f"{root}/b.jpg"]), 4)
+        self.assertGreater(hamming(hashes[f"{root}/a.png"], hashes[f"{root}/c.png"]), 10)
+
+    def test_hashes_in_process_when_the_pool_cannot_start(self):
+        pixels = np.random.default_rng(5).integers(0, 255, (48, 64, 3), dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as root:
+            paths = [f"{root}/{i}.png" for i in range(4)]
+            for path in paths:
+                Image.fromarray(pixels).save(path)
+            with mock.patch(
+                "ai_labeller.core.near_duplicates.ProcessPoolExecutor", side_effect=PermissionError("no semaphores")
+            ):
+                hashes = hash_images(paths, max_workers=2, chunksize=1)
+        self.assertEqual(sorted(hashes), sorted(paths))
+        self.assertEqual(len(set(hashes.values())), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
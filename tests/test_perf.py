@@ -0,0 +1,47 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import json
+import logging
+import unittest
+
+from ai_labeller.core.perf import PerfMonitor, hit_rate
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+class PerfMonitorTests(unittest.TestCase):
+    def test_rolling_timings_and_trace(self):
+        perf = PerfMonitor(window=2)
+        for ms in (4.0, 2.0, 6.0):
+            perf.record("frame", ms)
+        self.assertEqual(perf.last_ms("frame"), 6.0)
+        self.assertEqual(perf.avg_ms("frame"), 4.0)
+        self.assertEqual(perf.max_ms("frame"), 6.0)
+        self.assertEqual(perf.last_ms("missing"), 0.0)
+
+        logger = logging.getLogger("ai_labeller.test_trace")
+        logger.propagate = False
+        handler = ListHandler()
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        perf.trace_logger = logger
+        perf.record("load_img", 12.5)
+        self.assertEqual(json.loads(handler.messages[-1])["name"], "load_img")
+
+    def test_hit_rate(self):
+        self.assertEqual(hit_rate(3, 1), 0.75)
+        self.assertEqual(hit_rate(0, 0), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
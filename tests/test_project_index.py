@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import unittest
+
+from ai_labeller.core.project_index import ProjectIndex
+
+
+def touch(path, content=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write(content)
+
+
+class ProjectIndexTests(unittest.TestCase):
+    def test_scan_and_incremental_refresh(self):
+        with tempfile.TemporaryDirectory() as root:
+            image_dir, label_dir = f"{root}/images/train", f"{root}/labels/train"
+            touch(f"{image_dir}/b.jpg")
+            touch(f"{image_dir}/a.png")
+            touch(f"{image_dir}/notes.txt")
+            touch(f"{label_dir}/a.txt", "0 0.5 0.5 0.1 0.1\n2 0.2 0.2 0.1 0.1\n2 0.7 0.7 0.1 0.1\n")
+            index = ProjectIndex(root)
+
+            self.assertTrue(index.refresh("train", image_dir, label_dir))
+            self.assertEqual(index.image_paths("train"), [f"{image_dir}/a.png", f"{image_dir}/b.jpg"])
+            self.assertEqual(index.image_paths("train", labeled_only=True), [f"{image_dir}/a.png"])
+            self.assertEqual(index.class_histogram("train"), {0: 1, 2: 2})
+            self.assertEqual(index.image_info("train", "a.png")["box_count"], 3)
+            self.assertFalse(index.refresh("train", image_dir, label_dir))
+
+            index.record_label("train", "b.jpg", "1 0.5 0.5 0.2 0.2\n")
+            self.assertTrue(index.has_label("train", "b.jpg"))
+            self.assertEqual(index.class_histogram(), {0: 1, 1: 1, 2: 2})
+
+            os.remove(f"{image_dir}/a.png")
+            os.utime(image_dir, ns=(1, 1))
+            index.refresh("train", image_dir, label_dir)
+            self.assertEqual(index.entries("train"), [(f"{image_dir}/b.jpg", f"{label_dir}/b.txt")])
+            self.assertEqual(index.class_histogram("train"), {})
+            index.close()
+
+            reopened = ProjectIndex(root)
+            self.assertEqual(reopened.count_images("train"), 1)
+            reopened.close()
+
+    def test_hashes_are_dropped_when_the_image_changes(self):
+        with tempfile.TemporaryDirectory() as root:
+            image_dir, label_dir = f"{root}/images/train", f"{root}/labels/train"
+            touch(f"{image_dir}/a.jpg", "a")
+            touch(f"{image_dir}/b.jpg", "b")
+            index = ProjectIndex(root)
+            index.refresh("train", image_dir, label_dir)
+            index.record_hashes("train", {"a.jpg": (1 << 64) - 1, "b.jpg": 5})
+            self.assertEqual(index.image_hashes("train"), {"a.jpg": (1 << 64) - 1, "b.jpg": 5})
+
+            touch(f"{image_dir}/b.jpg", "changed")
+            os.utime(image_dir, ns=(1, 1))
+            index.refresh("train", image_dir, label_dir)
+            self.assertEqual(index.image_hashes("train"), {"a.jpg": (1 << 64) - 1})
+            index.close()
+
+    def test_apply_changes_patches_rows_and_skips_the_next_rescan(self):
+        with tempfile.TemporaryDirectory() as root:
+            image_dir, label_dir = f"{root}/images/train", f"{root}/labels/train"
+            touch(f"{image_dir}/a.jpg")
+            touch(f"{image_dir}/b.jpg")
+            index = ProjectIndex(root)
+            index.refresh("train", image_dir, label_dir)
+            before = (os.stat(image_dir).st_mtime_ns, None)
+
+            touch(f"{image_dir}/c.jpg")
+            touch(f"{label_dir}/c.txt", "3 0.5 0.5 0.1 0.1\n")
+            touch(f"{label_dir}/a.txt", "1 0.5 0.5 0.1 0.1\n")
+            os.remove(f"{image_dir}/b.jpg")
+            index.record_label("train", "a.jpg", "1 0.5 0.5 0.1 0.1\n")
+            a_stat = os.stat(f"{label_dir}/a.txt")
+            c_stat = os.stat(f"{image_dir}/c.jpg")
+            after = (os.stat(image_dir).st_mtime_ns, os.stat(label_dir).st_mtime_ns)
+            # a.txt was saved by the app, so only its mtime is taken; c.txt predates c.jpg's event.
+            self.assertTrue(
+                index.apply_changes(
+                    "train",
+                    {"b.jpg": None, "c.jpg": (c_stat.st_mtime_ns, c_stat.st_size)},
+                    {"a.txt": (a_stat.st_mtime_ns, a_stat.st_size)},
+                    (before, after),
+                    frozenset({"a.txt"}),
+                )
+            )
+            self.assertEqual(index.image_paths("train"), [f"{image_dir}/a.jpg", f"{image_dir}/c.jpg"])
+            self.assertEqual(index.class_histogram("train"), {1: 1, 3: 1})
+            self.assertFalse(index.refresh("train", image_dir, label_dir))
+
+            # An index that was not current at "before" is left for refresh to rescan.
+            touch(f"{image_dir}/d.jpg")
+            os.utime(image_dir, ns=(5, 5))
+            index.apply_changes("train", {}, {}, (before, (5, after[1])))
+            self.assertTrue(index.refresh("train", image_dir, label_dir))
+            self.assertEqual(index.count_images("train"), 3)
+            self.assertFalse(index.apply_changes("val", {}, {}))
+            index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
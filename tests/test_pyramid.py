@@ -0,0 +1,48 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import unittest
+
+from PIL import Image
+
+from ai_labeller.core.pyramid import ImagePyramid
+
+
+class ImagePyramidTests(unittest.TestCase):
+    def test_picks_smallest_level_with_enough_resolution(self):
+        image = Image.new("RGB", (4000, 2000))
+        pyramid = ImagePyramid(image, min_side=256)
+
+        level, factor = pyramid.level_for_scale(1.5)
+        self.assertIs(level, image)
+        self.assertEqual(factor, 1.0)
+
+        level, factor = pyramid.level_for_scale(0.2)
+        self.assertEqual(level.size, (1000, 500))
+        self.assertEqual(factor, 0.25)
+        self.assertEqual(pyramid.level_count, 3)
+
+    def test_stops_at_min_side(self):
+        pyramid = ImagePyramid(Image.new("RGB", (1024, 600)), min_side=256)
+        level, factor = pyramid.level_for_scale(0.01)
+        self.assertEqual(level.size, (512, 300))
+        self.assertEqual(factor, 0.5)
+
+        pyramid.close()
+        self.assertEqual(pyramid.level_count, 1)
+
+    def test_proxy_factors_are_relative_to_full_size(self):
+        proxy = Image.new("RGB", (1500, 1000))
+        pyramid = ImagePyramid(proxy, min_side=256, full_size=(6000, 4000))
+
+        self.assertTrue(pyramid.covers_scale(0.25))
+        self.assertFalse(pyramid.covers_scale(0.5))
+        level, factor = pyramid.level_for_scale(0.1)
+        self.assertEqual(level.size, (750, 500))
+        self.assertEqual(factor, 0.125)
+
+
+if __name__ == "__main__":
+    unittest.main()
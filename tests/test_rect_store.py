@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import unittest
+
+import numpy as np
+
+from ai_labeller.core.rect_store import RectStore, points_to_canvas
+
+
+class RectStoreTests(unittest.TestCase):
+    def test_yolo_round_trip(self):
+        text = "0 0.500000 0.500000 0.200000 0.400000\n2 0.100000 0.200000 0.100000 0.100000\n"
+        store, has_inline_angle = RectStore.from_yolo_text(text, 100, 50)
+        self.assertFalse(has_inline_angle)
+        self.assertEqual(store.to_rects()[0], [40.0, 15.0, 60.0, 35.0, 0, 0.0])
+        self.assertEqual(store.class_ids.tolist(), [0, 2])
+        self.assertEqual(store.to_yolo_text(100, 50), text)
+
+    def test_inline_angle_and_obb_lines(self):
+        text = "1 0.5 0.5 0.2 0.2 190\n3 0.4 0.4 0.6 0.4 0.6 0.6 0.4 0.6\n"
+        store, has_inline_angle = RectStore.from_yolo_text(text, 100, 100)
+        self.assertTrue(has_inline_angle)
+        rects = store.to_rects()
+        self.assertAlmostEqual(rects[0][5], -170.0)
+        self.assertEqual(rects[1][4], 3)
+        np.testing.assert_allclose(rects[1][:4], [40.0, 40.0, 60.0, 60.0], atol=1e-9)
+
+    def test_sync_appends_rebuilds_and_updates_rows(self):
+        rects = [[0.0, 0.0, 10.0, 10.0, 1, 0.0], [5.0, 5.0, 8.0, 9.0, 2]]
+        store = RectStore()
+        self.assertIs(store.sync(rects), store)
+        self.assertEqual(store.class_ids.tolist(), [1, 2])
+
+        rects.append([1.0, 2.0, 3.0, 4.0, 0, 45.0])
+        store.sync(rects)
+        np.testing.assert_allclose(store.data[2], [1.0, 2.0, 3.0, 4.0, 0.0, 45.0])
+
+        rects[0][4] = 3
+        rects[0][2] = 20.0
+        store.update_rows(rects, [0])
+        self.assertEqual(store.class_ids.tolist(), [3, 2, 0])
+        self.assertEqual(store.data[0, 2], 20.0)
+
+        rects.pop(1)
+        self.assertEqual(store.sync(rects).to_rects(), RectStore.from_rects(rects).to_rects())
+
+        replaced = [[0.0, 0.0, 1.0, 1.0, 4]]
+        self.assertEqual(store.sync(replaced).class_ids.tolist(), [4])
+
+        replaced[0][4] = 5
+        store.dirty = True
+        self.assertEqual(store.sync(replaced).class_ids.tolist(), [5])
+
+    def test_rotated_corners_and_canvas_transform(self):
+        store = RectStore.from_rects([[0.0, 0.0, 4.0, 2.0, 0], [0.0, 0.0, 4.0, 2.0, 0, 90.0]])
+        corners = store.rotated_corners()
+        np.testing.assert_allclose(corners[0], [[0, 0], [4, 0], [4, 2], [0, 2]])
+        np.testing.assert_allclose(corners[1], [[3, -1], [3, 3], [1, 3], [1, -1]], atol=1e-9)
+        np.testing.assert_allclose(store.aabbs()[1], [1, -1, 3, 3], atol=1e-9)
+        np.testing.assert_allclose(points_to_canvas(corners[0], 2.0, 10.0, 5.0)[2], [18.0, 9.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import unittest
+
+from ai_labeller.core.render_scheduler import RenderScheduler
+
+
+class FakeRoot:
+    def __init__(self):
+        self.pending = []
+
+    def after_idle(self, callback):
+        self.pending.append(callback)
+        return len(self.pending)
+
+    def after(self, delay_ms, callback):
+        return self.after_idle(callback)
+
+    def after_cancel(self, after_id):
+        self.pending[after_id - 1] = None
+
+    def run(self):
+        callbacks, self.pending = self.pending, []
+        for callback in callbacks:
+            if callback is not None:
+                callback()
+
+
+class RenderSchedulerTests(unittest.TestCase):
+    def test_burst_of_requests_renders_once(self):
+        root = FakeRoot()
+        frames = []
+        scheduler = RenderScheduler(root, lambda: frames.append(1))
+
+        for _ in range(5):
+            scheduler.request()
+        root.run()
+
+        self.assertEqual(len(frames), 1)
+        stats = scheduler.stats()
+        self.assertEqual((stats["requested"], stats["coalesced"], stats["rendered"]), (5, 4, 1))
+
+    def test_flush_renders_pending_frame_immediately(self):
+        root = FakeRoot()
+        frames = []
+        scheduler = RenderScheduler(root, lambda: frames.append(1))
+
+        scheduler.request()
+        scheduler.flush()
+        root.run()
+
+        self.assertEqual(len(frames), 1)
+        self.assertFalse(scheduler.pending)
+
+
+if __name__ == "__main__":
+    unittest.main()
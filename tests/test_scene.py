@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import unittest
+
+from ai_labeller.core.scene import CanvasScene
+
+
+class FakeCanvas:
+    def __init__(self):
+        self.next_id = 0
+        self.calls = []
+
+    def _create(self, kind, *coords, **options):
+        self.next_id += 1
+        self.calls.append(("create", kind, self.next_id))
+        return self.next_id
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", *coords, **options)
+
+    def coords(self, item_id, *coords):
+        self.calls.append(("coords", item_id))
+
+    def itemconfig(self, item_id, **options):
+        self.calls.append(("itemconfig", item_id, tuple(sorted(options))))
+
+    def delete(self, item_id):
+        self.calls.append(("delete", item_id))
+
+    def tag_raise(self, tag):
+        self.calls.append(("raise", tag))
+
+    def move(self, tag, dx, dy):
+        self.calls.append(("move", tag))
+
+
+class CanvasSceneTests(unittest.TestCase):
+    def test_only_changed_items_touch_the_canvas(self):
+        canvas = FakeCanvas()
+        scene = CanvasScene(canvas, layers=("box",))
+
+        scene.begin_frame()
+        scene.put(("box", 0), "polygon", (0, 0, 1, 0, 1, 1), "box", outline="red")
+        scene.put(("box", 1), "polygon", (5, 5, 6, 5, 6, 6), "box", outline="red")
+        scene.end_frame()
+        self.assertEqual(len(scene), 2)
+
+        canvas.calls.clear()
+        scene.begin_frame()
+        scene.put(("box", 0), "polygon", (0, 0, 1, 0, 1, 1), "box", outline="red")
+        _, changed = scene.put(("box", 1), "polygon", (7, 5, 8, 5, 8, 6), "box", outline="blue")
+        scene.end_frame()
+        self.assertTrue(changed)
+        self.assertEqual(canvas.calls, [("coords", 2), ("itemconfig", 2, ("outline",))])
+
+        canvas.calls.clear()
+        scene.begin_frame()
+        scene.put(("box", 0), "polygon", (0, 0, 1, 0, 1, 1), "box", outline="red")
+        scene.end_frame()
+        self.assertEqual(canvas.calls, [("delete", 2)])
+        self.assertEqual(len(scene), 1)
+
+    def test_layer_transform_forces_coords_refresh(self):
+        canvas = FakeCanvas()
+        scene = CanvasScene(canvas, layers=("box",))
+        scene.begin_frame()
+        scene.put(("box", 0), "polygon", (0, 0, 1, 0, 1, 1), "box", outline="red")
+        scene.end_frame()
+
+        scene.move_layers(("box",), 5, 5)
+        canvas.calls.clear()
+        scene.begin_frame()
+        _, changed = scene.put(("box", 0), "polygon", (0, 0, 1, 0, 1, 1), "box", outline="red")
+        scene.end_frame()
+        self.assertTrue(changed)
+        self.assertEqual(canvas.calls, [("coords", 1)])
+
+
+if __name__ == "__main__":
+    unittest.main()
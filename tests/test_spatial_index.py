@@ -0,0 +1,45 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import random
+import unittest
+
+import numpy as np
+
+from ai_labeller.core.spatial_index import SpatialIndex
+
+
+class SpatialIndexTests(unittest.TestCase):
+    def test_queries_match_linear_scan(self):
+        rng = random.Random(7)
+        boxes = []
+        for _ in range(500):
+            x, y = rng.uniform(0, 2000), rng.uniform(0, 2000)
+            boxes.append([x, y, x + rng.uniform(1, 80), y + rng.uniform(1, 80)])
+        index = SpatialIndex()
+        index.rebuild(np.array(boxes))
+
+        for _ in range(50):
+            px, py = rng.uniform(0, 2000), rng.uniform(0, 2000)
+            expected = [i for i, b in enumerate(boxes) if b[0] <= px <= b[2] and b[1] <= py <= b[3]]
+            self.assertEqual(index.query_point(px, py), expected)
+
+        expected = [i for i, b in enumerate(boxes) if not (b[2] < 100 or b[0] > 600 or b[3] < 300 or b[1] > 900)]
+        self.assertEqual(index.query_rect(600, 900, 100, 300), expected)
+
+    def test_update_and_remove(self):
+        index = SpatialIndex(cell_size=10)
+        index.insert(0, (0, 0, 5, 5))
+        index.insert(1, (50, 50, 60, 60))
+        index.update(0, (100, 100, 105, 105))
+        self.assertEqual(index.query_point(2, 2), [])
+        self.assertEqual(index.query_point(102, 102), [0])
+        index.remove(1)
+        self.assertEqual(index.query_rect(0, 0, 200, 200), [0])
+        self.assertEqual(len(index), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
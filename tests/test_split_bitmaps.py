@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import unittest
+
+from ai_labeller.core.project_index import ProjectIndex
+from ai_labeller.core.split_bitmaps import SplitBitmaps
+
+
+class SplitBitmapsTests(unittest.TestCase):
+    def test_next_index_wraps_and_tracks_saves(self):
+        bitmaps = SplitBitmaps(5)
+        bitmaps.set(0, "1 0.5 0.5 0.1 0.1\n")
+        bitmaps.set(1, "0 0.5 0.5 0.1 0.1\n")
+        bitmaps.set(3, "1 0.5 0.5 0.1 0.1\n")
+
+        self.assertEqual(SplitBitmaps.next_index(bitmaps.mask("unlabeled"), 0), 2)
+        self.assertEqual(SplitBitmaps.next_index(bitmaps.mask("unlabeled"), 4), 2)
+        self.assertEqual(SplitBitmaps.next_index(bitmaps.mask("class", 1), 0), 3)
+        self.assertEqual(SplitBitmaps.next_index(bitmaps.mask("class", 1), 3), 0)
+        self.assertIsNone(SplitBitmaps.next_index(bitmaps.mask("class", 7), 0))
+
+        bitmaps.set(3, "")
+        self.assertEqual(SplitBitmaps.next_index(bitmaps.mask("class", 1), 0), None)
+        bitmaps.remove(2)
+        self.assertEqual(SplitBitmaps.next_index(bitmaps.mask("empty"), 0), 2)
+
+    def test_built_from_project_index(self):
+        with tempfile.TemporaryDirectory() as root:
+            image_dir, label_dir = f"{root}/images/train", f"{root}/labels/train"
+            os.makedirs(image_dir)
+            os.makedirs(label_dir)
+            for name in ("a.jpg", "b.jpg", "c.jpg"):
+                open(f"{image_dir}/{name}", "w").close()
+            with open(f"{label_dir}/b.txt", "w", encoding="utf-8") as handle:
+                handle.write("2 0.5 0.5 0.1 0.1\n")
+            index = ProjectIndex(root)
+            index.refresh("train", image_dir, label_dir)
+
+            paths = index.image_paths("train")
+            bitmaps = SplitBitmaps.from_index(index, "train", paths)
+            self.assertEqual(bitmaps.labeled.tolist(), [False, True, False])
+            self.assertEqual(bitmaps.mask("class", 2).tolist(), [False, True, False])
+            index.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
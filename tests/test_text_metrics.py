@@ -0,0 +1,38 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import unittest
+
+from ai_labeller.core.text_metrics import TextMetricsCache
+
+
+class FakeFont:
+    created = 0
+
+    def __init__(self, spec):
+        FakeFont.created += 1
+        self.size = spec[1]
+
+    def measure(self, text):
+        return len(text) * self.size
+
+    def metrics(self, name):
+        return self.size * 2
+
+
+class TextMetricsCacheTests(unittest.TestCase):
+    def test_measures_once_per_font_and_text(self):
+        cache = TextMetricsCache(FakeFont)
+        font = ("Ubuntu", 10)
+
+        self.assertEqual(cache.measure("chip", font), (40, 20))
+        self.assertEqual(cache.measure("chip", font), (40, 20))
+        self.assertEqual(cache.measure("chip", ("Ubuntu", 12)), (48, 24))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual(cache.pill_box(100, 50, "chip", font, padding=4), (96, 46, 144, 74))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import os
+import tempfile
+import time
+import unittest
+
+from PIL import Image
+
+from ai_labeller.core.thumbnails import ThumbnailCache
+
+
+def wait_ready(cache, count, timeout=5.0):
+    ready = []
+    deadline = time.monotonic() + timeout
+    while len(ready) < count and time.monotonic() < deadline:
+        ready.extend(cache.drain_ready())
+        time.sleep(0.01)
+    return ready
+
+
+class ThumbnailCacheTests(unittest.TestCase):
+    def test_builds_persists_and_invalidates_by_mtime(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = os.path.join(tmp, "a.jpg")
+            Image.new("RGB", (400, 200), "red").save(image_path)
+            cache = ThumbnailCache(os.path.join(tmp, "thumbs"), size=48)
+
+            cache.request([image_path])
+            self.assertEqual(wait_ready(cache, 1), [image_path])
+            self.assertEqual(cache.get(image_path).size, (48, 24))
+            thumb_path = cache.thumb_path(image_path)
+            self.assertEqual(os.stat(thumb_path).st_mtime_ns, os.stat(image_path).st_mtime_ns)
+
+            Image.new("RGB", (100, 100), "blue").save(image_path)
+            os.utime(image_path, (time.time() + 10, time.time() + 10))
+            cache.invalidate(image_path)
+            cache.request([image_path])
+            wait_ready(cache, 1)
+            self.assertEqual(cache.get(image_path).size, (48, 48))
+            cache.shutdown()
+
+    def test_unreadable_image_is_reported_failed_until_invalidated(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            image_path = os.path.join(tmp, "broken.jpg")
+            with open(image_path, "wb") as handle:
+                handle.write(b"not an image")
+            cache = ThumbnailCache(os.path.join(tmp, "thumbs"), size=48)
+
+            cache.request([image_path])
+            deadline = time.monotonic() + 5.0
+            while not cache.failed(image_path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertTrue(cache.failed(image_path))
+            self.assertIsNone(cache.get(image_path))
+
+            Image.new("RGB", (100, 100), "blue").save(image_path, "JPEG")
+            cache.invalidate(image_path)
+            self.assertFalse(cache.failed(image_path))
+            cache.request([image_path])
+            self.assertEqual(wait_ready(cache, 1), [image_path])
+            cache.shutdown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import unittest
+
+from PIL import Image
+
+from ai_labeller.core.viewport import ViewportRenderer, visible_image_box
+
+
+class ViewportTests(unittest.TestCase):
+    def test_visible_box_is_clamped_to_image(self):
+        box = visible_image_box(1000, 800, 2.0, -400.0, -200.0, 300, 200, margin_px=0)
+        self.assertEqual(box, (200, 100, 350, 200))
+        self.assertEqual(visible_image_box(100, 100, 1.0, 500.0, 0.0, 300, 200), None)
+
+    def test_render_crops_and_reuses_tile(self):
+        image = Image.new("RGB", (1000, 800))
+        renderer = ViewportRenderer(margin_px=20)
+
+        tile, tile_image, reused = renderer.render(image, 2.0, -400.0, -200.0, 300, 200)
+        self.assertFalse(reused)
+        self.assertEqual(tile.src_box, (190, 90, 360, 210))
+        self.assertEqual(tile_image.size, (340, 240))
+
+        # Small pan inside the margin keeps the same tile.
+        tile2, _, reused = renderer.render(image, 2.0, -410.0, -200.0, 300, 200)
+        self.assertTrue(reused)
+        self.assertIs(tile2, tile)
+        self.assertEqual(tile2.dest_origin(-410.0, -200.0), (-30.0, -20.0))
+
+        _, _, reused = renderer.render(image, 2.5, -410.0, -200.0, 300, 200)
+        self.assertFalse(reused)
+
+
+if __name__ == "__main__":
+    unittest.main()